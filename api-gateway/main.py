@@ -1,14 +1,17 @@
 # api-gateway/main.py (핵심 부분)
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form, BackgroundTasks
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 import httpx
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import asyncio
 from datetime import datetime
 import uuid
 import os
+import math
+
+from resilience import CircuitOpenError, ResilientService
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -36,6 +39,33 @@ SERVICES = {
     "video": os.getenv('VIDEO_SERVICE_URL', 'http://video-service:8004')
 }
 
+# 하위 서비스 호출 재시도 (지터 백오프, Retry-After 준수) + 서비스별 회로 차단기
+# 게이트웨이는 회로가 열려 있으면 기다리지 않고 바로 503 + Retry-After 응답
+DOWNSTREAM_MAX_ATTEMPTS = int(os.getenv('DOWNSTREAM_MAX_ATTEMPTS', 3))  # 첫 요청 포함
+DOWNSTREAM_RETRY_BASE_DELAY = float(os.getenv('DOWNSTREAM_RETRY_BASE_DELAY', 0.5))
+DOWNSTREAM_RETRY_MAX_DELAY = float(os.getenv('DOWNSTREAM_RETRY_MAX_DELAY', 5.0))  # Retry-After 가 이보다 길면 그대로 전달
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+CIRCUIT_OPEN_SECONDS = float(os.getenv('CIRCUIT_OPEN_SECONDS', 10.0))
+
+downstream = {
+    service: ResilientService(
+        service, DOWNSTREAM_MAX_ATTEMPTS, DOWNSTREAM_RETRY_BASE_DELAY, DOWNSTREAM_RETRY_MAX_DELAY,
+        CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_OPEN_SECONDS
+    )
+    for service in SERVICES
+}
+
+async def call_service(service: str, send, idempotent: bool = True) -> httpx.Response:
+    """
+    하위 서비스 호출 (send: 매번 새 요청을 보내는 함수)
+    - idempotent=False (분석 접수 / 용의자 등록 등): 연결 실패 / 503 만 재시도, 응답 타임아웃은 재시도하지 않음
+    - 회로가 열려 있으면 503 + Retry-After
+    """
+    try:
+        return await downstream[service].call(send, idempotent)
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+
 
 # 수사 데이터베이스
 investigation_cases = {}
@@ -95,7 +125,8 @@ async def health_check():
         "system_type": "police_investigation_system",
         "healthy_count": len(healthy_services),
         "active_cases": len(investigation_cases),
-        "registered_suspects": len(suspect_database)
+        "registered_suspects": len(suspect_database),
+        "downstream_resilience": {service: caller.get_stats() for service, caller in downstream.items()}
     }
 
 @app.post("/police/register_suspect")
@@ -118,11 +149,11 @@ async def police_register_suspect(
             files = {"file": (clothing_image.filename, await clothing_image.read(), clothing_image.content_type)}
             data = {"person_id": suspect_id}
             
-            response = await client.post(
+            response = await call_service("clothing", lambda: client.post(
                 f"{SERVICES['clothing']}/register_person",
                 files=files,
                 data=data
-            )
+            ), idempotent=False)
             
             if response.status_code == 200:
                 result = response.json()
@@ -151,10 +182,48 @@ async def police_register_suspect(
             else:
                 raise HTTPException(status_code=response.status_code, detail="AI 분석 시스템 오류")
                 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ 용의자 등록 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"용의자 등록 실패: {str(e)}")
 
+def create_investigation_case(location: str, date: str, officer_name: str, case_number: str,
+                              video_filename: str, fps_interval: float, stop_on_detect: bool) -> str:
+    """수사 케이스 생성 후 케이스 ID 반환"""
+    case_id = f"CASE_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    
+    logger.info(f"🎬 CCTV 분석 시작: {case_id}")
+    
+    investigation_cases[case_id] = {
+        "case_id": case_id,
+        "case_number": case_number,
+        "location": location,
+        "date": date,
+        "officer_name": officer_name,
+        "video_filename": video_filename,
+        "fps_interval": fps_interval,
+        "stop_on_detect": stop_on_detect,
+        "start_time": datetime.now().isoformat(),
+        "status": "analyzing"
+    }
+    return case_id
+
+def build_case_started_response(case_id: str, analysis_id: str, stop_on_detect: bool) -> Dict[str, Any]:
+    """분석 시작 응답 (단일 업로드 / 청크 업로드 공용)"""
+    return {
+        "status": "analysis_started",
+        "case_id": case_id,
+        "analysis_id": analysis_id,
+        "realtime_mode": stop_on_detect,
+        "message": f"케이스 '{case_id}' 분석이 시작되었습니다",
+        "monitoring": {
+            "status_check": f"/police/case_status/{case_id}",
+            "results": f"/police/case_report/{case_id}",
+            "image_viewer": f"/police/image_viewer/{case_id}"
+        }
+    }
+
 @app.post("/police/analyze_cctv")
 async def police_analyze_cctv(
     background_tasks: BackgroundTasks,
@@ -164,34 +233,34 @@ async def police_analyze_cctv(
     officer_name: str = Form(""),
     case_number: str = Form(""),
     fps_interval: float = Form(3.0),
-    stop_on_detect: bool = Form(True)
+    stop_on_detect: bool = Form(True),
+    motion_gate: bool = Form(True),
+    two_pass: bool = Form(False),
+    sampling: str = Form(""),
+    start_time: str = Form(""),
+    end_time: str = Form(""),
+    roi: str = Form(""),
+    scan_mode: str = Form("")
 ):
-    """CCTV 영상 분석"""
+    """
+    CCTV 영상 분석
+    - two_pass: 용의자 등장 / 퇴장 구간 2차 정밀 샘플링
+    - sampling: interval | scene (비우면 서비스 기본값)
+    - start_time / end_time: 분석 구간 (초 또는 MM:SS), roi: 관심 영역 다각형 JSON [[x, y], ...]
+    - scan_mode: full | keyframes (키프레임만 빠르게 훑는 1차 확인, 비우면 서비스 기본값)
+    """
     try:
         if not video_file.content_type.startswith('video/'):
             raise HTTPException(status_code=400, detail="비디오 파일만 업로드 가능합니다")
         
-        # 수사 케이스 ID 생성
-        case_id = f"CASE_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
-        
-        logger.info(f"🎬 CCTV 분석 시작: {case_id}")
-        
         # 영상 내용 읽기
         content = await video_file.read()
         
         # 수사 케이스 정보 저장
-        investigation_cases[case_id] = {
-            "case_id": case_id,
-            "case_number": case_number,
-            "location": location,
-            "date": date,
-            "officer_name": officer_name,
-            "video_filename": video_file.filename,
-            "fps_interval": fps_interval,
-            "stop_on_detect": stop_on_detect,
-            "start_time": datetime.now().isoformat(),
-            "status": "analyzing"
-        }
+        case_id = create_investigation_case(
+            location, date, officer_name, case_number,
+            video_file.filename, fps_interval, stop_on_detect
+        )
         
         # 비디오 분석 서비스 호출
         analysis_endpoint = "/analyze_video_realtime" if stop_on_detect else "/analyze_video"
@@ -202,14 +271,21 @@ async def police_analyze_cctv(
                 "fps_interval": fps_interval,
                 "location": location,
                 "date": date,
-                "stop_on_detect": stop_on_detect
+                "stop_on_detect": stop_on_detect,
+                "motion_gate": motion_gate,
+                "two_pass": two_pass,
+                "sampling": sampling,
+                "start_time": start_time,
+                "end_time": end_time,
+                "roi": roi,
+                "scan_mode": scan_mode
             }
             
-            response = await client.post(
+            response = await call_service("video", lambda: client.post(
                 f"{SERVICES['video']}{analysis_endpoint}",
                 files=files,
                 data=data
-            )
+            ), idempotent=False)
             
             if response.status_code == 200:
                 result = response.json()
@@ -220,25 +296,300 @@ async def police_analyze_cctv(
                 
                 logger.info(f"✅ CCTV 분석 시작 완료: {case_id}")
                 
-                return {
-                    "status": "analysis_started",
-                    "case_id": case_id,
-                    "analysis_id": analysis_id,
-                    "realtime_mode": stop_on_detect,
-                    "message": f"케이스 '{case_id}' 분석이 시작되었습니다",
-                    "monitoring": {
-                        "status_check": f"/police/case_status/{case_id}",
-                        "results": f"/police/case_report/{case_id}",
-                        "image_viewer": f"/police/image_viewer/{case_id}"
-                    }
-                }
+                return build_case_started_response(case_id, analysis_id, stop_on_detect)
+            elif response.status_code == 429:
+                # 분석 대기열 초과 → 케이스를 남기지 않고 Retry-After 그대로 전달
+                investigation_cases.pop(case_id, None)
+                forward_upload_response(response)
             else:
                 raise HTTPException(status_code=response.status_code, detail="CCTV 분석 시스템 오류")
                 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ CCTV 분석 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"CCTV 분석 실패: {str(e)}")
 
+@app.post("/police/analyze_cctv_batch")
+async def police_analyze_cctv_batch(
+    video_files: List[UploadFile] = File(...),
+    cameras: str = Form(...),
+    officer_name: str = Form(""),
+    case_number: str = Form(""),
+    fps_interval: float = Form(3.0),
+    motion_gate: bool = Form(True),
+    two_pass: bool = Form(False),
+    sampling: str = Form(""),
+    scan_mode: str = Form(""),
+    owner: str = Form("")
+):
+    """
+    한 사건의 여러 카메라 CCTV 영상 일괄 분석
+    - cameras: 영상 순서대로 [{"location", "recorded_at", "latitude", "longitude"}, ...] JSON
+    - owner: 일괄 분석을 묶을 소유자 (예: 사건 ID, 결과 조회에도 같은 owner 필요)
+    - 모든 카메라가 같은 용의자 갤러리로 매칭되고, 결과는 카메라 간 통합 타임라인으로 조회
+    """
+    case_id = create_investigation_case(
+        f"다중 카메라 {len(video_files)}대", "", officer_name, case_number,
+        ", ".join(video_file.filename or "" for video_file in video_files), fps_interval, False
+    )
+    
+    try:
+        # 업로드 파일 객체를 그대로 넘겨 영상 전체를 게이트웨이 메모리에 올리지 않음
+        files = [
+            ("video_files", (video_file.filename, video_file.file, video_file.content_type))
+            for video_file in video_files
+        ]
+        data = {
+            "cameras": cameras,
+            "fps_interval": fps_interval,
+            "motion_gate": motion_gate,
+            "two_pass": two_pass,
+            "sampling": sampling,
+            "scan_mode": scan_mode,
+            "owner": owner
+        }
+        async with httpx.AsyncClient(timeout=600.0) as client:
+            response = await client.post(f"{SERVICES['video']}/analyze_batch", files=files, data=data)
+        if response.status_code != 200:
+            investigation_cases.pop(case_id, None)
+        result = forward_upload_response(response)
+    except httpx.HTTPError as e:
+        investigation_cases.pop(case_id, None)
+        logger.error(f"❌ 다중 카메라 분석 요청 실패: {str(e)}")
+        raise HTTPException(status_code=502, detail=f"다중 카메라 분석 요청 실패: {str(e)}")
+    
+    investigation_cases[case_id]["batch_id"] = result["batch_id"]
+    logger.info(f"✅ 다중 카메라 분석 시작: {case_id} ({result['batch_id']})")
+    return {
+        **result,
+        "case_id": case_id,
+        "monitoring": {"results": f"/police/batches/{result['batch_id']}"}
+    }
+
+@app.get("/police/batches/{batch_id}")
+async def police_get_camera_batch(batch_id: str, owner: str = ""):
+    """다중 카메라 일괄 분석 진행 상황 + 카메라 간 통합 타임라인 (크롭 이미지는 게이트웨이 URL 로 변환)"""
+    try:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await call_service("video", lambda: client.get(
+                f"{SERVICES['video']}/batches/{batch_id}", params={"owner": owner}
+            ))
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"일괄 분석 조회 실패: {str(e)}")
+    result = forward_upload_response(response)
+    result["timeline"] = [
+        dict(sighting, **gateway_blob_refs(sighting["crop_digest"])) if sighting.get("crop_digest") else sighting
+        for sighting in result.get("timeline", [])
+    ]
+    return result
+
+# 📦 재개 가능한 청크 업로드 프록시 (video-service 저장소에 직접 조립)
+def forward_upload_response(response: httpx.Response) -> Dict[str, Any]:
+    """video-service 업로드 응답 전달 (오류 코드는 그대로 유지)"""
+    if response.status_code == 200:
+        return response.json()
+    try:
+        detail = response.json().get("detail", "업로드 처리 실패")
+    except ValueError:
+        detail = "업로드 처리 실패"
+    headers = {"Retry-After": response.headers["retry-after"]} if "retry-after" in response.headers else None
+    raise HTTPException(status_code=response.status_code, detail=detail, headers=headers)
+
+@app.post("/police/uploads")
+async def police_create_upload(
+    filename: str = Form(...),
+    total_size: int = Form(...),
+    content_type: str = Form("video/mp4"),
+    sha256: str = Form(""),
+    location: str = Form(""),
+    date: str = Form(""),
+    owner: str = Form("")
+):
+    """청크 업로드 세션 생성 (owner: 세션을 묶을 소유자, 예: 사건 ID)"""
+    try:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.post(
+                f"{SERVICES['video']}/uploads",
+                data={
+                    "filename": filename,
+                    "total_size": total_size,
+                    "content_type": content_type,
+                    "sha256": sha256,
+                    "location": location,
+                    "date": date,
+                    "owner": owner
+                }
+            )
+        return forward_upload_response(response)
+    except httpx.HTTPError as e:
+        logger.error(f"❌ 업로드 세션 생성 실패: {str(e)}")
+        raise HTTPException(status_code=502, detail=f"업로드 세션 생성 실패: {str(e)}")
+
+@app.get("/police/uploads/{upload_id}")
+async def police_get_upload(upload_id: str, owner: str = ""):
+    """업로드 진행 상황 조회"""
+    try:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.get(f"{SERVICES['video']}/uploads/{upload_id}", params={"owner": owner})
+        return forward_upload_response(response)
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"업로드 상태 조회 실패: {str(e)}")
+
+@app.put("/police/uploads/{upload_id}")
+async def police_put_upload_chunk(upload_id: str, request: Request):
+    """청크 전달 (본문을 메모리에 모으지 않고 스트리밍)"""
+    headers = {}
+    if request.headers.get("content-range"):
+        headers["Content-Range"] = request.headers["content-range"]
+    if request.headers.get("content-length"):
+        headers["Content-Length"] = request.headers["content-length"]
+    
+    try:
+        async with httpx.AsyncClient(timeout=120.0) as client:
+            response = await client.put(
+                f"{SERVICES['video']}/uploads/{upload_id}",
+                params=dict(request.query_params),
+                headers=headers,
+                content=request.stream()
+            )
+        return forward_upload_response(response)
+    except httpx.HTTPError as e:
+        logger.error(f"❌ 청크 전달 실패: {str(e)}")
+        raise HTTPException(status_code=502, detail=f"청크 전달 실패: {str(e)}")
+
+@app.post("/police/uploads/{upload_id}/finalize")
+async def police_finalize_upload(
+    upload_id: str,
+    location: str = Form(...),
+    date: str = Form(...),
+    officer_name: str = Form(""),
+    case_number: str = Form(""),
+    fps_interval: float = Form(3.0),
+    stop_on_detect: bool = Form(True),
+    motion_gate: bool = Form(True),
+    two_pass: bool = Form(False),
+    sampling: str = Form(""),
+    start_time: str = Form(""),
+    end_time: str = Form(""),
+    roi: str = Form(""),
+    scan_mode: str = Form(""),
+    owner: str = Form("")
+):
+    """업로드 완료 처리 및 분석 시작"""
+    try:
+        async with httpx.AsyncClient(timeout=120.0) as client:
+            response = await client.post(
+                f"{SERVICES['video']}/uploads/{upload_id}/finalize",
+                data={
+                    "fps_interval": fps_interval,
+                    "stop_on_detect": stop_on_detect,
+                    "motion_gate": motion_gate,
+                    "two_pass": two_pass,
+                    "sampling": sampling,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "roi": roi,
+                    "scan_mode": scan_mode,
+                    "owner": owner
+                }
+            )
+        result = forward_upload_response(response)
+    except httpx.HTTPError as e:
+        logger.error(f"❌ 업로드 완료 처리 실패: {str(e)}")
+        raise HTTPException(status_code=502, detail=f"업로드 완료 처리 실패: {str(e)}")
+    
+    video_info = result.get("video_info", {})
+    case_id = create_investigation_case(
+        location, date, officer_name, case_number,
+        video_info.get("filename", ""), fps_interval, stop_on_detect
+    )
+    investigation_cases[case_id]["analysis_id"] = result.get("analysis_id")
+    
+    logger.info(f"✅ 청크 업로드 분석 시작 완료: {case_id}")
+    return build_case_started_response(case_id, result.get("analysis_id"), stop_on_detect)
+
+@app.delete("/police/uploads/{upload_id}")
+async def police_abort_upload(upload_id: str, owner: str = ""):
+    """업로드 세션 취소"""
+    try:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.delete(f"{SERVICES['video']}/uploads/{upload_id}", params={"owner": owner})
+        return forward_upload_response(response)
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"업로드 취소 실패: {str(e)}")
+
+def gateway_blob_refs(digest: str) -> Dict[str, str]:
+    """video-service 크롭 이미지 참조를 게이트웨이 기준 URL 로 변환"""
+    return {
+        "cropped_image_url": f"/police/blobs/{digest}",
+        "thumbnail_url": f"/police/blobs/{digest}?size=sm"
+    }
+
+@app.get("/police/blobs/{digest}")
+async def police_get_blob(digest: str, request: Request, size: Optional[str] = None):
+    """크롭 이미지 프록시 (ETag / 캐시 헤더 및 304 응답 그대로 전달)"""
+    headers = {}
+    if request.headers.get("if-none-match"):
+        headers["If-None-Match"] = request.headers["if-none-match"]
+    
+    try:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.get(
+                f"{SERVICES['video']}/blobs/{digest}",
+                params={"size": size} if size else None,
+                headers=headers
+            )
+    except httpx.HTTPError as e:
+        logger.error(f"❌ 크롭 이미지 조회 실패: {str(e)}")
+        raise HTTPException(status_code=502, detail=f"이미지 조회 실패: {str(e)}")
+    
+    if response.status_code not in (200, 304):
+        raise HTTPException(status_code=response.status_code, detail="이미지를 찾을 수 없습니다")
+    
+    passthrough = {
+        key: response.headers[key]
+        for key in ("etag", "cache-control", "content-type")
+        if key in response.headers
+    }
+    return Response(content=response.content, status_code=response.status_code, headers=passthrough)
+
+@app.get("/police/analysis_events/{analysis_id}")
+async def police_analysis_events(analysis_id: str):
+    """분석 진행 SSE 스트림 프록시 (이벤트를 버퍼링 없이 그대로 전달)"""
+    # video-service 가 15초마다 keepalive 를 보내므로 읽기 타임아웃은 넉넉하게
+    client = httpx.AsyncClient(timeout=httpx.Timeout(30.0, read=60.0))
+    try:
+        upstream = await client.send(
+            client.build_request("GET", f"{SERVICES['video']}/analysis_events/{analysis_id}"),
+            stream=True
+        )
+    except httpx.HTTPError as e:
+        await client.aclose()
+        logger.error(f"❌ 분석 이벤트 스트림 연결 실패: {str(e)}")
+        raise HTTPException(status_code=502, detail=f"이벤트 스트림 연결 실패: {str(e)}")
+    
+    if upstream.status_code != 200:
+        await upstream.aclose()
+        await client.aclose()
+        raise HTTPException(status_code=upstream.status_code, detail="분석 ID를 찾을 수 없습니다")
+    
+    async def relay():
+        try:
+            async for chunk in upstream.aiter_raw():
+                yield chunk
+        except httpx.HTTPError as e:
+            logger.warning(f"⚠️ 분석 이벤트 스트림 중단: {analysis_id} ({str(e)})")
+        finally:
+            await upstream.aclose()
+            await client.aclose()
+    
+    return StreamingResponse(
+        relay(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/police/case_status/{case_id}")
 async def get_police_case_status(case_id: str):
     """수사 케이스 진행 상황 조회"""
@@ -253,7 +604,9 @@ async def get_police_case_status(case_id: str):
     
     try:
         async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(f"{SERVICES['video']}/analysis_status/{analysis_id}")
+            response = await call_service(
+                "video", lambda: client.get(f"{SERVICES['video']}/analysis_status/{analysis_id}")
+            )
             
             if response.status_code == 200:
                 analysis_status = response.json()
@@ -271,10 +624,41 @@ async def get_police_case_status(case_id: str):
             else:
                 raise HTTPException(status_code=response.status_code, detail="분석 상태 조회 실패")
                 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ 케이스 상태 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"상태 조회 실패: {str(e)}")
 
+@app.post("/police/case_cancel/{case_id}")
+async def cancel_police_case(case_id: str):
+    """수사 케이스 분석 취소 (재접수 시 이전 분석 중단용)"""
+    if case_id not in investigation_cases:
+        raise HTTPException(status_code=404, detail="수사 케이스를 찾을 수 없습니다")
+    
+    analysis_id = investigation_cases[case_id].get("analysis_id")
+    if not analysis_id:
+        raise HTTPException(status_code=400, detail="분석이 시작되지 않았습니다")
+    
+    try:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await call_service(
+                "video", lambda: client.post(f"{SERVICES['video']}/analysis/{analysis_id}/cancel")
+            )
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"분석 취소 실패: {str(e)}")
+    
+    if response.status_code != 200:
+        try:
+            detail = response.json().get("detail", "분석 취소 실패")
+        except ValueError:
+            detail = "분석 취소 실패"
+        raise HTTPException(status_code=response.status_code, detail=detail)
+    
+    investigation_cases[case_id]["status"] = "canceled"
+    logger.info(f"⏹️ 수사 케이스 분석 취소: {case_id} ({analysis_id})")
+    return {"case_id": case_id, **response.json()}
+
 @app.get("/police/case_report/{case_id}")
 async def get_police_case_report(case_id: str):
     """경찰 수사 보고서 생성"""
@@ -289,7 +673,9 @@ async def get_police_case_report(case_id: str):
     
     try:
         async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(f"{SERVICES['video']}/analysis_result/{analysis_id}")
+            response = await call_service(
+                "video", lambda: client.get(f"{SERVICES['video']}/analysis_result/{analysis_id}")
+            )
             
             if response.status_code == 200:
                 analysis_result = response.json()
@@ -306,7 +692,10 @@ async def get_police_case_report(case_id: str):
                 
                 # 간단한 보고서 생성
                 suspects_timeline = analysis_result.get("suspects_timeline", [])
-                crop_images = analysis_result.get("suspect_crop_images", [])
+                crop_images = [
+                    dict(img, **gateway_blob_refs(img["crop_digest"])) if img.get("crop_digest") else img
+                    for img in analysis_result.get("suspect_crop_images", [])
+                ]
                 
                 report = {
                     "investigation_summary": {
@@ -343,6 +732,8 @@ async def get_police_case_report(case_id: str):
             else:
                 raise HTTPException(status_code=response.status_code, detail="분석 결과 조회 실패")
                 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ 수사 보고서 생성 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"보고서 생성 실패: {str(e)}")
@@ -401,17 +792,19 @@ async def analyze_video(
                 "stop_on_detect": False
             }
             
-            response = await client.post(
+            response = await call_service("video", lambda: client.post(
                 f"{SERVICES['video']}/analyze_video",
                 files=files,
                 data=data
-            )
+            ), idempotent=False)
             
             if response.status_code == 200:
                 return response.json()
             else:
                 raise HTTPException(status_code=response.status_code, detail="영상 분석 서비스 오류")
                 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ 영상 분석 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"영상 분석 실패: {str(e)}")
@@ -0,0 +1,237 @@
+# api-gateway/resilience.py (하위 서비스 호출 재시도 + 서비스별 회로 차단기, 게이트웨이용)
+# 게이트웨이는 회로가 열려 있으면 기다리지 않고 바로 503 을 돌려주므로 대기 (max_pause) 없는 구현만 둠
+# (회로가 닫힐 때까지 파이프라인을 멈추는 구현은 video-service/resilience.py)
+import time
+import random
+import asyncio
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 서비스를 잠시 쓸 수 없다는 응답 → 재시도 (429 는 살아 있지만 바쁜 상태라 회로 실패로 세지 않음)
+RETRYABLE_STATUS = (429, 502, 503, 504)
+# 그 밖의 5xx (모델 추론 실패 등) 는 회로 실패로 세고 idempotent 호출만 재시도, 다 쓰면 응답을 그대로 반환
+SERVER_ERROR_MIN_STATUS = 500
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) → 대기 초"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 요청을 보내지 않음 (retry_after: 회로가 다시 시험 요청을 받기까지 남은 초)"""
+
+    def __init__(self, service: str, retry_after: float):
+        super().__init__(f"{service} 서비스 회로 차단 중 ({retry_after:.1f}초 후 재시도)")
+        self.service = service
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    서비스별 회로 차단기 (closed → open → half_open → closed)
+    - 연속 실패가 failure_threshold 번이면 open_seconds 동안 열림 (Retry-After 가 더 길면 그만큼)
+    - 열린 동안은 기다리지 않고 CircuitOpenError
+    - 열린 시간이 끝나면 시험 요청 하나만 보내고, 성공하면 닫히고 실패하면 다시 열림
+    """
+
+    def __init__(self, service: str, failure_threshold: int = 5, open_seconds: float = 10.0,
+                 min_retry_after: float = 0.2):
+        self.service = service
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = open_seconds
+        self.min_retry_after = min_retry_after
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.opened_at: Optional[float] = None
+        self._probe_inflight = False
+        self.opens = 0
+        self.open_seconds_total = 0.0
+        self.rejected = 0
+
+    def _remaining(self, now: float) -> float:
+        return max(0.0, self.open_until - now)
+
+    def acquire(self) -> bool:
+        """요청을 보내도 되는지 확인 (반환값: 시험 요청 여부), 안 되면 CircuitOpenError"""
+        now = time.monotonic()
+        if self.state == "closed":
+            return False
+        if self.state == "open" and now >= self.open_until:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probe_inflight:
+            self._probe_inflight = True
+            return True
+        self.rejected += 1
+        raise CircuitOpenError(self.service, max(self._remaining(now), self.min_retry_after))
+
+    def release_probe(self):
+        """시험 요청이 결과 없이 끝남 (취소) → 다른 호출자가 시험할 수 있게"""
+        self._probe_inflight = False
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self._probe_inflight = False
+        if self.state != "closed":
+            self._close()
+
+    def record_failure(self, retry_after: Optional[float] = None):
+        self._probe_inflight = False
+        self.consecutive_failures += 1
+        if self.state == "half_open" or (self.state == "closed" and self.consecutive_failures >= self.failure_threshold):
+            self._open(retry_after)
+        elif self.state == "open" and retry_after:
+            self.open_until = max(self.open_until, time.monotonic() + retry_after)
+
+    def _open(self, retry_after: Optional[float]):
+        now = time.monotonic()
+        self.open_until = now + max(self.open_seconds, retry_after or 0.0)
+        if self.opened_at is None:
+            self.opened_at = now
+            self.opens += 1
+            logger.warning(
+                f"🚧 {self.service} 회로 열림: 연속 실패 {self.consecutive_failures}회, "
+                f"{self.open_until - now:.1f}초 동안 요청 중지"
+            )
+        self.state = "open"
+
+    def _close(self):
+        if self.opened_at is not None:
+            self.open_seconds_total += time.monotonic() - self.opened_at
+            self.opened_at = None
+        self.state = "closed"
+        logger.info(f"✅ {self.service} 회로 닫힘: 요청 재개")
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        current_open = now - self.opened_at if self.opened_at is not None else 0.0
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opens": self.opens,
+            "open_seconds_total": round(self.open_seconds_total + current_open, 1),
+            "reopens_in_seconds": round(self._remaining(now), 1) if self.state == "open" else None,
+            "rejected": self.rejected
+        }
+
+
+class ResilientService:
+    """
+    하위 서비스 호출 래퍼: 회로 차단기 + 지터 백오프 재시도
+    - 재시도 대상: 연결 실패, RETRYABLE_STATUS, (idempotent 호출이면) 타임아웃 등 전송 오류 / 그 밖의 5xx
+    - 대기 시간: 0 ~ base_delay x 2^시도 의 균등 난수 (full jitter, max_delay 상한)
+      Retry-After 가 max_delay 보다 길면 기다리지 않고 그 응답을 그대로 전달
+    - 재시도 중 회로가 열리면 바로 CircuitOpenError
+    - 재시도를 다 써도 실패하면 마지막 응답 반환 / 마지막 예외 발생
+    """
+
+    def __init__(self, service: str, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 10.0,
+                 failure_threshold: int = 5, open_seconds: float = 10.0):
+        self.service = service
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = CircuitBreaker(service, failure_threshold, open_seconds)
+        self.calls = 0
+        self.retries = 0
+        self.retry_wait_seconds = 0.0
+        self.gave_up = 0
+        self.server_errors = 0
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """attempt 번째 재시도 전 대기 초 (None = 재시도하지 않음)"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+    async def call(self, send: Callable[[], Awaitable[httpx.Response]], idempotent: bool = True) -> httpx.Response:
+        """send 는 매번 새 요청을 보내는 함수 (본문을 다시 만들 수 있어야 함)"""
+        self.calls += 1
+        attempt = 0
+        while True:
+            probe = self.breaker.acquire()
+            retry_after = None
+            try:
+                response = await send()
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                # 요청이 서비스에 닿지 않음 → 항상 다시 보내도 안전
+                self.breaker.record_failure()
+                error: Optional[Exception] = e
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                if not idempotent:
+                    raise
+                error = e
+            except BaseException:
+                if probe:
+                    self.breaker.release_probe()
+                raise
+            else:
+                server_error = (response.status_code >= SERVER_ERROR_MIN_STATUS
+                                and response.status_code not in RETRYABLE_STATUS)
+                if response.status_code not in RETRYABLE_STATUS and not server_error:
+                    self.breaker.record_success()
+                    return response
+                if server_error:
+                    # 서비스는 응답하지만 요청 처리에 실패 (크래시하는 모델이면 회로가 열림)
+                    self.server_errors += 1
+                    self.breaker.record_failure()
+                    if not idempotent:
+                        return response
+                else:
+                    retry_after = parse_retry_after(response.headers.get("retry-after"))
+                    if response.status_code >= SERVER_ERROR_MIN_STATUS:
+                        self.breaker.record_failure(retry_after)
+                    elif probe:
+                        self.breaker.release_probe()
+                error = None
+
+            delay = self.backoff(attempt, retry_after) if attempt + 1 < self.max_attempts else None
+            if delay is None:
+                self.gave_up += 1
+                if error is not None:
+                    raise error
+                return response
+            attempt += 1
+            if self.breaker.state == "open":
+                # 백오프 없이 다음 acquire 에서 바로 회로 차단 처리
+                continue
+            self.retries += 1
+            self.retry_wait_seconds += delay
+            logger.info(f"🔁 {self.service} 재시도 {attempt}/{self.max_attempts - 1} "
+                        f"({type(error).__name__ if error is not None else f'HTTP {response.status_code}'}, {delay:.2f}초 후)")
+            await asyncio.sleep(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "retry_wait_seconds": round(self.retry_wait_seconds, 1),
+            "gave_up": self.gave_up,
+            "server_errors": self.server_errors,
+            "max_attempts": self.max_attempts,
+            "circuit": self.breaker.get_stats()
+        }
@@ -742,9 +742,10 @@ async def police_image_viewer(case_id: str):
                     html += `
                         <div class="image-card">
                             <div class="suspect-id">👤 ${{img.suspect_id}}</div>
-                            <img src="data:image/png;base64,${{img.cropped_image}}" 
+                            <img src="${{API_BASE}}${{img.cropped_image_url}}?size=md" 
                                  class="crop-image" 
-                                 onclick="openModal('data:image/png;base64,${{img.cropped_image}}', '${{img.suspect_id}}', '${{img.timestamp}}', '${{accuracy}}')"
+                                 loading="lazy"
+                                 onclick="openModal('${{API_BASE}}${{img.cropped_image_url}}', '${{img.suspect_id}}', '${{img.timestamp}}', '${{accuracy}}')"
                                  alt="용의자 ${{img.suspect_id}}">
                             <div>
                                 <div class="similarity-score ${{accuracyClass}}">${{accuracy}}% 일치</div>
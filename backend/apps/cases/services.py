@@ -6,6 +6,7 @@ import asyncio
 import json
 import logging
 from django.conf import settings
+from django.urls import reverse
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import base64
@@ -233,8 +234,11 @@ class AIService:
             crop_images = evidence_package.get('cropped_suspect_images', [])
             
             for idx, crop_img in enumerate(crop_images):
-                # Base64 이미지 URL 생성
-                crop_image_url = f"data:image/png;base64,{crop_img.get('cropped_image', '')}"
+                # 크롭 이미지 프록시 URL (콘텐츠 주소 기반)
+                crop_image_url = (
+                    reverse('cases:crop_blob', kwargs={'digest': crop_img['crop_digest']})
+                    if crop_img.get('crop_digest') else None
+                )
                 
                 markers_data.append({
                     'location_name': f"AI 탐지 위치 {idx + 1}",
@@ -18,9 +18,19 @@ urlpatterns = [
 
     # 🤖 AI 연동 새로운 엔드포인트들
     path('<uuid:case_id>/cctv/analyze/', views.analyze_cctv_video, name='analyze_cctv'),  # POST /api/cases/1/cctv/analyze/
+    path('<uuid:case_id>/cctv/analyze_batch/', views.analyze_cctv_batch, name='analyze_cctv_batch'),  # POST (여러 카메라 영상)
+    path('<uuid:case_id>/cctv/batches/<str:batch_id>/', views.cctv_batch_result, name='cctv_batch_result'),  # GET 통합 타임라인, POST 마커 저장
+    path('<uuid:case_id>/cctv/uploads/', views.create_cctv_upload, name='create_cctv_upload'),  # POST /api/cases/1/cctv/uploads/
+    path('<uuid:case_id>/cctv/uploads/<str:upload_id>/', views.cctv_upload_chunk, name='cctv_upload_chunk'),  # GET, PUT, DELETE
+    path('<uuid:case_id>/cctv/uploads/<str:upload_id>/finalize/', views.finalize_cctv_upload, name='finalize_cctv_upload'),  # POST
     path('<uuid:case_id>/analysis/<str:analysis_id>/status/', views.get_analysis_status, name='analysis_status'),  # GET /api/cases/1/analysis/abc123/status/
+    path('<uuid:case_id>/analysis/<str:analysis_id>/events/', views.analysis_events, name='analysis_events'),  # GET (text/event-stream)
+    path('<uuid:case_id>/analysis/<str:analysis_id>/cancel/', views.cancel_analysis, name='cancel_analysis'),  # POST
     path('<uuid:case_id>/analysis/<str:analysis_id>/results/', views.get_analysis_results, name='analysis_results'),  # GET /api/cases/1/analysis/abc123/results/
     
+    # 🖼️ 크롭 이미지 (콘텐츠 주소 기반, <img> 태그용)
+    path('blobs/<str:digest>/', views.crop_blob, name='crop_blob'),  # GET /api/cases/blobs/<sha256>/?size=sm|md
+    
     # 🤖 AI 서비스 상태 확인
     path('ai/health/', views.ai_health_check, name='ai_health'),  # GET /api/cases/ai/health/
 
@@ -1,8 +1,9 @@
 # backend/apps/cases/views.py - DRF APIView로 수정
 
 import json
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -254,6 +255,7 @@ class CaseMarkersAPIView(APIView):
             confidence_score = float(request.data.get('confidence_score', 1.0))
             is_confirmed = request.data.get('is_confirmed', 'true').lower() == 'true'
             is_excluded = request.data.get('is_excluded', 'false').lower() == 'true'
+            crop_image_url = request.data.get('crop_image_url', '').strip() or None  # AI 탐지 크롭 이미지 URL
             
             logger.info(f"📝 받은 데이터: {location_name}, {detected_at}, {police_comment}")
             
@@ -288,6 +290,7 @@ class CaseMarkersAPIView(APIView):
                 confidence_score=confidence_score,
                 is_confirmed=is_confirmed,
                 is_excluded=is_excluded,
+                crop_image_url=crop_image_url,
                 created_by=request.user,  # 인증된 사용자
                 sequence_order=case.cctv_markers.count() + 1  # 순서 자동 설정
             )
@@ -464,6 +467,45 @@ class CaseDeleteAPIView(APIView):
 delete_case = CaseDeleteAPIView.as_view()
 
 # 🤖 AI 관련 엔드포인트들 
+def register_suspect_for_matching(suspect):
+    """사건 용의자를 Clothing Service에 등록 (실패 시 에러 Response 반환)"""
+    suspect_image_path = suspect.reference_image_url.lstrip('/')
+    full_image_path = os.path.join(settings.BASE_DIR, suspect_image_path)
+    
+    if not os.path.exists(full_image_path):
+        return Response({
+            'error': f'용의자 사진 파일을 찾을 수 없습니다: {suspect_image_path}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        with open(full_image_path, 'rb') as f:
+            image_data = f.read()
+        
+        files = {'file': (f'{suspect.ai_person_id}.jpg', image_data, 'image/jpeg')}
+        data = {'person_id': suspect.ai_person_id}
+        
+        response = requests.post(
+            'http://clothing-service:8002/register_person',
+            files=files,
+            data=data,
+            timeout=30
+        )
+        
+        if response.status_code != 200:
+            logger.error(f"용의자 등록 실패: {response.status_code} - {response.text}")
+            return Response({
+                'error': f'용의자 등록 실패: {response.status_code}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        logger.info(f"✅ 용의자 등록 완료: {suspect.ai_person_id}")
+        return None
+        
+    except Exception as reg_error:
+        logger.error(f"용의자 등록 오류: {reg_error}")
+        return Response({
+            'error': f'용의자 등록 오류: {reg_error}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 class CCTVAnalysisAPIView(APIView):
     """CCTV 영상 분석 API - DRF APIView로 통일"""
     
@@ -505,43 +547,10 @@ class CCTVAnalysisAPIView(APIView):
             logger.info(f"📁 파일 수신: {cctv_video.name}, 크기: {cctv_video.size/1024/1024:.2f}MB")
             logger.info(f"👤 대상 용의자: {first_suspect.ai_person_id}")
             
-            # 3. 해당 사건의 용의자를 Clothing Service에 임시 등록
-            suspect_image_path = first_suspect.reference_image_url.lstrip('/')
-            full_image_path = os.path.join(settings.BASE_DIR, suspect_image_path)
-            
-            if not os.path.exists(full_image_path):
-                return Response({
-                    'error': f'용의자 사진 파일을 찾을 수 없습니다: {suspect_image_path}'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # 4. Clothing Service에 이 사건의 용의자만 등록
-            try:
-                with open(full_image_path, 'rb') as f:
-                    image_data = f.read()
-                
-                files = {'file': (f'{first_suspect.ai_person_id}.jpg', image_data, 'image/jpeg')}
-                data = {'person_id': first_suspect.ai_person_id}
-                
-                response = requests.post(
-                    'http://clothing-service:8002/register_person',
-                    files=files,
-                    data=data,
-                    timeout=30
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"용의자 등록 실패: {response.status_code} - {response.text}")
-                    return Response({
-                        'error': f'용의자 등록 실패: {response.status_code}'
-                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-                
-                logger.info(f"✅ 용의자 등록 완료: {first_suspect.ai_person_id}")
-                
-            except Exception as reg_error:
-                logger.error(f"용의자 등록 오류: {reg_error}")
-                return Response({
-                    'error': f'용의자 등록 오류: {reg_error}'
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            # 3-4. Clothing Service에 이 사건의 용의자만 등록
+            registration_error = register_suspect_for_matching(first_suspect)
+            if registration_error is not None:
+                return registration_error
             
             # 5. AI Gateway로 CCTV 분석 요청
             gateway_url = os.getenv('AI_GATEWAY_URL', 'http://api-gateway:8000')
@@ -552,7 +561,8 @@ class CCTVAnalysisAPIView(APIView):
                 'date': incident_time,
                 'officer_name': request.user.username,
                 'case_number': str(case_id),
-                'stop_on_detect': True
+                'stop_on_detect': True,
+                **_analysis_range_fields(request)
             }
             
             logger.info(f"📤 AI 요청 데이터: {data}")
@@ -576,6 +586,9 @@ class CCTVAnalysisAPIView(APIView):
                     'suspect_id': first_suspect.ai_person_id,
                     'message': f'사건 {case.case_number}의 용의자와 매칭 분석이 시작되었습니다'
                 }, status=status.HTTP_200_OK)
+            elif response.status_code == 429:
+                # 분석 대기열 초과 → Retry-After 와 함께 그대로 전달
+                return _gateway_upload_response(response)
             else:
                 logger.error(f"❌ AI 서비스 오류: {response.status_code} - {response.text}")
                 return Response({
@@ -596,6 +609,439 @@ class CCTVAnalysisAPIView(APIView):
 # 기존 함수 제거하고 뷰 래핑 추가
 analyze_cctv_video = CCTVAnalysisAPIView.as_view()
 
+def _analysis_range_fields(request):
+    """분석 구간 (start_time / end_time), 관심 영역 (roi 다각형), 스캔 방식 (scan_mode) 을 AI Gateway 폼 필드로 전달"""
+    fields = {}
+    for key in ('start_time', 'end_time', 'roi', 'scan_mode'):
+        value = request.data.get(key)
+        if value in (None, ''):
+            continue
+        # JSON 요청 본문의 다각형 배열은 문자열로 직렬화
+        fields[key] = json.dumps(value) if isinstance(value, (list, tuple)) else value
+    return fields
+
+def _gateway_upload_response(response):
+    """AI Gateway 업로드 응답을 그대로 전달"""
+    try:
+        payload = response.json()
+    except ValueError:
+        payload = {'error': response.text}
+    if response.status_code != 200 and 'detail' in payload:
+        payload = {'error': payload['detail']}
+    headers = {'Retry-After': response.headers['Retry-After']} if 'Retry-After' in response.headers else None
+    return Response(payload, status=response.status_code, headers=headers)
+
+def _case_owner(case_id):
+    """업로드 세션 / 일괄 분석 소유자 (만든 사건에서만 청크 전송 / 완료 / 취소, 결과 조회 가능)"""
+    return f"case:{case_id}"
+
+def _case_not_found():
+    return Response({
+        'error': '해당 사건을 찾을 수 없거나 접근 권한이 없습니다.'
+    }, status=status.HTTP_404_NOT_FOUND)
+
+class CCTVUploadSessionAPIView(APIView):
+    """재개 가능한 CCTV 청크 업로드 - 세션 생성"""
+    
+    authentication_classes = [SimpleTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request, case_id):
+        """업로드 세션 생성 (파일명, 전체 크기)"""
+        try:
+            case = get_object_or_404(Case, id=case_id, created_by=request.user)
+            gateway_url = os.getenv('AI_GATEWAY_URL', 'http://api-gateway:8000')
+            
+            response = requests.post(
+                f"{gateway_url}/police/uploads",
+                data={
+                    'filename': request.data.get('filename', 'cctv_video.mp4'),
+                    'total_size': request.data.get('total_size'),
+                    'content_type': request.data.get('content_type', 'video/mp4'),
+                    'sha256': request.data.get('sha256', ''),
+                    'location': request.data.get('location_name', ''),
+                    'date': request.data.get('incident_time', ''),
+                    'owner': _case_owner(case.id)
+                },
+                timeout=30
+            )
+            logger.info(f"📦 CCTV 업로드 세션 생성 - 사건: {case.case_number}, 응답: {response.status_code}")
+            return _gateway_upload_response(response)
+            
+        except Exception as e:
+            logger.error(f"❌ 업로드 세션 생성 실패: {e}")
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class CCTVUploadChunkAPIView(APIView):
+    """재개 가능한 CCTV 청크 업로드 - 청크 전송 / 진행 상황 조회"""
+    
+    authentication_classes = [SimpleTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, case_id, upload_id):
+        """수신된 구간 및 누락 구간 조회 (이어받기용)"""
+        try:
+            if not Case.objects.filter(id=case_id, created_by=request.user).exists():
+                return _case_not_found()
+            gateway_url = os.getenv('AI_GATEWAY_URL', 'http://api-gateway:8000')
+            response = requests.get(
+                f"{gateway_url}/police/uploads/{upload_id}",
+                params={'owner': _case_owner(case_id)},
+                timeout=30
+            )
+            return _gateway_upload_response(response)
+        except Exception as e:
+            logger.error(f"❌ 업로드 상태 조회 실패: {e}")
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def put(self, request, case_id, upload_id):
+        """청크 전송 (Content-Range 헤더 또는 offset 쿼리)"""
+        try:
+            if not Case.objects.filter(id=case_id, created_by=request.user).exists():
+                return _case_not_found()
+            gateway_url = os.getenv('AI_GATEWAY_URL', 'http://api-gateway:8000')
+            headers = {'Content-Type': 'application/octet-stream'}
+            if request.META.get('HTTP_CONTENT_RANGE'):
+                headers['Content-Range'] = request.META['HTTP_CONTENT_RANGE']
+            
+            response = requests.put(
+                f"{gateway_url}/police/uploads/{upload_id}",
+                params={**request.GET.dict(), 'owner': _case_owner(case_id)},
+                headers=headers,
+                data=request.body,
+                timeout=120
+            )
+            return _gateway_upload_response(response)
+        except Exception as e:
+            logger.error(f"❌ 청크 전송 실패: {e}")
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def delete(self, request, case_id, upload_id):
+        """업로드 세션 취소"""
+        try:
+            if not Case.objects.filter(id=case_id, created_by=request.user).exists():
+                return _case_not_found()
+            gateway_url = os.getenv('AI_GATEWAY_URL', 'http://api-gateway:8000')
+            response = requests.delete(
+                f"{gateway_url}/police/uploads/{upload_id}",
+                params={'owner': _case_owner(case_id)},
+                timeout=30
+            )
+            return _gateway_upload_response(response)
+        except Exception as e:
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class CCTVUploadFinalizeAPIView(APIView):
+    """재개 가능한 CCTV 청크 업로드 - 완료 처리 및 분석 시작"""
+    
+    authentication_classes = [SimpleTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request, case_id, upload_id):
+        """모든 청크 전송 후 호출 - 용의자 등록 → 분석 시작"""
+        try:
+            try:
+                case = Case.objects.get(id=case_id, created_by=request.user)
+            except Case.DoesNotExist:
+                return Response({
+                    'error': '해당 사건을 찾을 수 없거나 접근 권한이 없습니다.'
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            first_suspect = case.suspects.first()
+            if not first_suspect or not first_suspect.reference_image_url:
+                return Response({
+                    'error': '이 사건에 등록된 용의자 사진이 없습니다. 먼저 사건에 용의자 사진을 등록해주세요.'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            registration_error = register_suspect_for_matching(first_suspect)
+            if registration_error is not None:
+                return registration_error
+            
+            gateway_url = os.getenv('AI_GATEWAY_URL', 'http://api-gateway:8000')
+            response = requests.post(
+                f"{gateway_url}/police/uploads/{upload_id}/finalize",
+                data={
+                    'location': request.data.get('location_name', ''),
+                    'date': request.data.get('incident_time', ''),
+                    'officer_name': request.user.username,
+                    'case_number': str(case_id),
+                    'stop_on_detect': True,
+                    'owner': _case_owner(case.id),
+                    **_analysis_range_fields(request)
+                },
+                timeout=120
+            )
+            
+            if response.status_code != 200:
+                return _gateway_upload_response(response)
+            
+            result = response.json()
+            logger.info(f"✅ 청크 업로드 분석 시작: {result.get('analysis_id')}")
+            return Response({
+                'success': True,
+                'analysis_id': result.get('analysis_id'),
+                'case_id': result.get('case_id', str(case_id)),
+                'suspect_id': first_suspect.ai_person_id,
+                'message': f'사건 {case.case_number}의 용의자와 매칭 분석이 시작되었습니다'
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"❌ 업로드 완료 처리 실패: {e}")
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+create_cctv_upload = CCTVUploadSessionAPIView.as_view()
+cctv_upload_chunk = CCTVUploadChunkAPIView.as_view()
+finalize_cctv_upload = CCTVUploadFinalizeAPIView.as_view()
+
+class CCTVBatchAnalysisAPIView(APIView):
+    """여러 카메라 CCTV 영상 일괄 분석 - 용의자는 한 번만 등록하고 카메라 간 통합 타임라인으로 결과 조회"""
+    
+    authentication_classes = [SimpleTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request, case_id):
+        """cctv_videos (여러 파일) + cameras ([{location, recorded_at, latitude, longitude}, ...] JSON, 영상 순서대로)"""
+        try:
+            try:
+                case = Case.objects.get(id=case_id, created_by=request.user)
+            except Case.DoesNotExist:
+                return Response({
+                    'error': '해당 사건을 찾을 수 없거나 접근 권한이 없습니다.'
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            first_suspect = case.suspects.first()
+            if not first_suspect or not first_suspect.reference_image_url:
+                return Response({
+                    'error': '이 사건에 등록된 용의자 사진이 없습니다. 먼저 사건에 용의자 사진을 등록해주세요.'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            videos = request.FILES.getlist('cctv_videos')
+            cameras = request.data.get('cameras')
+            if not videos or not cameras:
+                return Response({
+                    'error': 'CCTV 영상 파일(cctv_videos)과 카메라 정보(cameras)가 필요합니다'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            # 카메라가 여러 대여도 용의자 등록은 한 번 (모든 카메라가 같은 갤러리로 매칭)
+            registration_error = register_suspect_for_matching(first_suspect)
+            if registration_error is not None:
+                return registration_error
+            
+            gateway_url = os.getenv('AI_GATEWAY_URL', 'http://api-gateway:8000')
+            response = requests.post(
+                f"{gateway_url}/police/analyze_cctv_batch",
+                files=[('video_files', (video.name, video, video.content_type)) for video in videos],
+                data={
+                    'cameras': cameras if isinstance(cameras, str) else json.dumps(cameras),
+                    'officer_name': request.user.username,
+                    'case_number': str(case_id),
+                    'owner': _case_owner(case.id),
+                    **{
+                        key: request.data[key] for key in ('fps_interval', 'sampling', 'scan_mode')
+                        if request.data.get(key)
+                    }
+                },
+                timeout=600
+            )
+            
+            if response.status_code != 200:
+                return _gateway_upload_response(response)
+            
+            result = response.json()
+            logger.info(f"✅ 다중 카메라 분석 시작: {result.get('batch_id')} ({len(videos)}대)")
+            return Response({
+                'success': True,
+                'batch_id': result.get('batch_id'),
+                'cameras': result.get('cameras', []),
+                'suspect_id': first_suspect.ai_person_id,
+                'message': f'사건 {case.case_number}의 카메라 {len(videos)}대 일괄 분석이 시작되었습니다'
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"❌ 다중 카메라 분석 실패: {e}")
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class CCTVBatchResultAPIView(APIView):
+    """다중 카메라 일괄 분석 결과 - 통합 타임라인 조회 (GET) / CCTVMarker 로 저장 (POST)"""
+    
+    authentication_classes = [SimpleTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    
+    def _fetch_batch(self, case_id, batch_id):
+        """이 사건으로 시작한 일괄 분석만 조회 (다른 사건의 batch_id 는 video-service 가 404)"""
+        gateway_url = os.getenv('AI_GATEWAY_URL', 'http://api-gateway:8000')
+        return requests.get(
+            f"{gateway_url}/police/batches/{batch_id}",
+            params={'owner': _case_owner(case_id)},
+            timeout=30
+        )
+    
+    def _marker_candidate(self, request, sighting):
+        """통합 타임라인 목격 → CCTVMarker 필드"""
+        return {
+            'location_name': sighting.get('location_name', ''),
+            'latitude': sighting.get('latitude'),
+            'longitude': sighting.get('longitude'),
+            'detected_at': sighting.get('detected_at'),
+            'confidence_score': sighting.get('confidence_score', 0),
+            'confidence_percentage': f"{sighting.get('confidence_score', 0) * 100:.1f}%",
+            'crop_image_url': crop_image_urls(request, sighting)['cropped_image_url'] or None,
+            'analysis_id': sighting.get('analysis_id', ''),
+            'sequence_order': sighting.get('sequence_order', 0),
+            'suspect_id': sighting.get('suspect_id'),
+            'left_at': sighting.get('left_at'),
+            'ai_generated': True
+        }
+    
+    def get(self, request, case_id, batch_id):
+        """진행 상황 + 카메라 간 통합 타임라인 (마커 후보 형태)"""
+        try:
+            if not Case.objects.filter(id=case_id, created_by=request.user).exists():
+                return _case_not_found()
+            response = self._fetch_batch(case_id, batch_id)
+            if response.status_code != 200:
+                return _gateway_upload_response(response)
+            
+            result = response.json()
+            return Response({
+                'success': True,
+                'batch_id': batch_id,
+                'status': result.get('status'),
+                'progress': result.get('progress', 0),
+                'cameras': result.get('cameras', []),
+                'marker_candidates': [self._marker_candidate(request, s) for s in result.get('timeline', [])],
+                'routes': result.get('routes', []),
+                'gallery_changed': result.get('gallery_changed', False)
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.error(f"❌ 다중 카메라 분석 결과 조회 실패: {e}")
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def post(self, request, case_id, batch_id):
+        """통합 타임라인을 CCTVMarker 로 저장 (sequence_orders 로 일부만 선택 가능, 이미 저장한 목격은 건너뜀)"""
+        from django.utils.dateparse import parse_datetime
+        
+        try:
+            try:
+                case = Case.objects.get(id=case_id, created_by=request.user)
+            except Case.DoesNotExist:
+                return _case_not_found()
+            response = self._fetch_batch(case.id, batch_id)
+            if response.status_code != 200:
+                return _gateway_upload_response(response)
+            
+            result = response.json()
+            if result.get('status') not in ('completed', 'partial'):
+                return Response({
+                    'error': '일괄 분석이 아직 완료되지 않았습니다',
+                    'status': result.get('status')
+                }, status=status.HTTP_409_CONFLICT)
+            
+            selected = request.data.get('sequence_orders')
+            if isinstance(selected, str):
+                selected = json.loads(selected) if selected else None
+            candidates = [
+                self._marker_candidate(request, sighting) for sighting in result.get('timeline', [])
+                if selected is None or sighting.get('sequence_order') in selected
+            ]
+            
+            created = []
+            next_order = case.cctv_markers.count() + 1
+            for candidate in candidates:
+                detected_at = parse_datetime(candidate['detected_at'])
+                if case.cctv_markers.filter(analysis_id=candidate['analysis_id'], detected_at=detected_at).exists():
+                    continue
+                marker = CCTVMarker.objects.create(
+                    case=case,
+                    suspect=case.suspects.first(),
+                    location_name=candidate['location_name'],
+                    latitude=candidate['latitude'],
+                    longitude=candidate['longitude'],
+                    detected_at=detected_at,
+                    confidence_score=candidate['confidence_score'],
+                    crop_image_url=candidate['crop_image_url'],
+                    police_comment=f"다중 카메라 AI 분석 ({batch_id})",
+                    is_confirmed=False,
+                    analysis_id=candidate['analysis_id'],
+                    created_by=request.user,
+                    sequence_order=next_order
+                )
+                next_order += 1
+                created.append({**candidate, 'id': str(marker.id), 'sequence_order': marker.sequence_order,
+                                'is_confirmed': marker.is_confirmed})
+            
+            logger.info(f"✅ 다중 카메라 마커 저장: 사건 {case.case_number}, {len(created)}개 ({batch_id})")
+            return Response({
+                'success': True,
+                'created_markers': created,
+                'skipped': len(candidates) - len(created)
+            }, status=status.HTTP_201_CREATED)
+        except Exception as e:
+            logger.error(f"❌ 다중 카메라 마커 저장 실패: {e}")
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+analyze_cctv_batch = CCTVBatchAnalysisAPIView.as_view()
+cctv_batch_result = CCTVBatchResultAPIView.as_view()
+
+def crop_image_urls(request, crop_img):
+    """video-service 크롭 참조(crop_digest)를 백엔드 이미지 프록시 절대 URL 로 변환"""
+    digest = crop_img.get('crop_digest')
+    if not digest:
+        return {'cropped_image_url': '', 'thumbnail_url': ''}
+    url = request.build_absolute_uri(reverse('cases:crop_blob', kwargs={'digest': digest}))
+    return {'cropped_image_url': url, 'thumbnail_url': f"{url}?size=sm"}
+
+def build_detection_candidate(request, crop_img, index):
+    """크롭 이미지 → 경찰이 선택할 수 있는 후보 형태 (분석 중 부분 결과와 같은 detection_id 사용)"""
+    seq = crop_img.get('seq', index + 1)
+    return {
+        'detection_id': f"detection_{seq}",
+        'suspect_id': crop_img.get('suspect_id', f'suspect_{seq}'),
+        'similarity': crop_img.get('similarity', 0),
+        'similarity_percentage': f"{crop_img.get('similarity', 0) * 100:.1f}%",
+        **crop_image_urls(request, crop_img),
+        'timestamp': crop_img.get('timestamp', ''),
+        'confidence_level': 'high' if crop_img.get('similarity', 0) > 0.8 else 'medium'
+    }
+
+@csrf_exempt
+def crop_blob(request, digest):
+    """크롭 이미지 프록시 (<img> 태그에서 직접 사용, ETag / 캐시 헤더 전달)"""
+    gateway_url = os.getenv('AI_GATEWAY_URL', 'http://api-gateway:8000')
+    headers = {}
+    if request.META.get('HTTP_IF_NONE_MATCH'):
+        headers['If-None-Match'] = request.META['HTTP_IF_NONE_MATCH']
+    
+    try:
+        response = requests.get(
+            f"{gateway_url}/police/blobs/{digest}",
+            params=request.GET.dict(),
+            headers=headers,
+            timeout=30
+        )
+    except requests.exceptions.RequestException as e:
+        logger.error(f"❌ 크롭 이미지 조회 실패: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=502)
+    
+    if response.status_code not in (200, 304):
+        return JsonResponse({'success': False, 'error': '이미지를 찾을 수 없습니다'}, status=response.status_code)
+    
+    result = HttpResponse(
+        response.content,
+        status=response.status_code,
+        content_type=response.headers.get('Content-Type', 'image/png')
+    )
+    for header in ('ETag', 'Cache-Control'):
+        if header in response.headers:
+            result[header] = response.headers[header]
+    return result
+
 @csrf_exempt
 def get_analysis_status(request, case_id, analysis_id):
     """AI 분석 진행상황 조회 - 수정된 버전"""
@@ -655,6 +1101,72 @@ def get_analysis_status(request, case_id, analysis_id):
             'error': str(e)
         }, status=500)
 
+@csrf_exempt
+def cancel_analysis(request, case_id, analysis_id):
+    """AI 분석 취소 (재접수 시 이전 분석 중단)"""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'POST 요청만 허용됩니다'}, status=405)
+    
+    video_service_url = os.getenv('VIDEO_SERVICE_URL', 'http://video-service:8004')
+    try:
+        response = requests.post(f"{video_service_url}/analysis/{analysis_id}/cancel", timeout=30)
+    except requests.exceptions.RequestException as e:
+        logger.error(f"❌ 분석 취소 실패: analysis_id={analysis_id}, error={e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=502)
+    
+    if response.status_code != 200:
+        try:
+            detail = response.json().get('detail', '분석 취소 실패')
+        except ValueError:
+            detail = '분석 취소 실패'
+        return JsonResponse({'success': False, 'error': detail}, status=response.status_code)
+    
+    result = response.json()
+    logger.info(f"⏹️ 분석 취소 요청: case_id={case_id}, analysis_id={analysis_id}")
+    return JsonResponse({
+        'success': True,
+        'analysis_id': analysis_id,
+        'status': result.get('status', 'canceling'),
+        'message': result.get('message', '')
+    })
+
+@csrf_exempt
+def analysis_events(request, case_id, analysis_id):
+    """AI 분석 진행 SSE 스트림 프록시 (EventSource 용, 상태 폴링 대체)"""
+    gateway_url = os.getenv('AI_GATEWAY_URL', 'http://api-gateway:8000')
+    
+    try:
+        # 읽기 타임아웃은 keepalive(15초) 보다 길게
+        response = requests.get(
+            f"{gateway_url}/police/analysis_events/{analysis_id}",
+            stream=True,
+            timeout=(10, 60)
+        )
+    except requests.exceptions.RequestException as e:
+        logger.error(f"❌ 분석 이벤트 스트림 연결 실패: analysis_id={analysis_id}, error={e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=502)
+    
+    if response.status_code != 200:
+        response.close()
+        return JsonResponse({
+            'success': False,
+            'error': f'이벤트 스트림 연결 실패: {response.status_code}'
+        }, status=response.status_code)
+    
+    def relay():
+        try:
+            for chunk in response.iter_content(chunk_size=None):
+                yield chunk
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"⚠️ 분석 이벤트 스트림 중단: analysis_id={analysis_id}, error={e}")
+        finally:
+            response.close()
+    
+    result = StreamingHttpResponse(relay(), content_type='text/event-stream')
+    result['Cache-Control'] = 'no-cache'
+    result['X-Accel-Buffering'] = 'no'
+    return result
+
 @csrf_exempt
 def get_analysis_results(request, case_id, analysis_id):
     """AI 분석 완료 결과 조회 + CCTV 정보 포함"""
@@ -700,7 +1212,7 @@ def get_analysis_results(request, case_id, analysis_id):
                     'suspect_id': crop_img.get('suspect_id', f'suspect_{i+1}'),
                     'similarity': crop_img.get('similarity', 0),
                     'similarity_percentage': f"{crop_img.get('similarity', 0) * 100:.1f}%",
-                    'cropped_image_base64': crop_img.get('cropped_image', ''),
+                    **crop_image_urls(request, crop_img),
                     'timestamp': crop_img.get('timestamp', ''),
                     'bbox': crop_img.get('bbox', {}),
                     'person_id': crop_img.get('person_id', ''),
@@ -766,19 +1278,38 @@ def get_analysis_results(request, case_id, analysis_id):
 
 @csrf_exempt
 def get_analysis_results(request, case_id, analysis_id):
-    """AI 분석 완료 결과 조회 + 마커 생성"""
+    """AI 분석 완료 결과 조회 + 마커 생성 (?since=커서 지정 시 분석 중 새로 찾은 후보만 반환)"""
     try:
         video_service_url = os.getenv('VIDEO_SERVICE_URL', 'http://video-service:8004')
+        since = request.GET.get('since')
         
         # AI Gateway의 case_report 엔드포인트 호출
         response = requests.get(
             f"{video_service_url}/analysis_result/{analysis_id}",
+            params={'since': since} if since is not None else None,
             timeout=30
         )
         
         if response.status_code == 200:
             result = response.json()
             
+            # 부분 결과 (진행 중에도 200)
+            if since is not None:
+                new_candidates = [
+                    build_detection_candidate(request, crop_img, i)
+                    for i, crop_img in enumerate(result.get('suspect_crop_images', []))
+                ]
+                return JsonResponse({
+                    'success': True,
+                    'status': result.get('status', 'processing'),
+                    'progress': result.get('progress', 0),
+                    'complete': result.get('complete', False),
+                    'cursor': result.get('cursor', 0),
+                    'detection_candidates': new_candidates,
+                    'timeline_data': result.get('suspects_timeline', []),
+                    'message': f'{len(new_candidates)}개의 새 용의자 후보가 발견되었습니다'
+                })
+            
             # 분석이 완료되었는지 확인
             if result.get('status') == 'incomplete':
                 return JsonResponse({
@@ -793,17 +1324,10 @@ def get_analysis_results(request, case_id, analysis_id):
             timeline_data = result.get('suspects_timeline', [])
             
             # 🎯 경찰이 선택할 수 있는 형태로 변환
-            detection_candidates = []
-            for i, crop_img in enumerate(crop_images):
-                detection_candidates.append({
-                    'detection_id': f"detection_{i+1}",
-                    'suspect_id': crop_img.get('suspect_id', f'suspect_{i+1}'),
-                    'similarity': crop_img.get('similarity', 0),
-                    'similarity_percentage': f"{crop_img.get('similarity', 0) * 100:.1f}%",
-                    'cropped_image_base64': crop_img.get('cropped_image', ''),
-                    'timestamp': crop_img.get('timestamp', ''),
-                    'confidence_level': 'high' if crop_img.get('similarity', 0) > 0.8 else 'medium'
-                })
+            detection_candidates = [
+                build_detection_candidate(request, crop_img, i)
+                for i, crop_img in enumerate(crop_images)
+            ]
             
             return JsonResponse({
                 'success': True,
@@ -111,9 +111,10 @@ export const AnalysisResultsModal = ({
               >
                 {/* 크롭 이미지 */}
                 <div className="candidate-image">
-                  {candidate.cropped_image_base64 ? (
+                  {candidate.cropped_image_url ? (
                     <img
-                      src={`data:image/png;base64,${candidate.cropped_image_base64}`}
+                      src={candidate.cropped_image_url}
+                      loading="lazy"
                       alt={`용의자 후보 ${index + 1}`}
                       className="suspect-crop"
                     />
@@ -23,6 +23,7 @@ export const CCTVUploadModal = ({ isOpen, onClose, onUpload, caseId }) => {
     statusMessage: "",
     results: null,
     error: null,
+    partialCandidates: [], // 분석 중 먼저 확정된 용의자 후보
   });
 
   // 기존 상태들
@@ -171,6 +172,9 @@ export const CCTVUploadModal = ({ isOpen, onClose, onUpload, caseId }) => {
         progressData.status,
         progressData.progress
       ),
+      partialCandidates: progressData.new_candidates
+        ? [...prev.partialCandidates, ...progressData.new_candidates]
+        : prev.partialCandidates,
     }));
 
     console.log(
@@ -281,7 +285,13 @@ export const CCTVUploadModal = ({ isOpen, onClose, onUpload, caseId }) => {
           incident_time: formData.incident_time,
           suspect_description: formData.suspect_description,
           cctv_video: formData.cctv_video,
-        }
+        },
+        (uploadProgress) =>
+          setAnalysisState((prev) => ({
+            ...prev,
+            status: "uploading",
+            statusMessage: `📤 영상 업로드 중... (${uploadProgress}%)`,
+          }))
       );
 
       if (analysisResult.success) {
@@ -303,6 +313,7 @@ export const CCTVUploadModal = ({ isOpen, onClose, onUpload, caseId }) => {
           status: "started",
           statusMessage: "🤖 AI 분석 시작됨...",
           error: null,
+          partialCandidates: [],
         }));
 
         console.log(`✅ AI 분석 시작됨: ${analysisId}`);
@@ -470,6 +481,32 @@ export const CCTVUploadModal = ({ isOpen, onClose, onUpload, caseId }) => {
               </div>
             )}
 
+            {/* 분석 중 먼저 발견된 후보 */}
+            {analysisState.isAnalyzing &&
+              analysisState.partialCandidates.length > 0 && (
+                <div className="mt-3">
+                  <p className="text-sm text-blue-700 mb-2">
+                    🚨 발견된 후보 {analysisState.partialCandidates.length}명
+                    (분석 계속 진행 중)
+                  </p>
+                  <div className="flex gap-2 overflow-x-auto">
+                    {analysisState.partialCandidates.map((candidate) => (
+                      <div key={candidate.detection_id} className="text-center">
+                        <img
+                          src={candidate.thumbnail_url}
+                          alt={candidate.suspect_id}
+                          loading="lazy"
+                          className="w-16 h-20 object-cover rounded border"
+                        />
+                        <span className="text-xs text-gray-600">
+                          {candidate.similarity_percentage}
+                        </span>
+                      </div>
+                    ))}
+                  </div>
+                </div>
+              )}
+
             {/* 완료 결과 표시 */}
             {analysisState.status === "completed" && analysisState.results && (
               <div className="mt-3 text-sm text-green-700">
@@ -317,6 +317,7 @@ export const CaseTrackingPage = () => {
         is_excluded: false,
         analysis_id: analysisResults.analysis_id || null,
         ai_generated: true,
+        crop_image_url: selectedCandidate.cropped_image_url || null,
         // ✅ 선택된 용의자의 추가 정보
         suspect_info: JSON.stringify({
           detection_id: selectedCandidate.detection_id,
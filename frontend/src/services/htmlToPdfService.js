@@ -585,6 +585,7 @@ class HTMLToPDFService {
   getMarkerImageUrl(marker) {
     // 가능한 이미지 경로들을 확인 (마커 데이터 구조에 따라 조정 필요)
     const possiblePaths = [
+      marker.crop_image_url,      // AI 탐지 크롭 이미지 URL
       marker.image_url,           // 직접적인 이미지 URL
       marker.cropped_image,       // 크롭된 이미지 경로
       marker.image_path,          // 이미지 파일 경로
@@ -1,6 +1,13 @@
 // frontend/src/services/trackingService.js - AI 연동 강화
 import { api } from './api.js';
 
+// 재개 가능한 청크 업로드 설정
+const CHUNK_SIZE = 8 * 1024 * 1024;
+const CHUNK_MAX_RETRIES = 3;
+
+// 사건별 진행 중인 분석 ID (재접수 시 이전 분석 취소용)
+const activeAnalysisKey = (caseId) => `activeAnalysis:${caseId}`;
+
 export const trackingService = {
   // 사건의 마커 목록 조회
   async getMarkers(caseId) {
@@ -24,6 +31,9 @@ export const trackingService = {
       formData.append('confidence_score', markerData.confidence_score || 1.0);
       formData.append('is_confirmed', markerData.is_confirmed !== undefined ? markerData.is_confirmed : true);
       formData.append('is_excluded', markerData.is_excluded !== undefined ? markerData.is_excluded : false);
+      if (markerData.crop_image_url) {
+        formData.append('crop_image_url', markerData.crop_image_url);
+      }
       
       if (markerData.suspect_image && markerData.suspect_image instanceof File) {
         formData.append('suspect_image', markerData.suspect_image);
@@ -42,42 +52,97 @@ export const trackingService = {
     }
   },
 
-  // 🤖 CCTV 영상 업로드 및 AI 분석 시작
-  async uploadAndAnalyzeCCTV(caseId, cctvData) {
+  // 🤖 CCTV 영상 업로드 및 AI 분석 시작 (재개 가능한 청크 업로드)
+  async uploadAndAnalyzeCCTV(caseId, cctvData, onUploadProgress) {
     try {
       console.log('🎬 CCTV AI 분석 시작:', cctvData);
       
-      const formData = new FormData();
+      const videoFile = cctvData.cctv_video;
+      if (!(videoFile && videoFile instanceof File)) {
+        throw new Error('CCTV 영상 파일이 필요합니다.');
+      }
+      console.log(`📹 영상 파일: ${videoFile.name} (${(videoFile.size / 1024 / 1024).toFixed(2)}MB)`);
       
-      // 필수 데이터 추가
-      formData.append('location_name', cctvData.location_name || '');
-      formData.append('incident_time', cctvData.incident_time || '');
-      formData.append('suspect_description', cctvData.suspect_description || '');
+      // 0. 같은 사건에서 아직 진행 중인 이전 분석은 취소 (재접수 시 이전 작업이 계속 CPU 를 쓰지 않도록)
+      const previousAnalysisId = localStorage.getItem(activeAnalysisKey(caseId));
+      if (previousAnalysisId) {
+        await this.cancelAnalysis(caseId, previousAnalysisId);
+      }
       
-      // 영상 파일 추가
-      if (cctvData.cctv_video && cctvData.cctv_video instanceof File) {
-        formData.append('cctv_video', cctvData.cctv_video);
-        console.log('📹 영상 파일 추가:', cctvData.cctv_video.name);
-      } else {
-        throw new Error('CCTV 영상 파일이 필요합니다.');
+      // 1. 업로드 세션 생성 (같은 파일을 다시 올리면 기존 세션 이어받기)
+      const resumeKey = `cctvUpload:${caseId}:${videoFile.name}:${videoFile.size}:${videoFile.lastModified}`;
+      let session = null;
+      const savedUploadId = localStorage.getItem(resumeKey);
+      
+      if (savedUploadId) {
+        try {
+          const response = await api.get(`/cases/${caseId}/cctv/uploads/${savedUploadId}/`);
+          session = response.data;
+          console.log(`♻️ 이전 업로드 이어받기: ${session.progress}% 완료됨`);
+        } catch (resumeError) {
+          localStorage.removeItem(resumeKey);
+        }
       }
-
-      // FormData 내용 로깅
-      console.log('📦 전송할 FormData:');
-      for (let [key, value] of formData.entries()) {
-        if (value instanceof File) {
-          console.log(`  ${key}: [파일] ${value.name} (${(value.size / 1024 / 1024).toFixed(2)}MB)`);
-        } else {
-          console.log(`  ${key}: "${value}"`);
+      
+      if (!session) {
+        const formData = new FormData();
+        formData.append('filename', videoFile.name);
+        formData.append('total_size', videoFile.size);
+        formData.append('content_type', videoFile.type || 'video/mp4');
+        formData.append('location_name', cctvData.location_name || '');
+        formData.append('incident_time', cctvData.incident_time || '');
+        
+        const response = await api.post(`/cases/${caseId}/cctv/uploads/`, formData);
+        session = response.data;
+        localStorage.setItem(resumeKey, session.upload_id);
+      }
+      
+      // 2. 누락된 구간만 청크 단위로 전송 (실패한 청크는 재시도)
+      const uploadId = session.upload_id;
+      const chunkSize = Math.min(session.max_chunk_bytes || CHUNK_SIZE, CHUNK_SIZE);
+      let receivedBytes = session.received_bytes || 0;
+      
+      for (const [rangeStart, rangeEnd] of session.missing_ranges || []) {
+        for (let offset = rangeStart; offset < rangeEnd; offset += chunkSize) {
+          const end = Math.min(offset + chunkSize, rangeEnd);
+          const chunk = videoFile.slice(offset, end);
+          
+          for (let attempt = 1; ; attempt++) {
+            try {
+              await api.put(`/cases/${caseId}/cctv/uploads/${uploadId}/`, chunk, {
+                headers: {
+                  'Content-Type': 'application/octet-stream',
+                  'Content-Range': `bytes ${offset}-${end - 1}/${videoFile.size}`,
+                },
+              });
+              break;
+            } catch (chunkError) {
+              if (attempt >= CHUNK_MAX_RETRIES) {
+                throw chunkError;
+              }
+              console.warn(`⚠️ 청크 재시도 (${attempt}/${CHUNK_MAX_RETRIES}): ${offset}-${end}`);
+              await new Promise((resolve) => setTimeout(resolve, 1000 * attempt));
+            }
+          }
+          
+          receivedBytes += end - offset;
+          if (onUploadProgress) {
+            onUploadProgress(Math.round((receivedBytes / videoFile.size) * 100));
+          }
         }
       }
-
-      const response = await api.post(`/cases/${caseId}/cctv/analyze/`, formData, {
-        headers: {
-          'Content-Type': 'multipart/form-data',
-        },
-        timeout: 300000, // 1분 타임아웃 (분석 시작용)
-      });
+      
+      // 3. 완료 처리 → 분석 시작
+      const finalizeData = new FormData();
+      finalizeData.append('location_name', cctvData.location_name || '');
+      finalizeData.append('incident_time', cctvData.incident_time || '');
+      finalizeData.append('suspect_description', cctvData.suspect_description || '');
+      
+      const response = await api.post(`/cases/${caseId}/cctv/uploads/${uploadId}/finalize/`, finalizeData);
+      localStorage.removeItem(resumeKey);
+      if (response.data.analysis_id) {
+        localStorage.setItem(activeAnalysisKey(caseId), response.data.analysis_id);
+      }
       
       console.log('✅ CCTV 분석 시작 성공:', response.data);
       return response.data;
@@ -96,10 +161,10 @@ export const trackingService = {
       }
       
       if (error.code === 'ECONNABORTED') {
-        throw new Error('요청 시간이 초과되었습니다. 네트워크 연결을 확인해주세요.');
+        throw new Error('요청 시간이 초과되었습니다. 다시 시도하면 남은 부분부터 이어서 업로드합니다.');
       }
       
-      throw new Error('CCTV 영상 분석 시작에 실패했습니다.');
+      throw new Error(error.message || 'CCTV 영상 분석 시작에 실패했습니다.');
     }
   },
 
@@ -149,6 +214,67 @@ export const trackingService = {
     }
   },
 
+  // ⏹️ 분석 취소 (실패해도 재접수는 계속 진행)
+  async cancelAnalysis(caseId, analysisId) {
+    this.clearActiveAnalysis(caseId, analysisId);
+    try {
+      const response = await api.post(`/cases/${caseId}/analysis/${analysisId}/cancel/`);
+      console.log(`⏹️ 이전 분석 취소: ${analysisId}`, response.data);
+      return response.data;
+    } catch (error) {
+      // 이미 끝난 분석(409) 등은 무시
+      console.warn(`⚠️ 분석 취소 생략: ${analysisId}`, error.response?.data?.error || error.message);
+      return null;
+    }
+  },
+
+  clearActiveAnalysis(caseId, analysisId) {
+    if (localStorage.getItem(activeAnalysisKey(caseId)) === analysisId) {
+      localStorage.removeItem(activeAnalysisKey(caseId));
+    }
+  },
+
+  // 🚨 분석 중 커서 이후 새로 확정된 후보 조회 (진행 중에도 응답)
+  async getNewCandidates(caseId, analysisId, since = 0) {
+    const response = await api.get(`/cases/${caseId}/analysis/${analysisId}/results/`, {
+      params: { since }
+    });
+
+    if (!response.data.success) {
+      throw new Error(response.data.error || '부분 결과 조회 실패');
+    }
+    return response.data;
+  },
+
+  // 새 후보 피드 생성 (커서 유지, 요청이 겹치면 끝난 뒤 한 번 더 조회)
+  createCandidateFeed(caseId, analysisId, onCandidates) {
+    let cursor = 0;
+    let running = false;
+    let pending = false;
+
+    return async () => {
+      if (running) {
+        pending = true;
+        return;
+      }
+      running = true;
+      try {
+        do {
+          pending = false;
+          const partial = await this.getNewCandidates(caseId, analysisId, cursor);
+          cursor = partial.cursor;
+          if (partial.detection_candidates.length > 0) {
+            onCandidates(partial.detection_candidates);
+          }
+        } while (pending);
+      } catch (error) {
+        console.warn('⚠️ 새 후보 조회 실패:', error.message);
+      } finally {
+        running = false;
+      }
+    };
+  },
+
   // 🤖 AI 서비스 상태 확인
   async checkAIStatus() {
     try {
@@ -166,13 +292,105 @@ export const trackingService = {
     }
   },
 
-  // 🔄 실시간 분석 모니터링 (폴링)
-  async monitorAnalysis(caseId, analysisId, onProgress, onComplete, onError) {
+  // 📡 실시간 분석 모니터링 (SSE 스트림, 연결 실패 시 폴링)
+  monitorAnalysis(caseId, analysisId, onProgress, onComplete, onError) {
+    if (typeof EventSource === 'undefined') {
+      return this.pollAnalysis(caseId, analysisId, onProgress, onComplete, onError);
+    }
+
+    console.log(`📡 분석 이벤트 스트림 연결: ${analysisId}`);
+
+    const source = new EventSource(`${api.defaults.baseURL}/cases/${caseId}/analysis/${analysisId}/events/`);
+    let finished = false;
+    let lastProgress = { progress: 0, status: 'processing', suspects_found: 0, crop_images_available: 0 };
+    const pullCandidates = this.createCandidateFeed(caseId, analysisId, (candidates) => {
+      onProgress({ ...lastProgress, new_candidates: candidates });
+    });
+
+    const finish = () => {
+      finished = true;
+      source.close();
+    };
+    const finishTerminal = () => {
+      finish();
+      this.clearActiveAnalysis(caseId, analysisId);
+    };
+
+    source.addEventListener('progress', (event) => {
+      const data = JSON.parse(event.data);
+      lastProgress = {
+        progress: data.progress || 0,
+        status: data.status || 'processing',
+        current_phase: data.current_phase,
+        phase_description: data.phase_description,
+        queue_position: data.queue_position,
+        suspects_found: Math.max(data.suspects_found || 0, lastProgress.suspects_found),
+        crop_images_available: Math.max(data.crop_images_available || 0, lastProgress.crop_images_available)
+      };
+      onProgress(lastProgress);
+    });
+
+    // 새 용의자 매칭 → 후보(이미지 URL 포함)를 바로 받아 완료 전에 표시
+    source.addEventListener('match', (event) => {
+      const match = JSON.parse(event.data);
+      console.log(`🚨 용의자 매칭: ${match.suspect_id} (${Math.round(match.similarity * 100)}%)`);
+      lastProgress = { ...lastProgress, crop_images_available: lastProgress.crop_images_available + 1 };
+      pullCandidates();
+    });
+
+    source.addEventListener('completed', async () => {
+      finishTerminal();
+      onProgress({ ...lastProgress, progress: 100, status: 'completed' });
+      console.log('✅ 분석 완료! 결과 조회 중...');
+
+      try {
+        const results = await this.getAnalysisResults(caseId, analysisId);
+        if (results.success) {
+          console.log(`🎉 분석 완료: ${results.markers_created}개 마커 생성`);
+          onComplete(results);
+        } else {
+          onError(new Error(results.message || '분석 결과 조회 실패'));
+        }
+      } catch (error) {
+        onError(error);
+      }
+    });
+
+    source.addEventListener('failed', (event) => {
+      finishTerminal();
+      const data = JSON.parse(event.data);
+      onError(new Error(data.error || 'AI 분석이 실패했습니다.'));
+    });
+
+    source.addEventListener('canceled', () => {
+      finishTerminal();
+      onError(new Error('분석이 취소되었습니다.'));
+    });
+
+    // 스트림 연결 실패 / 중간 끊김 → 기존 폴링 방식으로 이어서 모니터링
+    source.onerror = () => {
+      if (finished) return;
+      finish();
+      console.warn('⚠️ 분석 이벤트 스트림 끊김 - 폴링으로 전환');
+      this.pollAnalysis(caseId, analysisId, onProgress, onComplete, onError, pullCandidates);
+    };
+
+    // 모니터링 중단 함수 반환 (화면 이탈 시 호출)
+    return finish;
+  },
+
+  // 🔄 분석 진행 폴링 (SSE 미지원 환경용)
+  pollAnalysis(caseId, analysisId, onProgress, onComplete, onError, pullCandidates = null) {
     console.log(`🔄 분석 모니터링 시작: ${analysisId}`);
     
     const checkInterval = 3000; // 3초마다 체크
     const maxAttempts = 100; // 최대 5분 (3초 × 100회)
     let attempts = 0;
+    let cropImagesSeen = 0;
+    let lastProgress = { progress: 0, status: 'processing' };
+    const pullNewCandidates = pullCandidates || this.createCandidateFeed(caseId, analysisId, (candidates) => {
+      onProgress({ ...lastProgress, new_candidates: candidates });
+    });
     
     const checkProgress = async () => {
       try {
@@ -188,12 +406,19 @@ export const trackingService = {
           console.log(`📊 분석 진행률: ${progress}% (상태: ${status})`);
           
           // 진행률 콜백 호출
-          onProgress({
+          lastProgress = {
             progress,
             status,
             suspects_found: progressResult.suspects_found || 0,
             crop_images_available: progressResult.crop_images_available || 0
-          });
+          };
+          onProgress(lastProgress);
+          
+          // 새로 확정된 후보가 있으면 완료 전에 가져오기
+          if (status === 'processing' && (progressResult.crop_images_available || 0) > cropImagesSeen) {
+            cropImagesSeen = progressResult.crop_images_available;
+            pullNewCandidates();
+          }
           
           // 완료 체크
           if (status === 'completed' || progress >= 100) {
@@ -204,6 +429,7 @@ export const trackingService = {
             
             if (results.success) {
               console.log(`🎉 분석 완료: ${results.markers_created}개 마커 생성`);
+              this.clearActiveAnalysis(caseId, analysisId);
               onComplete(results);
             } else {
               if (results.status === 'incomplete') {
@@ -222,10 +448,17 @@ export const trackingService = {
           
           // 실패 상태 체크
           if (status === 'failed' || status === 'error') {
+            this.clearActiveAnalysis(caseId, analysisId);
             onError(new Error('AI 분석이 실패했습니다.'));
             return;
           }
           
+          if (status === 'canceled') {
+            this.clearActiveAnalysis(caseId, analysisId);
+            onError(new Error('분석이 취소되었습니다.'));
+            return;
+          }
+          
           // 계속 모니터링
           if (attempts < maxAttempts) {
             setTimeout(checkProgress, checkInterval);
@@ -274,6 +507,7 @@ export const trackingService = {
     const messages = {
       'unknown': '분석 상태 확인 중...',
       'preparing': '분석 준비 중...',
+      'queued': '⏳ 분석 대기 중... (앞선 분석이 끝나면 시작)',
       'processing': `AI 분석 진행 중... (${progress}%)`,
       'smart_frame_extraction': '🎬 스마트 프레임 추출 중...',
       'batch_person_extraction': '👤 용의자 후보 추출 중...',
@@ -281,6 +515,8 @@ export const trackingService = {
       'result_compilation': '📊 결과 정리 중...',
       'completed': '✅ 분석 완료!',
       'failed': '❌ 분석 실패',
+      'canceling': '⏹️ 분석 취소 중...',
+      'canceled': '⏹️ 분석 취소됨',
       'error': '❌ 오류 발생'
     };
     
@@ -8,6 +8,7 @@ from PIL import Image
 from sklearn.metrics.pairwise import cosine_similarity
 import json
 import base64
+import hashlib
 import io
 from typing import Dict, List, Any
 import logging
@@ -22,6 +23,7 @@ class HybridClothingMatcher:
     
     def __init__(self):
         self.registered_suspects = {}
+        self.gallery_version = self._compute_gallery_version()
         self.setup_mobilenet()
         logger.info("🎯 Hybrid Clothing Matcher 초기화 완료")
         
@@ -195,6 +197,7 @@ class HybridClothingMatcher:
                 "feature_size": len(features),
                 "registration_method": "hybrid_cv_mobilenet"
             }
+            self.gallery_version = self._compute_gallery_version()
             
             logger.info(f"✅ 용의자 등록 완료: {suspect_id}")
             
@@ -203,6 +206,7 @@ class HybridClothingMatcher:
                 "suspect_id": suspect_id,
                 "feature_dimension": len(features),
                 "method": "hybrid_cv_mobilenet",
+                "gallery_version": self.gallery_version,
                 "message": f"용의자 '{suspect_id}' 옷차림이 등록되었습니다"
             }
             
@@ -269,12 +273,21 @@ class HybridClothingMatcher:
                 "matches": []
             }
     
+    def _compute_gallery_version(self) -> str:
+        """등록된 용의자 ID + 특징 벡터 내용 해시 (같은 갤러리면 재시작 / 다른 인스턴스에서도 같은 값)"""
+        digest = hashlib.sha256()
+        for suspect_id in sorted(self.registered_suspects):
+            digest.update(suspect_id.encode("utf-8"))
+            digest.update(np.asarray(self.registered_suspects[suspect_id]["features"], dtype=np.float32).tobytes())
+        return digest.hexdigest()[:16]
+    
     def get_registered_suspects(self) -> Dict[str, Any]:
         """등록된 용의자 목록 조회"""
         return {
             "status": "success",
             "total_suspects": len(self.registered_suspects),
             "suspect_ids": list(self.registered_suspects.keys()),
+            "gallery_version": self.gallery_version,
             "method": "hybrid_cv_mobilenet"
         }
     
@@ -282,10 +295,12 @@ class HybridClothingMatcher:
         """용의자 삭제"""
         if suspect_id in self.registered_suspects:
             del self.registered_suspects[suspect_id]
+            self.gallery_version = self._compute_gallery_version()
             return {
                 "status": "success",
                 "message": f"용의자 '{suspect_id}'가 삭제되었습니다",
-                "remaining_suspects": len(self.registered_suspects)
+                "remaining_suspects": len(self.registered_suspects),
+                "gallery_version": self.gallery_version
             }
         else:
             return {
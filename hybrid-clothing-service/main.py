@@ -82,7 +82,18 @@ async def health_check():
         "model_loaded": clothing_matcher is not None,
         "method": "hybrid_cv_mobilenet",
         "memory_usage": "~150MB",
-        "registered_suspects": len(clothing_matcher.registered_suspects) if clothing_matcher else 0
+        "registered_suspects": len(clothing_matcher.registered_suspects) if clothing_matcher else 0,
+        "gallery_version": clothing_matcher.gallery_version if clothing_matcher else None
+    }
+
+@app.get("/gallery_version")
+async def get_gallery_version():
+    """용의자 갤러리 버전 (등록 / 삭제 시 바뀜, video-service 결과 캐시 키에 사용)"""
+    if clothing_matcher is None:
+        raise HTTPException(status_code=503, detail="매칭 모델이 로드되지 않았습니다")
+    return {
+        "gallery_version": clothing_matcher.gallery_version,
+        "registered_suspects": len(clothing_matcher.registered_suspects)
     }
 
 @app.post("/register_person")
@@ -117,6 +128,7 @@ async def register_person(
                 "status": "success",
                 "message": f"용의자 '{person_id}' 옷차림이 등록되었습니다",
                 "person_id": person_id,
+                "gallery_version": result["gallery_version"],
                 "feature_dimension": result["feature_dimension"],
                 "method": result["method"],
                 "clothing_analysis": clothing_analysis
@@ -163,6 +175,7 @@ async def identify_person(
                 "matches_found": matches_found,
                 "threshold": threshold,
                 "matches": match_result["matches"],
+                "gallery_version": clothing_matcher.gallery_version,
                 "method": match_result["method"]
             }
         else:
@@ -233,6 +246,7 @@ async def get_registered_persons():
             "status": "success",
             "total_persons": result["total_suspects"],
             "person_ids": result["suspect_ids"],
+            "gallery_version": result["gallery_version"],
             "method": result["method"]
         }
     
@@ -0,0 +1,180 @@
+# video-service/adaptive_batch.py (하위 서비스 응답에 맞춰 배치 크기 자동 조절 + 부분 배치 타임아웃)
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AIMDBatchSizer:
+    """
+    하위 서비스(YOLO / 의류) 배치 크기 AIMD 조절
+    - 가득 찬 배치가 목표 지연 이내 + 오류율 이하로 끝나면 +increase (가산 증가)
+    - 평균 요청 지연이 목표를 넘거나 오류율이 높으면 x decrease_factor (승산 감소)
+    - 줄인 뒤에 끝난 (줄이기 전 크기로 보낸) 배치는 감소 신호로 다시 쓰지 않음 → 한 번의 혼잡에 연달아 줄지 않음
+    - 여러 분석이 공유 (하위 서비스 용량은 분석과 무관)
+    """
+
+    def __init__(self, name: str, initial: int, minimum: int = 1, maximum: int = 16,
+                 target_latency: float = 1.5, error_threshold: float = 0.2,
+                 increase: int = 1, decrease_factor: float = 0.5, history: int = 50):
+        self.name = name
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.size = min(max(initial, self.minimum), self.maximum)
+        self.target_latency = target_latency
+        self.error_threshold = error_threshold
+        self.increase = max(1, increase)
+        self.decrease_factor = min(max(decrease_factor, 0.1), 0.9)
+        self.increases = 0
+        self.decreases = 0
+        self.batches = 0
+        self.requests = 0
+        self.errors = 0
+        self._latencies: Deque[float] = deque(maxlen=history * 8)
+        self._history: Deque[Dict[str, Any]] = deque(maxlen=history)
+
+    def record(self, dispatched_size: int, batch_len: int, latencies: List[float], errors: int) -> int:
+        """
+        배치 결과 반영 후 다음 배치 크기 반환
+        - dispatched_size: 배치를 만들 때의 목표 크기, batch_len: 실제로 보낸 개수 (타임아웃이면 더 적음)
+        - latencies: 요청별 하위 서비스 응답 시간 (대기열 대기 제외)
+        """
+        self.batches += 1
+        self.requests += batch_len
+        self.errors += errors
+        self._latencies.extend(latencies)
+        avg_latency = sum(latencies) / len(latencies) if latencies else 0.0
+        error_rate = errors / batch_len if batch_len else 0.0
+        previous = self.size
+
+        congested = error_rate > self.error_threshold or avg_latency > self.target_latency
+        if congested and dispatched_size >= self.size:
+            self.size = max(self.minimum, int(self.size * self.decrease_factor))
+        elif not congested and batch_len >= dispatched_size == self.size:
+            # 가득 찬 배치만 여유 신호 (부분 배치는 용량을 시험하지 못함)
+            self.size = min(self.maximum, self.size + self.increase)
+
+        if self.size != previous:
+            if self.size > previous:
+                self.increases += 1
+            else:
+                self.decreases += 1
+                logger.info(
+                    f"📉 {self.name} 배치 크기 {previous} → {self.size} "
+                    f"(평균 지연 {avg_latency:.2f}초, 오류율 {error_rate:.0%})"
+                )
+            self._history.append({
+                "at": time.time(), "from": previous, "to": self.size,
+                "avg_latency": round(avg_latency, 3), "error_rate": round(error_rate, 3)
+            })
+        return self.size
+
+    def get_stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        return {
+            "current": self.size,
+            "min": self.minimum,
+            "max": self.maximum,
+            "target_latency_seconds": self.target_latency,
+            "batches": self.batches,
+            "requests": self.requests,
+            "error_rate": round(self.errors / self.requests, 3) if self.requests else 0.0,
+            "avg_latency_seconds": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "p95_latency_seconds": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3) if latencies else None,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "recent_changes": list(self._history)[-5:]
+        }
+
+
+_END = object()
+
+
+class FramePrefetcher:
+    """
+    프레임 제너레이터를 별도 스레드에서 미리 디코딩해 제한된 크기의 대기열에 쌓음
+    - take(max_items, timeout): 첫 프레임이 오면 timeout 초까지만 더 기다리고 모인 만큼 반환 (부분 배치 전송)
+      → 모션 게이트 / 중복 제거로 선택 프레임이 드문 구간에서도 YOLO 가 놀지 않음
+    - 가득 차면 디코딩 스레드가 기다림 (프레임을 버리지 않음), 메모리는 capacity 장으로 제한
+    - 제너레이터 예외는 take 에서 다시 발생
+    - stop(): 디코딩 스레드 종료까지 대기 (그 뒤에 호출자가 제너레이터를 닫을 수 있음)
+    """
+
+    def __init__(self, frame_iter: Iterator[Dict[str, Any]], capacity: int):
+        self._iter = frame_iter
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, capacity))
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._finished = False
+        self.batches = 0
+        self.partial_flushes = 0
+        self.frames = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        try:
+            for frame in self._iter:
+                if not self._put(frame):
+                    return
+        except BaseException as e:
+            self._error = e
+        self._put(_END)
+
+    def take(self, max_items: int, timeout: float) -> List[Dict[str, Any]]:
+        """최대 max_items 개 (스레드에서 실행, 빈 목록 = 끝)"""
+        if self._finished:
+            return []
+        items: List[Dict[str, Any]] = []
+        item = self._queue.get()
+        deadline = time.monotonic() + timeout
+        while item is not _END:
+            items.append(item)
+            if len(items) >= max_items:
+                break
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                self.partial_flushes += 1
+                break
+        else:
+            self._finished = True
+            if self._error is not None:
+                raise self._error
+
+        if items:
+            self.batches += 1
+            self.frames += len(items)
+        return items
+
+    def stop(self):
+        """디코딩 중단 (스레드 종료까지 대기, 스레드에서 실행)"""
+        self._stop.set()
+        self._thread.join()
+        # 취소로 남겨진 take 가 빈 대기열에서 영원히 기다리지 않도록 끝 표시
+        try:
+            self._queue.put_nowait(_END)
+        except queue.Full:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "frames": self.frames,
+            "avg_batch_frames": round(self.frames / self.batches, 2) if self.batches else 0,
+            "partial_flushes": self.partial_flushes
+        }
@@ -0,0 +1,136 @@
+# video-service/analysis_window.py (분석 범위 제한: 시간 구간 + 다각형 관심 영역)
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def parse_time_value(value: Any) -> Optional[float]:
+    """
+    시각 파라미터 → 초 (빈 값이면 None)
+    - 초 단위 숫자 ("95", "95.5") 또는 "MM:SS" / "HH:MM:SS"
+    """
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+
+    try:
+        if ":" in text:
+            seconds = 0.0
+            for part in text.split(":"):
+                seconds = seconds * 60 + float(part)
+        else:
+            seconds = float(text)
+    except ValueError:
+        raise ValueError(f"시각 형식이 올바르지 않습니다: {text} (초 또는 MM:SS / HH:MM:SS)")
+    if seconds < 0:
+        raise ValueError(f"시각은 0 이상이어야 합니다: {text}")
+    return seconds
+
+
+def parse_roi(value: Optional[str]) -> Optional[List[List[float]]]:
+    """
+    관심 영역 파라미터 → 다각형 꼭짓점 목록 (빈 값이면 None)
+    - JSON 배열 [[x, y], ...] (3개 이상)
+    - 모든 좌표가 0~1 이면 프레임 크기 대비 비율, 아니면 픽셀 좌표
+    """
+    if value is None or not str(value).strip():
+        return None
+    try:
+        points = json.loads(value)
+    except json.JSONDecodeError:
+        raise ValueError("roi 는 [[x, y], ...] 형식의 JSON 배열이어야 합니다")
+
+    if (not isinstance(points, list) or len(points) < 3
+            or not all(isinstance(p, (list, tuple)) and len(p) == 2 for p in points)):
+        raise ValueError("roi 는 꼭짓점 3개 이상의 [[x, y], ...] 배열이어야 합니다")
+    try:
+        polygon = [[float(x), float(y)] for x, y in points]
+    except (TypeError, ValueError):
+        raise ValueError("roi 꼭짓점 좌표는 숫자여야 합니다")
+    if any(x < 0 or y < 0 for x, y in polygon):
+        raise ValueError("roi 꼭짓점 좌표는 0 이상이어야 합니다")
+    return polygon
+
+
+class RegionOfInterest:
+    """
+    다각형 관심 영역
+    - 다각형 외접 사각형으로 잘라낸 뒤 다각형 바깥은 검게 채운 영상을 품질 평가 / 탐지에 사용
+    - 크롭은 원본 프레임에서 잘라내므로 영역 경계에 걸친 사람도 온전히 남음
+    - 마스크는 프레임 크기별로 한 번만 생성
+    """
+
+    def __init__(self, polygon: List[List[float]]):
+        self.polygon = polygon
+        self.normalized = all(x <= 1.0 and y <= 1.0 for x, y in polygon)
+        self._size: Optional[Tuple[int, int]] = None
+        self._rect: Tuple[int, int, int, int] = (0, 0, 0, 0)
+        self._mask: Optional[np.ndarray] = None
+
+    def _prepare(self, width: int, height: int):
+        if self._size == (width, height):
+            return
+        scale = np.array([width, height] if self.normalized else [1, 1], dtype=np.float32)
+        points = np.round(np.array(self.polygon, dtype=np.float32) * scale).astype(np.int32)
+        points[:, 0] = np.clip(points[:, 0], 0, width - 1)
+        points[:, 1] = np.clip(points[:, 1], 0, height - 1)
+
+        x, y, w, h = cv2.boundingRect(points)
+        if w < 2 or h < 2:
+            raise ValueError("roi 영역이 프레임 안에서 너무 작습니다")
+        mask = np.zeros((h, w), dtype=np.uint8)
+        cv2.fillPoly(mask, [points - np.array([x, y], dtype=np.int32)], 255)
+
+        self._size = (width, height)
+        self._rect = (x, y, w, h)
+        # 다각형이 사각형이면 잘라내기만 하면 되므로 마스크 생략
+        self._mask = None if cv2.countNonZero(mask) == mask.size else mask
+        logger.info(f"🔲 관심 영역: ({x}, {y}) {w}x{h} ({w * h / (width * height) * 100:.1f}% 면적)")
+
+    def apply(self, frame: np.ndarray) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """원본 프레임 → (관심 영역 영상, 원본 기준 (x, y) 오프셋)"""
+        height, width = frame.shape[:2]
+        self._prepare(width, height)
+        x, y, w, h = self._rect
+        region = frame[y:y + h, x:x + w]
+        if self._mask is not None:
+            region = cv2.bitwise_and(region, region, mask=self._mask)
+        return region, (x, y)
+
+    def describe(self) -> Dict[str, Any]:
+        info: Dict[str, Any] = {"polygon": self.polygon, "normalized": self.normalized}
+        if self._size is not None:
+            x, y, w, h = self._rect
+            info["bounding_rect"] = {"x": x, "y": y, "width": w, "height": h}
+            info["area_ratio"] = round(w * h / (self._size[0] * self._size[1]), 4)
+        return info
+
+
+def map_detections(detections: List[Dict[str, Any]], offset: Tuple[int, int] = (0, 0),
+                   scale: float = 1.0) -> List[Dict[str, Any]]:
+    """
+    탐지용 영상 기준 박스 → 원본 프레임 좌표
+    - scale: 탐지용 영상이 축소된 비율 (축소 크기 / 원래 크기), offset: 관심 영역의 원본 기준 위치
+    """
+    dx, dy = offset
+    if not dx and not dy and scale == 1.0:
+        return detections
+    mapped = []
+    for detection in detections:
+        bbox = detection["bbox"]
+        mapped.append({
+            **detection,
+            "bbox": {
+                **bbox,
+                "x1": round(bbox["x1"] / scale + dx, 1), "y1": round(bbox["y1"] / scale + dy, 1),
+                "x2": round(bbox["x2"] / scale + dx, 1), "y2": round(bbox["y2"] / scale + dy, 1)
+            }
+        })
+    return mapped
@@ -0,0 +1,123 @@
+# video-service/blob_store.py (콘텐츠 주소 기반 크롭 / 프레임 이미지 저장소)
+import os
+import time
+import hashlib
+import logging
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 썸네일 단계: 이름 → 긴 변 최대 픽셀
+DEFAULT_THUMBNAIL_TIERS = {"sm": 128, "md": 320}
+
+
+class BlobStore:
+    """
+    콘텐츠 주소(SHA-256) 기반 이미지 저장소
+    - 원본은 PNG 그대로 <root>/<digest[:2]>/<digest>.png 에 저장 (같은 내용은 한 번만 저장)
+    - 크기별 JPEG 썸네일(<digest>_<tier>.jpg)을 저장 시점에 함께 생성
+    - 파일 내용이 digest 로 고정되므로 HTTP 응답은 강한 ETag + immutable 캐시 가능
+    """
+
+    def __init__(self, root_dir: str, thumbnail_tiers: Optional[Dict[str, int]] = None, jpeg_quality: int = 85):
+        self.root_dir = root_dir
+        self.thumbnail_tiers = thumbnail_tiers or dict(DEFAULT_THUMBNAIL_TIERS)
+        self.jpeg_quality = jpeg_quality
+        os.makedirs(root_dir, exist_ok=True)
+
+    @staticmethod
+    def is_valid_digest(digest: str) -> bool:
+        return len(digest) == 64 and all(c in "0123456789abcdef" for c in digest)
+
+    def path(self, digest: str, tier: Optional[str] = None) -> str:
+        """digest (+ 썸네일 단계) 에 해당하는 파일 경로 (존재 여부는 확인하지 않음)"""
+        if not self.is_valid_digest(digest):
+            raise ValueError("잘못된 blob digest 입니다")
+        if tier is not None and tier not in self.thumbnail_tiers:
+            raise ValueError(f"지원하지 않는 썸네일 크기입니다: {tier}")
+
+        name = f"{digest}.png" if tier is None else f"{digest}_{tier}.jpg"
+        return os.path.join(self.root_dir, digest[:2], name)
+
+    def exists(self, digest: str) -> bool:
+        return self.is_valid_digest(digest) and os.path.exists(self.path(digest))
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def put_png(self, png_bytes: bytes, image: Optional[np.ndarray] = None) -> str:
+        """PNG 바이트 저장 후 digest 반환 (image 를 주면 썸네일 생성 시 재디코딩 생략)"""
+        digest = hashlib.sha256(png_bytes).hexdigest()
+        original_path = self.path(digest)
+
+        if os.path.exists(original_path):
+            # 이미 저장된 내용 → 만료 정리 기준 시각만 갱신
+            os.utime(original_path, None)
+            return digest
+
+        os.makedirs(os.path.dirname(original_path), exist_ok=True)
+
+        if image is None:
+            image = cv2.imdecode(np.frombuffer(png_bytes, np.uint8), cv2.IMREAD_COLOR)
+
+        # 썸네일 먼저 기록 → 원본이 보이면 모든 단계가 준비된 상태
+        height, width = image.shape[:2]
+        for tier, max_side in self.thumbnail_tiers.items():
+            scale = min(1.0, max_side / max(height, width))
+            thumbnail = image if scale >= 1.0 else cv2.resize(
+                image, (max(1, round(width * scale)), max(1, round(height * scale))), interpolation=cv2.INTER_AREA
+            )
+            ok, buffer = cv2.imencode(".jpg", thumbnail, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            if ok:
+                self._atomic_write(self.path(digest, tier), buffer.tobytes())
+
+        self._atomic_write(original_path, png_bytes)
+        return digest
+
+    def put_image(self, image: np.ndarray) -> str:
+        """BGR 배열을 PNG 로 인코딩해 저장 후 digest 반환"""
+        ok, buffer = cv2.imencode(".png", image)
+        if not ok:
+            raise ValueError("PNG 인코딩 실패")
+        return self.put_png(buffer.tobytes(), image)
+
+    def read(self, digest: str, tier: Optional[str] = None) -> bytes:
+        with open(self.path(digest, tier), "rb") as f:
+            return f.read()
+
+    def cleanup_expired(self, ttl_seconds: float) -> int:
+        """마지막 저장 후 ttl_seconds 가 지난 blob 삭제 (ttl_seconds <= 0 이면 정리하지 않음)"""
+        if ttl_seconds <= 0:
+            return 0
+
+        cutoff = time.time() - ttl_seconds
+        removed = 0
+        for shard in os.listdir(self.root_dir):
+            shard_dir = os.path.join(self.root_dir, shard)
+            if not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                if not name.endswith(".png"):
+                    continue
+                digest = name[:-4]
+                try:
+                    if os.path.getmtime(os.path.join(shard_dir, name)) >= cutoff:
+                        continue
+                    for tier in [None, *self.thumbnail_tiers]:
+                        path = self.path(digest, tier)
+                        if os.path.exists(path):
+                            os.remove(path)
+                    removed += 1
+                except (OSError, ValueError) as e:
+                    logger.warning(f"blob 정리 실패 {name}: {e}")
+
+        if removed:
+            logger.info(f"🧹 만료된 blob {removed}개 정리")
+        return removed
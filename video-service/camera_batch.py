@@ -0,0 +1,180 @@
+# video-service/camera_batch.py (사건 단위 다중 카메라 일괄 분석: 카메라 정보 + 카메라 간 통합 타임라인)
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 카메라별 분석이 모두 이 상태 중 하나면 일괄 분석 종료
+TERMINAL_STATUSES = ("completed", "failed", "canceled")
+
+
+def parse_recorded_at(value: Any) -> datetime:
+    """영상 시작 시각 (ISO 8601, 예: 2024-05-01T21:30:00 / 2024-05-01T21:30:00+09:00 / ...Z)"""
+    text = str(value or "").strip()
+    if not text:
+        raise ValueError("카메라마다 recorded_at (영상 시작 시각) 이 필요합니다")
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(f"recorded_at 형식이 올바르지 않습니다: {value} (ISO 8601)")
+
+
+def parse_cameras(value: str, video_count: int) -> List[Dict[str, Any]]:
+    """
+    카메라 정보 파라미터 → 카메라 목록 (업로드한 영상 순서와 같은 순서)
+    - JSON 배열 [{"location": ..., "recorded_at": ..., "latitude": ..., "longitude": ..., "camera_id": ...}, ...]
+    - location / recorded_at 필수, 나머지는 선택
+    """
+    try:
+        items = json.loads(value)
+    except (TypeError, json.JSONDecodeError):
+        raise ValueError("cameras 는 카메라 정보 JSON 배열이어야 합니다")
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ValueError("cameras 는 카메라 정보 객체의 배열이어야 합니다")
+    if len(items) != video_count:
+        raise ValueError(f"cameras 항목 수({len(items)})와 영상 수({video_count})가 다릅니다")
+
+    cameras = []
+    for index, item in enumerate(items):
+        location = str(item.get("location") or "").strip()
+        if not location:
+            raise ValueError(f"{index + 1}번째 카메라의 location 이 비어 있습니다")
+        recorded_at = parse_recorded_at(item.get("recorded_at"))
+        try:
+            latitude = float(item["latitude"]) if item.get("latitude") not in (None, "") else None
+            longitude = float(item["longitude"]) if item.get("longitude") not in (None, "") else None
+        except (TypeError, ValueError):
+            raise ValueError(f"{index + 1}번째 카메라의 위도 / 경도는 숫자여야 합니다")
+        cameras.append({
+            "camera_index": index,
+            "camera_id": str(item.get("camera_id") or f"camera_{index + 1}"),
+            "location": location,
+            "latitude": latitude,
+            "longitude": longitude,
+            "recorded_at": recorded_at.isoformat()
+        })
+
+    # 시간대 표기 유무가 섞이면 카메라 간 시각 비교가 불가능
+    if len({parse_recorded_at(camera["recorded_at"]).tzinfo is None for camera in cameras}) > 1:
+        raise ValueError("recorded_at 은 모두 시간대를 포함하거나 모두 생략해야 합니다")
+    return cameras
+
+
+def build_camera_sightings(camera: Dict[str, Any], job: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    카메라 한 대의 분석 결과 → 목격 목록 (매칭된 트랙 하나 = 목격 하나)
+    - 영상 내 시각(초)에 영상 시작 시각을 더해 절대 시각으로 변환
+    - 필드는 백엔드 CCTVMarker (위치명 / 좌표 / 탐지 시각 / 신뢰도 / 크롭 / 분석 ID) 에 그대로 대응
+    """
+    recorded_at = parse_recorded_at(camera["recorded_at"])
+    appearances: Dict[int, List[float]] = {}
+    for entry in job.get("suspects_timeline", []) or []:
+        appearances.setdefault(entry.get("seq"), []).append(entry.get("timestamp", 0.0))
+
+    sightings = []
+    for crop in job.get("suspect_crop_images", []) or []:
+        seen = sorted(appearances.get(crop.get("seq"), [])) or [crop.get("timestamp", 0.0)]
+        first_seen, last_seen = seen[0], seen[-1]
+        sightings.append({
+            "camera_index": camera["camera_index"],
+            "camera_id": camera["camera_id"],
+            "location_name": camera["location"],
+            "latitude": camera["latitude"],
+            "longitude": camera["longitude"],
+            "analysis_id": camera.get("analysis_id"),
+            "seq": crop.get("seq"),
+            "suspect_id": crop.get("suspect_id"),
+            "confidence_score": crop.get("similarity", 0.0),
+            "detected_at": (recorded_at + timedelta(seconds=first_seen)).isoformat(),
+            "left_at": (recorded_at + timedelta(seconds=last_seen)).isoformat(),
+            "video_timestamp": first_seen,
+            "video_timestamp_end": last_seen,
+            "total_appearances": crop.get("total_appearances", len(seen)),
+            "crop_digest": crop.get("crop_digest"),
+            "bbox": crop.get("bbox")
+        })
+    return sightings
+
+
+def summarize_batch_status(statuses: List[Optional[str]]) -> str:
+    """카메라별 분석 상태 → 일괄 분석 상태 (processing / completed / partial / failed)"""
+    if any(status not in TERMINAL_STATUSES for status in statuses):
+        return "processing"
+    if all(status == "completed" for status in statuses):
+        return "completed"
+    return "partial" if "completed" in statuses else "failed"
+
+
+def merge_camera_timeline(cameras: List[Dict[str, Any]], jobs: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    🗺️ 카메라별 분석 결과 → 카메라 간 통합 타임라인
+    - 모든 목격을 절대 시각 순으로 정렬하고 sequence_order (CCTVMarker 경로 순서) 부여
+    - 용의자별 이동 경로: 연속한 두 목격이 다른 카메라면 이동 구간 (이전 카메라 마지막 등장 → 다음 카메라 첫 등장)
+    - 진행 중인 카메라도 지금까지 확정된 매칭으로 부분 타임라인을 만듦
+    """
+    sightings = []
+    camera_states = []
+    for camera, job in zip(cameras, jobs):
+        # 접수 실패 / 만료·삭제된 분석은 실패로 취급 (일괄 분석이 끝나지 않는 상태 방지)
+        error = camera.get("error") or (None if job else "분석 작업을 찾을 수 없습니다 (만료 또는 삭제)")
+        job = job or {}
+        status = job.get("status", "failed")
+        camera_states.append({
+            "camera_index": camera["camera_index"],
+            "camera_id": camera["camera_id"],
+            "location": camera["location"],
+            "recorded_at": camera["recorded_at"],
+            "analysis_id": camera.get("analysis_id"),
+            "cache_hit": camera.get("cache_hit", False),
+            "status": status,
+            "progress": job.get("progress", 0),
+            "matches": len(job.get("suspect_crop_images", []) or []),
+            "error": job.get("error") or error
+        })
+        sightings.extend(build_camera_sightings(camera, job))
+
+    sightings.sort(key=lambda s: (parse_recorded_at(s["detected_at"]), s["camera_index"], s["seq"] or 0))
+    for order, sighting in enumerate(sightings, start=1):
+        sighting["sequence_order"] = order
+
+    routes: Dict[str, Dict[str, Any]] = {}
+    for sighting in sightings:
+        route = routes.setdefault(sighting["suspect_id"], {"suspect_id": sighting["suspect_id"], "sightings": 0,
+                                                           "cameras": [], "transitions": []})
+        route["sightings"] += 1
+        if route["cameras"] and route["cameras"][-1]["camera_index"] == sighting["camera_index"]:
+            route["cameras"][-1]["left_at"] = max(route["cameras"][-1]["left_at"], sighting["left_at"],
+                                                  key=parse_recorded_at)
+            continue
+        if route["cameras"]:
+            previous = route["cameras"][-1]
+            gap = (parse_recorded_at(sighting["detected_at"]) - parse_recorded_at(previous["left_at"])).total_seconds()
+            route["transitions"].append({
+                "from": previous["location"],
+                "to": sighting["location_name"],
+                "departed_at": previous["left_at"],
+                "arrived_at": sighting["detected_at"],
+                "travel_seconds": round(gap, 1),
+                # 음수면 두 카메라 시계가 어긋났거나 화각이 겹침
+                "overlapping": gap < 0
+            })
+        route["cameras"].append({
+            "camera_index": sighting["camera_index"],
+            "location": sighting["location_name"],
+            "arrived_at": sighting["detected_at"],
+            "left_at": sighting["left_at"]
+        })
+
+    statuses = [state["status"] for state in camera_states]
+    return {
+        "status": summarize_batch_status(statuses),
+        "progress": int(sum(state["progress"] or 0 for state in camera_states) / max(len(camera_states), 1)),
+        "cameras": camera_states,
+        "timeline": sightings,
+        "routes": list(routes.values()),
+        "total_sightings": len(sightings)
+    }
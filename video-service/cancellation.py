@@ -0,0 +1,45 @@
+# video-service/cancellation.py (분석 취소 토큰)
+import time
+from typing import Callable, Optional
+
+
+class AnalysisCancelled(Exception):
+    """취소 요청으로 분석 파이프라인 중단"""
+
+    def __init__(self, analysis_id: str):
+        super().__init__(f"분석이 취소되었습니다: {analysis_id}")
+        self.analysis_id = analysis_id
+
+
+class CancelToken:
+    """
+    협조적 분석 취소 토큰
+    - 파이프라인은 배치 경계에서만 확인 → 이미 보낸 YOLO / 의류 요청은 끝까지 받고(드레인) 새 요청은 보내지 않음
+    - 같은 워커의 취소 요청은 cancel() 로 즉시 반영
+    - 다른 워커에서 받은 취소 요청은 check_remote (작업 저장소 조회) 로 check_interval 마다 확인
+    """
+
+    def __init__(self, analysis_id: str, check_remote: Optional[Callable[[], bool]] = None,
+                 check_interval: float = 1.0):
+        self.analysis_id = analysis_id
+        self.check_remote = check_remote
+        self.check_interval = check_interval
+        self._cancelled = False
+        self._last_check = float("-inf")
+
+    def cancel(self):
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        if self._cancelled or self.check_remote is None:
+            return self._cancelled
+
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            self._cancelled = self.check_remote()
+        return self._cancelled
+
+    def raise_if_cancelled(self):
+        if self.is_cancelled():
+            raise AnalysisCancelled(self.analysis_id)
@@ -0,0 +1,143 @@
+# video-service/detection_index.py (영상별 탐지 색인: 재분석 없이 용의자 재매칭)
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 색인에 보관하는 사람(트랙) 필드 (크롭은 blob 저장소 digest 로만 참조)
+INDEXED_PERSON_FIELDS = (
+    "person_id", "track_id", "crop_digest", "bbox", "yolo_confidence", "crop_quality", "first_seen_frame",
+    "first_seen_time", "frame_appearances", "timestamps", "appearance_seconds", "appearance_boxes"
+)
+
+
+def build_index_entry(persons: List[Dict[str, Any]], frames: List[Dict[str, Any]],
+                      params: Dict[str, Any]) -> Dict[str, Any]:
+    """추출 결과 → 색인 항목 (프레임은 번호 / 시각만, 사람은 크롭 참조 + 등장 시각 / 박스)"""
+    duration = next((f["video_duration"] for f in frames if f.get("video_duration")), 0)
+    return {
+        "persons": [{key: person[key] for key in INDEXED_PERSON_FIELDS if key in person} for person in persons],
+        "frames": [[frame["frame_number"], frame["timestamp"]] for frame in frames],
+        "video_duration": duration,
+        "params": params
+    }
+
+
+class DetectionIndex:
+    """
+    영상 SHA-256 → 탐지 색인 (SQLite)
+    - 전체 추출을 끝까지 마친 분석만 저장 (조기 종료 / 취소된 분석은 일부 구간뿐이라 저장하지 않음)
+    - 같은 영상을 다시 분석하면 최신 결과로 덮어씀
+    - 새 용의자가 등록되면 저장된 크롭으로 의류 매칭만 다시 수행 (디코딩 / YOLO 생략)
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS video_index (
+            video_sha256 TEXT PRIMARY KEY,
+            person_count INTEGER NOT NULL DEFAULT 0,
+            frames_sampled INTEGER NOT NULL DEFAULT 0,
+            video_duration REAL NOT NULL DEFAULT 0,
+            source_analysis_id TEXT,
+            data TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_video_index_updated ON video_index (updated_at);
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 30 * 24 * 3600):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self._SCHEMA)
+
+    def put(self, video_sha256: str, entry: Dict[str, Any], source_analysis_id: Optional[str] = None):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO video_index (video_sha256, person_count, frames_sampled, video_duration,
+                                         source_analysis_id, data, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(video_sha256) DO UPDATE SET
+                    person_count = excluded.person_count, frames_sampled = excluded.frames_sampled,
+                    video_duration = excluded.video_duration, source_analysis_id = excluded.source_analysis_id,
+                    data = excluded.data, updated_at = excluded.updated_at
+                """,
+                (
+                    video_sha256, len(entry["persons"]), len(entry["frames"]), entry.get("video_duration", 0),
+                    source_analysis_id, json.dumps(entry, ensure_ascii=False), now, now
+                )
+            )
+        logger.info(f"🗂️ 탐지 색인 저장: {video_sha256[:12]}… (사람 {len(entry['persons'])}명, 프레임 {len(entry['frames'])}개)")
+
+    def get(self, video_sha256: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, source_analysis_id, created_at, updated_at FROM video_index WHERE video_sha256 = ?",
+                (video_sha256,)
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry = json.loads(row["data"])
+        entry.update(
+            video_sha256=video_sha256,
+            source_analysis_id=row["source_analysis_id"],
+            indexed_at=row["updated_at"]
+        )
+        return entry
+
+    def describe(self, video_sha256: str) -> Optional[Dict[str, Any]]:
+        """색인 요약 (사람 / 프레임 목록 제외)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT video_sha256, person_count, frames_sampled, video_duration, source_analysis_id, "
+                "created_at, updated_at FROM video_index WHERE video_sha256 = ?",
+                (video_sha256,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def delete(self, video_sha256: str) -> bool:
+        with self._lock, self._conn:
+            deleted = self._conn.execute("DELETE FROM video_index WHERE video_sha256 = ?", (video_sha256,)).rowcount
+        return deleted > 0
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM video_index").fetchone()[0]
+
+    def evict_expired(self) -> int:
+        if self.ttl_seconds <= 0:
+            return 0
+        with self._lock, self._conn:
+            removed = self._conn.execute(
+                "DELETE FROM video_index WHERE updated_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+        if removed:
+            logger.info(f"🧹 탐지 색인 정리: 만료 {removed}개 삭제")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "indexed_videos": self.count(),
+            "lookups_hit": self.hits,
+            "lookups_missed": self.misses,
+            "ttl_seconds": self.ttl_seconds
+        }
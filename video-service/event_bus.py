@@ -0,0 +1,69 @@
+# video-service/event_bus.py (분석 진행 이벤트 버스 + SSE 포맷)
+import json
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 분석이 끝났음을 알리는 이벤트 (스트림 종료)
+TERMINAL_EVENTS = ("completed", "failed", "canceled")
+
+
+class AnalysisEventBus:
+    """
+    프로세스 내 분석 이벤트 버스
+    - 분석 ID 별 구독자 큐에 이벤트를 넣어 SSE 스트림으로 전달
+    - 느린 구독자 때문에 파이프라인이 막히지 않도록 큐가 가득 차면 가장 오래된 이벤트를 버림
+    - 다른 워커에서 실행 중인 분석은 SSE 엔드포인트가 작업 저장소를 주기적으로 확인해 보완
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, analysis_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._subscribers.setdefault(analysis_id, []).append(queue)
+        return queue
+
+    def unsubscribe(self, analysis_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(analysis_id, [])
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            self._subscribers.pop(analysis_id, None)
+
+    def publish(self, analysis_id: str, event: str, data: Dict[str, Any]):
+        """이벤트 발행 (이벤트 루프 스레드에서 호출, 대기하지 않음)"""
+        self.published += 1
+        for queue in self._subscribers.get(analysis_id, []):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait((event, data))
+
+    def subscriber_count(self, analysis_id: Optional[str] = None) -> int:
+        if analysis_id is not None:
+            return len(self._subscribers.get(analysis_id, []))
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "streams": self.subscriber_count(),
+            "analyses_watched": len(self._subscribers),
+            "events_published": self.published,
+            "events_dropped": self.dropped
+        }
+
+
+def format_sse(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """SSE 메시지 한 건 직렬화"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,399 @@
+# video-service/job_store.py (분석 작업 저장소)
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 종료 상태 (TTL 만료 대상)
+TERMINAL_STATUSES = ("completed", "failed", "canceled")
+
+# 자체 실행 없이 다른 분석 결과를 모아 보여주는 기록 (중단 판정 대상 아님, 상태와 무관하게 TTL 만료)
+AGGREGATE_METHODS = ("camera_batch",)
+
+
+def _summary_columns(job: Dict[str, Any]) -> Dict[str, Any]:
+    """목록 / 통계 쿼리용 요약 컬럼 계산"""
+    crop_images = job.get("suspect_crop_images", []) or []
+    return {
+        "status": job.get("status", "unknown"),
+        "progress": int(job.get("progress", 0) or 0),
+        "current_phase": job.get("current_phase"),
+        "method": job.get("method"),
+        "processing_time": float(job.get("processing_time_seconds", 0) or 0),
+        "suspects_found": len(job.get("suspects_timeline", []) or []),
+        "crop_images_count": len(crop_images),
+        "high_confidence_matches": sum(1 for img in crop_images if img.get("similarity", 0) >= 0.95)
+    }
+
+
+class JobStore(ABC):
+    """
+    분석 작업 저장소 인터페이스
+    - 작업은 analysis_status 와 같은 dict 형태로 저장 / 조회
+    - list_summaries / aggregate_completed 는 요약 컬럼만 사용 (전체 결과를 읽지 않음)
+    """
+
+    @abstractmethod
+    def put(self, analysis_id: str, job: Dict[str, Any]):
+        """작업 전체 저장 (기존 작업이 있으면 덮어쓰기, 생성 시각은 유지)"""
+
+    @abstractmethod
+    def update(self, analysis_id: str, fields: Dict[str, Any]):
+        """작업의 최상위 필드 일부 갱신"""
+
+    @abstractmethod
+    def append(self, analysis_id: str, items: Dict[str, List[Any]], fields: Optional[Dict[str, Any]] = None):
+        """리스트 필드 끝에 항목 추가 (+ 최상위 필드 갱신) - 분석 중 부분 결과 누적용"""
+
+    @abstractmethod
+    def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """작업 조회 (없으면 None)"""
+
+    @abstractmethod
+    def delete(self, analysis_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def exists(self, analysis_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def count(self, status: Optional[str] = None) -> int:
+        ...
+
+    @abstractmethod
+    def list_summaries(self, status: Optional[str] = None, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def aggregate_completed(self) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def touch(self, analysis_ids: List[str]):
+        """갱신 시각만 현재로 (대기열에서 기다리는 작업이 중단된 작업으로 정리되지 않도록 하는 하트비트)"""
+
+    @abstractmethod
+    def evict_expired(self) -> int:
+        """TTL 이 지난 종료 작업 삭제 (삭제 수 반환)"""
+
+
+class MemoryJobStore(JobStore):
+    """프로세스 내 dict 저장소 (테스트 / 단일 워커용, 재시작 시 유실)"""
+
+    def __init__(self, ttl_seconds: float = 3 * 24 * 3600):
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, analysis_id: str, job: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            created_at = self._meta.get(analysis_id, {}).get("created_at", now)
+            self._jobs[analysis_id] = dict(job)
+            self._meta[analysis_id] = {"created_at": created_at, "updated_at": now}
+
+    def update(self, analysis_id: str, fields: Dict[str, Any]):
+        with self._lock:
+            if analysis_id not in self._jobs:
+                raise KeyError(analysis_id)
+            self._jobs[analysis_id].update(fields)
+            self._meta[analysis_id]["updated_at"] = time.time()
+
+    def append(self, analysis_id: str, items: Dict[str, List[Any]], fields: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            job = self._jobs.get(analysis_id)
+            if job is None:
+                raise KeyError(analysis_id)
+            # get() 이 돌려준 얕은 복사본의 리스트를 건드리지 않도록 새 리스트로 교체
+            for key, values in items.items():
+                job[key] = list(job.get(key) or []) + list(values)
+            job.update(fields or {})
+            self._meta[analysis_id]["updated_at"] = time.time()
+
+    def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(analysis_id)
+            return dict(job) if job is not None else None
+
+    def delete(self, analysis_id: str) -> bool:
+        with self._lock:
+            self._meta.pop(analysis_id, None)
+            return self._jobs.pop(analysis_id, None) is not None
+
+    def exists(self, analysis_id: str) -> bool:
+        with self._lock:
+            return analysis_id in self._jobs
+
+    def count(self, status: Optional[str] = None) -> int:
+        with self._lock:
+            if status is None:
+                return len(self._jobs)
+            return sum(1 for job in self._jobs.values() if job.get("status") == status)
+
+    def list_summaries(self, status: Optional[str] = None, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = [
+                dict(_summary_columns(job), analysis_id=aid, optimization_stats=job.get("optimization_stats", {}),
+                     **self._meta[aid])
+                for aid, job in self._jobs.items()
+                if status is None or job.get("status") == status
+            ]
+        rows.sort(key=lambda row: row["created_at"], reverse=True)
+        return rows[offset:offset + limit]
+
+    def aggregate_completed(self) -> Dict[str, Any]:
+        rows = self.list_summaries(status="completed", limit=len(self._jobs))
+        count = len(rows)
+        return {
+            "completed": count,
+            "avg_processing_time": sum(r["processing_time"] for r in rows) / count if count else 0.0,
+            "total_suspects_found": sum(r["suspects_found"] for r in rows),
+            "total_crop_images": sum(r["crop_images_count"] for r in rows),
+            "high_confidence_analyses": sum(1 for r in rows if r["high_confidence_matches"] > 0)
+        }
+
+    def touch(self, analysis_ids: List[str]):
+        now = time.time()
+        with self._lock:
+            for analysis_id in analysis_ids:
+                if analysis_id in self._meta:
+                    self._meta[analysis_id]["updated_at"] = now
+
+    def evict_expired(self) -> int:
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [
+                aid for aid, job in self._jobs.items()
+                if (job.get("status") in TERMINAL_STATUSES or job.get("method") in AGGREGATE_METHODS)
+                and self._meta[aid]["updated_at"] < cutoff
+            ]
+            for aid in expired:
+                self._jobs.pop(aid, None)
+                self._meta.pop(aid, None)
+        return len(expired)
+
+
+class SQLiteJobStore(JobStore):
+    """
+    SQLite 작업 저장소 (기본값)
+    - 상태 / 진행률 / 통계 요약은 인덱스 컬럼, 나머지 결과는 JSON 컬럼
+    - 크롭 이미지는 blob 저장소에 있고 작업에는 URL 참조만 저장
+    - WAL 모드로 여러 워커 프로세스가 같은 DB 공유 가능
+    - 재시작 등으로 stale_seconds 이상 갱신이 없는 진행 중 작업은 실패로 정리
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS analyses (
+            analysis_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            progress INTEGER NOT NULL DEFAULT 0,
+            current_phase TEXT,
+            method TEXT,
+            processing_time REAL NOT NULL DEFAULT 0,
+            suspects_found INTEGER NOT NULL DEFAULT 0,
+            crop_images_count INTEGER NOT NULL DEFAULT 0,
+            high_confidence_matches INTEGER NOT NULL DEFAULT 0,
+            optimization_stats TEXT,
+            data TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_analyses_status_updated ON analyses (status, updated_at);
+        CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses (created_at);
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 3 * 24 * 3600,
+                 stale_seconds: float = 1800):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self._SCHEMA)
+
+    def _write(self, analysis_id: str, job: Dict[str, Any]):
+        """잠금을 잡은 상태에서 호출"""
+        now = time.time()
+        summary = _summary_columns(job)
+        with self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO analyses (analysis_id, status, progress, current_phase, method, processing_time,
+                                      suspects_found, crop_images_count, high_confidence_matches,
+                                      optimization_stats, data, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(analysis_id) DO UPDATE SET
+                    status = excluded.status, progress = excluded.progress,
+                    current_phase = excluded.current_phase, method = excluded.method,
+                    processing_time = excluded.processing_time, suspects_found = excluded.suspects_found,
+                    crop_images_count = excluded.crop_images_count,
+                    high_confidence_matches = excluded.high_confidence_matches,
+                    optimization_stats = excluded.optimization_stats,
+                    data = excluded.data, updated_at = excluded.updated_at
+                """,
+                (
+                    analysis_id, summary["status"], summary["progress"], summary["current_phase"],
+                    summary["method"], summary["processing_time"], summary["suspects_found"],
+                    summary["crop_images_count"], summary["high_confidence_matches"],
+                    json.dumps(job.get("optimization_stats", {}), ensure_ascii=False),
+                    json.dumps(job, ensure_ascii=False), now, now
+                )
+            )
+
+    def _read(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT data FROM analyses WHERE analysis_id = ?", (analysis_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def put(self, analysis_id: str, job: Dict[str, Any]):
+        with self._lock:
+            self._write(analysis_id, job)
+
+    def update(self, analysis_id: str, fields: Dict[str, Any]):
+        with self._lock:
+            job = self._read(analysis_id)
+            if job is None:
+                raise KeyError(analysis_id)
+            job.update(fields)
+            self._write(analysis_id, job)
+
+    def append(self, analysis_id: str, items: Dict[str, List[Any]], fields: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            job = self._read(analysis_id)
+            if job is None:
+                raise KeyError(analysis_id)
+            for key, values in items.items():
+                job[key] = (job.get(key) or []) + list(values)
+            job.update(fields or {})
+            self._write(analysis_id, job)
+
+    def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._read(analysis_id)
+
+    def delete(self, analysis_id: str) -> bool:
+        with self._lock, self._conn:
+            deleted = self._conn.execute("DELETE FROM analyses WHERE analysis_id = ?", (analysis_id,)).rowcount
+        return deleted > 0
+
+    def exists(self, analysis_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM analyses WHERE analysis_id = ?", (analysis_id,)
+            ).fetchone() is not None
+
+    def count(self, status: Optional[str] = None) -> int:
+        with self._lock:
+            if status is None:
+                return self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM analyses WHERE status = ?", (status,)).fetchone()[0]
+
+    def list_summaries(self, status: Optional[str] = None, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        query = """
+            SELECT analysis_id, status, progress, current_phase, method, processing_time, suspects_found,
+                   crop_images_count, high_confidence_matches, optimization_stats, created_at, updated_at
+            FROM analyses
+        """
+        params: List[Any] = []
+        if status is not None:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        params += [limit, offset]
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        summaries = []
+        for row in rows:
+            summary = dict(row)
+            summary["optimization_stats"] = json.loads(row["optimization_stats"] or "{}")
+            summaries.append(summary)
+        return summaries
+
+    def aggregate_completed(self) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT COUNT(*) AS completed,
+                       COALESCE(AVG(processing_time), 0) AS avg_processing_time,
+                       COALESCE(SUM(suspects_found), 0) AS total_suspects_found,
+                       COALESCE(SUM(crop_images_count), 0) AS total_crop_images,
+                       COALESCE(SUM(high_confidence_matches > 0), 0) AS high_confidence_analyses
+                FROM analyses WHERE status = 'completed'
+                """
+            ).fetchone()
+        return dict(row)
+
+    def touch(self, analysis_ids: List[str]):
+        if not analysis_ids:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE analyses SET updated_at = ? WHERE analysis_id = ?",
+                [(now, analysis_id) for analysis_id in analysis_ids]
+            )
+
+    def evict_expired(self) -> int:
+        now = time.time()
+        aggregate_placeholders = ",".join("?" * len(AGGREGATE_METHODS))
+        with self._lock, self._conn:
+            # 갱신이 멈춘 대기 / 진행 중 작업 → 실패 처리 (서비스 재시작 등), 취소 중이던 작업은 취소 완료 처리
+            # 대기열의 작업은 담당 워커가 하트비트(touch)로 갱신하므로 워커가 살아 있는 한 여기에 걸리지 않음
+            stale = self._conn.execute(
+                "SELECT analysis_id, status, data FROM analyses "
+                "WHERE status IN ('queued', 'processing', 'canceling') AND updated_at < ? "
+                f"AND COALESCE(method, '') NOT IN ({aggregate_placeholders})",
+                (now - self.stale_seconds, *AGGREGATE_METHODS)
+            ).fetchall()
+            for row in stale:
+                job = json.loads(row["data"])
+                if row["status"] == "canceling":
+                    job.update({"status": "canceled", "current_phase": "canceled"})
+                else:
+                    job.update({"status": "failed", "error": "분석이 중단되었습니다 (서비스 재시작 또는 응답 없음)"})
+                self._conn.execute(
+                    "UPDATE analyses SET status = ?, data = ?, updated_at = ? WHERE analysis_id = ?",
+                    (job["status"], json.dumps(job, ensure_ascii=False), now, row["analysis_id"])
+                )
+
+            expired = [
+                row["analysis_id"] for row in self._conn.execute(
+                    f"SELECT analysis_id FROM analyses WHERE (status IN ({','.join('?' * len(TERMINAL_STATUSES))}) "
+                    f"OR method IN ({aggregate_placeholders})) AND updated_at < ?",
+                    (*TERMINAL_STATUSES, *AGGREGATE_METHODS, now - self.ttl_seconds)
+                ).fetchall()
+            ]
+            self._conn.executemany("DELETE FROM analyses WHERE analysis_id = ?", [(aid,) for aid in expired])
+
+        if stale or expired:
+            logger.info(f"🧹 작업 저장소 정리: 만료 {len(expired)}개 삭제, 중단된 작업 {len(stale)}개 실패 처리")
+        return len(expired)
+
+
+def create_job_store(backend: str, storage_dir: str, ttl_seconds: float, stale_seconds: float = 1800) -> JobStore:
+    """설정값(JOB_STORE_BACKEND)에 맞는 작업 저장소 생성"""
+    if backend == "memory":
+        return MemoryJobStore(ttl_seconds=ttl_seconds)
+    if backend == "sqlite":
+        return SQLiteJobStore(
+            db_path=os.path.join(storage_dir, "jobs.db"),
+            ttl_seconds=ttl_seconds,
+            stale_seconds=stale_seconds
+        )
+    raise ValueError(f"지원하지 않는 작업 저장소입니다: {backend}")
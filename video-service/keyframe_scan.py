@@ -0,0 +1,181 @@
+# video-service/keyframe_scan.py (키프레임만 디코딩하는 빠른 1차 훑기)
+import re
+import time
+import queue
+import shutil
+import logging
+import threading
+import subprocess
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_SHOWINFO_PTS = re.compile(r"Parsed_showinfo.*\bn:\s*\d+.*\bpts_time:\s*(-?[\d.]+)")
+# 프레임을 받은 뒤 showinfo 시각 로그를 기다리는 최대 시간 (넘으면 훑기 중단)
+_SHOWINFO_TIMEOUT_SECONDS = 30.0
+
+
+def ffmpeg_available() -> bool:
+    return shutil.which("ffmpeg") is not None
+
+
+def index_keyframes(video_path: str) -> List[Tuple[int, float]]:
+    """
+    컨테이너 패킷만 읽어 키프레임 위치 목록 [(프레임 번호, 초)] (디코딩 없음)
+    - OpenCV FFmpeg 백엔드의 raw 패킷 모드 (CAP_PROP_FORMAT=-1) + 키프레임 플래그
+    """
+    cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+    try:
+        if not cap.isOpened() or not cap.set(cv2.CAP_PROP_FORMAT, -1):
+            raise ValueError("키프레임 색인을 만들 수 없습니다 (FFmpeg 백엔드 raw 패킷 모드 미지원)")
+        keyframes = []
+        index = 0
+        while cap.grab():
+            if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                keyframes.append((index, round(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0, 3)))
+            index += 1
+        return keyframes
+    finally:
+        cap.release()
+
+
+class KeyframeReader:
+    """
+    키프레임(I-프레임)만 디코딩해서 (프레임 번호, 초, BGR 배열) 순서대로 반환
+    - ffmpeg 가 있으면 -skip_frame nokey 파이프: 디코더가 키프레임 외에는 아예 디코딩하지 않음
+      (분석 구간은 입력 옵션 -ss / -t 로 넘겨 구간 밖은 읽지도 않음,
+       시각은 showinfo 필터 로그의 pts_time + 시작 시각, 프레임 번호는 시각 x fps 로 환산)
+    - 없으면 패킷 색인으로 키프레임 위치를 찾아 하나씩 seek (정확한 위치, 속도 이득은 GOP 길이에 따라 줄어듦)
+    - 시각은 키프레임 단위로 정확 (그 사이 프레임은 보지 않음)
+    """
+
+    def __init__(self, video_path: str, start_time: Optional[float] = None, end_time: Optional[float] = None,
+                 use_ffmpeg: Optional[bool] = None):
+        self.video_path = video_path
+        self.start_time = start_time or 0.0
+        self.end_time = end_time
+        self.method = "ffmpeg_skip_frame" if (ffmpeg_available() if use_ffmpeg is None else use_ffmpeg) else "packet_index_seek"
+        self.keyframes_decoded = 0
+        self.keyframes_indexed: Optional[int] = None
+        self.elapsed_seconds = 0.0
+        self.video_fps = 0.0
+        self.duration = 0.0
+        self.width = 0
+        self.height = 0
+
+        cap = cv2.VideoCapture(video_path)
+        try:
+            if not cap.isOpened():
+                raise ValueError("영상 파일을 열 수 없습니다")
+            self.video_fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            self.duration = total_frames / self.video_fps if self.video_fps > 0 else 0.0
+            self.width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            self.height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        finally:
+            cap.release()
+
+    def _in_window(self, timestamp: float) -> bool:
+        return timestamp >= self.start_time - 1e-3
+
+    def _past_window(self, timestamp: float) -> bool:
+        return self.end_time is not None and timestamp >= self.end_time
+
+    def _iter_ffmpeg(self) -> Iterator[Tuple[int, float, np.ndarray]]:
+        frame_bytes = self.width * self.height * 3
+        # 입력 옵션 -ss 는 시작 시각 직전 키프레임으로 바로 이동 (출력 시각은 시작 시각 기준 0 부터)
+        window = []
+        if self.start_time > 0:
+            window += ["-ss", f"{self.start_time:.3f}"]
+        if self.end_time is not None:
+            window += ["-t", f"{max(0.0, self.end_time - self.start_time):.3f}"]
+        command = [
+            "ffmpeg", "-hide_banner", "-nostdin", "-loglevel", "info",
+            "-skip_frame", "nokey", *window, "-i", self.video_path,
+            "-an", "-sn", "-vsync", "0",
+            # 회전 메타데이터 등으로 크기가 달라져도 읽는 바이트 수가 맞도록 크기 고정
+            "-vf", f"showinfo,scale={self.width}:{self.height}",
+            "-f", "rawvideo", "-pix_fmt", "bgr24", "pipe:1"
+        ]
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        timestamps: "queue.Queue[Optional[float]]" = queue.Queue()
+
+        def read_showinfo():
+            for line in iter(process.stderr.readline, b""):
+                match = _SHOWINFO_PTS.search(line.decode("utf-8", "replace"))
+                if match:
+                    timestamps.put(round(float(match.group(1)) + self.start_time, 3))
+            timestamps.put(None)
+
+        threading.Thread(target=read_showinfo, daemon=True).start()
+        try:
+            while True:
+                data = process.stdout.read(frame_bytes)
+                if len(data) < frame_bytes:
+                    break
+                try:
+                    timestamp = timestamps.get(timeout=_SHOWINFO_TIMEOUT_SECONDS)
+                except queue.Empty:
+                    raise RuntimeError(
+                        f"ffmpeg 키프레임 시각(showinfo)을 {_SHOWINFO_TIMEOUT_SECONDS:.0f}초 동안 받지 못해 훑기를 중단했습니다"
+                    )
+                if timestamp is None:
+                    break
+                if self._past_window(timestamp):
+                    break
+                if not self._in_window(timestamp):
+                    continue
+                frame = np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 3)
+                yield int(round(timestamp * self.video_fps)), timestamp, frame
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+
+    def _iter_seek(self) -> Iterator[Tuple[int, float, np.ndarray]]:
+        keyframes = index_keyframes(self.video_path)
+        self.keyframes_indexed = len(keyframes)
+        cap = cv2.VideoCapture(self.video_path)
+        try:
+            position = 0
+            for frame_number, timestamp in keyframes:
+                if self._past_window(timestamp):
+                    break
+                if not self._in_window(timestamp):
+                    continue
+                if frame_number != position:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                ok, frame = cap.read()
+                position = frame_number + 1
+                if not ok:
+                    continue
+                yield frame_number, timestamp, frame
+        finally:
+            cap.release()
+
+    def __iter__(self) -> Iterator[Tuple[int, float, np.ndarray]]:
+        started = time.monotonic()
+        source = self._iter_ffmpeg() if self.method == "ffmpeg_skip_frame" else self._iter_seek()
+        try:
+            for item in source:
+                self.keyframes_decoded += 1
+                yield item
+        finally:
+            source.close()
+            self.elapsed_seconds = time.monotonic() - started
+            logger.info(
+                f"🔑 키프레임 훑기 완료 ({self.method}): {self.keyframes_decoded}개 디코딩, {self.elapsed_seconds:.1f}초"
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        window = (self.end_time if self.end_time is not None else self.duration) - self.start_time
+        return {
+            "method": self.method,
+            "keyframes_indexed": self.keyframes_indexed,
+            "keyframes_decoded": self.keyframes_decoded,
+            "avg_keyframe_gap_seconds": round(window / self.keyframes_decoded, 2) if self.keyframes_decoded else None,
+            "decode_seconds": round(self.elapsed_seconds, 2)
+        }
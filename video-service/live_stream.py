@@ -0,0 +1,268 @@
+# video-service/live_stream.py (라이브 카메라 스트림 수집: 링 버퍼 + 수신 스레드 + 처리량 / 지연 지표)
+import os
+import time
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+# 네트워크 스트림으로 취급하는 주소 (그 외 로컬 파일은 실제 카메라처럼 원본 속도로 재생)
+NETWORK_SCHEMES = ("rtsp://", "rtsps://", "rtmp://", "http://", "https://", "udp://", "tcp://")
+
+
+def is_network_source(url: str) -> bool:
+    return url.lower().startswith(NETWORK_SCHEMES)
+
+
+class FrameRingBuffer:
+    """
+    수신 스레드 → 분석 루프 사이의 고정 크기 프레임 버퍼
+    - 가득 차면 가장 오래된 프레임을 버림 (분석이 밀려도 수신은 막히지 않음)
+    - 꺼낼 때 max_age 초보다 오래된 프레임도 버림 → 지연 시간 상한 유지
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._items: Deque[Dict[str, Any]] = deque(maxlen=self.capacity)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.pushed = 0
+        self.overflow_dropped = 0
+        self.stale_dropped = 0
+
+    def put(self, item: Dict[str, Any]):
+        with self._cond:
+            if len(self._items) == self.capacity:
+                self.overflow_dropped += 1
+            self._items.append(item)
+            self.pushed += 1
+            self._cond.notify()
+
+    def take(self, max_items: int, timeout: float, max_age: Optional[float] = None) -> List[Dict[str, Any]]:
+        """최대 max_items 개를 오래된 순서로 꺼냄 (timeout 동안 하나도 없으면 빈 목록)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not self._items and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._cond.wait(remaining)
+
+            now = time.monotonic()
+            taken = []
+            while self._items and len(taken) < max_items:
+                item = self._items.popleft()
+                if max_age is not None and now - item["captured_at"] > max_age:
+                    self.stale_dropped += 1
+                    continue
+                taken.append(item)
+            return taken
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "buffered": len(self._items),
+            "pushed": self.pushed,
+            "overflow_dropped": self.overflow_dropped,
+            "stale_dropped": self.stale_dropped
+        }
+
+
+class LiveStreamReader(threading.Thread):
+    """
+    스트림 수신 스레드
+    - 모든 프레임을 grab 하고 sample_interval 마다 한 장만 디코딩(retrieve)해서 링 버퍼에 넣음
+    - 로컬 파일(테스트용 대체 소스)은 원본 fps 속도로 재생, loop 이면 끝에서 처음으로 되감음
+    - 연결이 끊기면 reconnect_delay 간격으로 max_reconnects 번까지 다시 연결
+    """
+
+    def __init__(self, url: str, buffer: FrameRingBuffer, sample_interval: float = 1.0, loop: bool = False,
+                 max_reconnects: int = 5, reconnect_delay: float = 2.0):
+        super().__init__(daemon=True)
+        self.url = url
+        self.buffer = buffer
+        self.sample_interval = sample_interval
+        self.loop = loop
+        self.max_reconnects = max_reconnects
+        self.reconnect_delay = reconnect_delay
+        self.network = is_network_source(url)
+
+        self._stop_event = threading.Event()
+        self.state = "connecting"
+        self.last_error: Optional[str] = None
+        self.source_fps = 0.0
+        self.frame_size: Optional[List[int]] = None
+        self.frames_read = 0
+        self.frames_sampled = 0
+        self.reconnects = 0
+        self.started_at = time.monotonic()
+
+    def stop(self):
+        self._stop_event.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop_event.is_set()
+
+    def _open(self) -> Optional[cv2.VideoCapture]:
+        if not self.network and not os.path.exists(self.url):
+            self.last_error = f"스트림 소스를 찾을 수 없습니다: {self.url}"
+            return None
+        cap = cv2.VideoCapture(self.url)
+        if not cap.isOpened():
+            cap.release()
+            self.last_error = f"스트림을 열 수 없습니다: {self.url}"
+            return None
+        # 네트워크 스트림은 디코더 내부 버퍼를 최소화 (오래된 프레임이 쌓이지 않도록)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.source_fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        return cap
+
+    def run(self):
+        failures = 0
+        next_sample = 0.0
+        while not self.stopped:
+            cap = self._open()
+            if cap is None:
+                failures += 1
+                if failures > self.max_reconnects:
+                    self.state = "failed"
+                    break
+                self.state = "reconnecting"
+                self._stop_event.wait(self.reconnect_delay)
+                continue
+
+            if failures or self.reconnects:
+                logger.info(f"📡 스트림 연결됨: {self.url}")
+            self.state = "streaming"
+            frame_period = 1.0 / self.source_fps if not self.network and self.source_fps > 0 else 0.0
+            play_started = time.monotonic()
+            played = 0
+
+            try:
+                while not self.stopped:
+                    if not cap.grab():
+                        break
+                    failures = 0
+                    self.frames_read += 1
+                    played += 1
+
+                    # 파일 대체 소스: 실제 카메라처럼 원본 속도로 재생
+                    if frame_period:
+                        delay = play_started + played * frame_period - time.monotonic()
+                        if delay > 0:
+                            self._stop_event.wait(delay)
+
+                    now = time.monotonic()
+                    if now < next_sample:
+                        continue
+                    ok, frame = cap.retrieve()
+                    if not ok:
+                        continue
+                    next_sample = now + self.sample_interval
+                    self.frames_sampled += 1
+                    self.frame_size = [frame.shape[1], frame.shape[0]]
+                    self.buffer.put({
+                        "image": frame,
+                        "captured_at": now,
+                        "stream_time": now - self.started_at,
+                        "wall_time": datetime.now().isoformat(timespec="milliseconds")
+                    })
+            finally:
+                cap.release()
+
+            if self.stopped:
+                break
+            if not self.network and self.loop:
+                continue
+            if not self.network:
+                self.state = "ended"
+                break
+
+            # 네트워크 스트림이 끊김 → 재연결
+            failures += 1
+            self.reconnects += 1
+            self.last_error = "스트림 연결이 끊겼습니다"
+            if failures > self.max_reconnects:
+                self.state = "failed"
+                break
+            self.state = "reconnecting"
+            logger.warning(f"⚠️ 스트림 끊김, 재연결 시도 {failures}/{self.max_reconnects}: {self.url}")
+            self._stop_event.wait(self.reconnect_delay)
+
+        if self.stopped:
+            self.state = "stopped"
+        self.buffer.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "network_source": self.network,
+            "source_fps": round(self.source_fps, 2),
+            "frame_size": self.frame_size,
+            "frames_read": self.frames_read,
+            "frames_sampled": self.frames_sampled,
+            "reconnects": self.reconnects,
+            "last_error": self.last_error
+        }
+
+
+class StreamMetrics:
+    """스트림별 처리량 / 지연 지표 (수신 → 탐지 완료까지의 지연, 최근 window 초 기준 처리량)"""
+
+    def __init__(self, window_seconds: float = 30.0, max_samples: int = 500):
+        self.window_seconds = window_seconds
+        self._lags: Deque[float] = deque(maxlen=max_samples)
+        self._analyzed: Deque[float] = deque()
+        self.frames_analyzed = 0
+        self.detections = 0
+        self.persons = 0
+        self.matches = 0
+        self.started_at = time.monotonic()
+
+    def record_frames(self, captured_at: List[float], detections: int):
+        now = time.monotonic()
+        for captured in captured_at:
+            self._lags.append(now - captured)
+            self._analyzed.append(now)
+        self.frames_analyzed += len(captured_at)
+        self.detections += detections
+        while self._analyzed and now - self._analyzed[0] > self.window_seconds:
+            self._analyzed.popleft()
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        while self._analyzed and now - self._analyzed[0] > self.window_seconds:
+            self._analyzed.popleft()
+        window = min(self.window_seconds, max(now - self.started_at, 1e-6))
+        lags = sorted(self._lags)
+        return {
+            "uptime_seconds": round(now - self.started_at, 1),
+            "frames_analyzed": self.frames_analyzed,
+            "throughput_fps": round(len(self._analyzed) / window, 2),
+            "lag_seconds": {
+                "last": round(self._lags[-1], 3) if self._lags else None,
+                "avg": round(sum(lags) / len(lags), 3) if lags else None,
+                "p95": round(lags[min(len(lags) - 1, int(len(lags) * 0.95))], 3) if lags else None
+            },
+            "detections": self.detections,
+            "persons_finalized": self.persons,
+            "matches": self.matches
+        }
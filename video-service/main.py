@@ -1,21 +1,41 @@
 # video-service/main.py (집중 최적화: 스마트 스킵 + 배치 API)
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form, BackgroundTasks
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 import cv2
 import numpy as np
-from PIL import Image
-import io
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Callable, Awaitable, Tuple, Deque
 import asyncio
 import httpx
-import base64
 import tempfile
 import os
 from datetime import datetime, timedelta
 import json
 import time
+import hashlib
+import uuid
+import shutil
+import itertools
 from collections import deque
+from contextlib import contextmanager, suppress
+
+from upload_sessions import ChunkedUploadManager, UploadSessionError, parse_content_range
+from tracker import PersonTracker
+from job_store import create_job_store
+from blob_store import BlobStore
+from event_bus import AnalysisEventBus, TERMINAL_EVENTS, format_sse
+from cancellation import AnalysisCancelled, CancelToken
+from result_cache import AnalysisResultCache, build_cache_key
+from detection_index import DetectionIndex, build_index_entry
+from live_stream import FrameRingBuffer, LiveStreamReader, StreamMetrics, is_network_source
+from analysis_window import RegionOfInterest, map_detections, parse_roi, parse_time_value
+from keyframe_scan import KeyframeReader
+from camera_batch import merge_camera_timeline, parse_cameras
+from adaptive_batch import AIMDBatchSizer, FramePrefetcher
+from resilience import DownstreamUnavailableError, ResilientService
+from temporal_refine import assign_refined_detections, build_refine_windows, read_frames_at, sampling_gaps
+from scheduler import AnalysisScheduler, LaneMetrics, PriorityLimiter, QueueFullError, LANE_PRIORITIES
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -42,29 +62,413 @@ SERVICES = {
     "clothing": os.getenv('CLOTHING_SERVICE_URL', 'http://clothing-service:8002'),
 }
 
+# 다중 객체 추적 설정
+TRACKER_IOU_THRESHOLD = float(os.getenv('TRACKER_IOU_THRESHOLD', 0.15))
+TRACKER_MIN_HITS = int(os.getenv('TRACKER_MIN_HITS', 2))
+TRACKER_MAX_AGE_SECONDS = float(os.getenv('TRACKER_MAX_AGE_SECONDS', 10.0))
+TRACKER_SINGLE_HIT_MIN_CONFIDENCE = float(os.getenv('TRACKER_SINGLE_HIT_MIN_CONFIDENCE', 0.5))
+
+# 영상 저장소 (청크 업로드 조립 위치)
+STORAGE_DIR = os.getenv('VIDEO_STORAGE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'storage'))
+
+# 분석 작업 저장소 (sqlite | memory)
+JOB_STORE_BACKEND = os.getenv('JOB_STORE_BACKEND', 'sqlite')
+JOB_TTL_SECONDS = float(os.getenv('JOB_TTL_SECONDS', 3 * 24 * 3600))  # 종료된 작업 보관 기간
+JOB_STALE_SECONDS = float(os.getenv('JOB_STALE_SECONDS', 1800))  # 갱신 없는 진행 중 작업을 실패로 간주
+JOB_HEARTBEAT_SECONDS = float(os.getenv('JOB_HEARTBEAT_SECONDS', 60))  # 대기 / 실행 중 작업 갱신 시각 하트비트 간격
+
+# 크롭 이미지 blob 저장소 (마커가 URL 로 참조하므로 기본은 만료 없음)
+BLOB_TTL_SECONDS = float(os.getenv('BLOB_TTL_SECONDS', 0))
+
+# 분석 진행 SSE 스트림 설정
+SSE_POLL_SECONDS = float(os.getenv('SSE_POLL_SECONDS', 2.0))  # 이벤트가 없을 때 작업 저장소 재확인 주기
+SSE_KEEPALIVE_SECONDS = float(os.getenv('SSE_KEEPALIVE_SECONDS', 15.0))  # 프록시 유휴 연결 끊김 방지
+
+# 다른 워커에서 받은 취소 요청을 작업 저장소에서 확인하는 최소 간격
+CANCEL_CHECK_SECONDS = float(os.getenv('CANCEL_CHECK_SECONDS', 1.0))
+
+# 분석 스케줄러 (워커당 동시 실행 수 / 대기열 크기)
+MAX_CONCURRENT_ANALYSES = int(os.getenv('MAX_CONCURRENT_ANALYSES', 2))
+MAX_QUEUED_ANALYSES = int(os.getenv('MAX_QUEUED_ANALYSES', 20))
+REALTIME_EXTRA_SLOTS = int(os.getenv('REALTIME_EXTRA_SLOTS', 1))  # 실시간 레인이 한도를 넘어 바로 시작할 수 있는 수
+
+# 하위 서비스 동시 요청 한도 (워커 전체, 실시간 레인 요청이 먼저 자리를 받음)
+YOLO_MAX_INFLIGHT = int(os.getenv('YOLO_MAX_INFLIGHT', 8))
+CLOTHING_MAX_INFLIGHT = int(os.getenv('CLOTHING_MAX_INFLIGHT', 6))
+
+# 분석 결과 캐시 (같은 영상 + 같은 용의자 갤러리 + 같은 파라미터 → 이전 / 진행 중 분석 재사용)
+RESULT_CACHE_ENABLED = os.getenv('RESULT_CACHE_ENABLED', 'true').lower() == 'true'
+GALLERY_VERSION_TIMEOUT = float(os.getenv('GALLERY_VERSION_TIMEOUT', 3.0))
+
+# 영상별 탐지 색인 (새 용의자 등록 시 YOLO 없이 재매칭)
+DETECTION_INDEX_ENABLED = os.getenv('DETECTION_INDEX_ENABLED', 'true').lower() == 'true'
+DETECTION_INDEX_TTL_SECONDS = float(os.getenv('DETECTION_INDEX_TTL_SECONDS', 30 * 24 * 3600))
+
+# 2차 패스 (용의자 등장 / 퇴장 직전후 구간만 촘촘하게 재샘플링)
+TWO_PASS_ENABLED = os.getenv('TWO_PASS_ENABLED', 'false').lower() == 'true'
+REFINE_FPS_INTERVAL = float(os.getenv('REFINE_FPS_INTERVAL', 0.25))  # 2차 패스 샘플링 간격 (초)
+REFINE_IOU_THRESHOLD = float(os.getenv('REFINE_IOU_THRESHOLD', 0.1))  # 가까운 시각 박스와 이 이상 겹치면 같은 사람
+REFINE_MAX_FRAMES = int(os.getenv('REFINE_MAX_FRAMES', 240))  # 분석당 2차 패스 최대 프레임 수
+
+# 모션 게이트 설정 (정지 장면 프레임은 YOLO 로 보내지 않음)
+MOTION_GATE_ENABLED = os.getenv('MOTION_GATE_ENABLED', 'true').lower() == 'true'
+MOTION_GATE_METHOD = os.getenv('MOTION_GATE_METHOD', 'mog2')  # mog2 | diff
+MOTION_GATE_MIN_FOREGROUND = float(os.getenv('MOTION_GATE_MIN_FOREGROUND', 0.002))
+MOTION_GATE_MAX_STATIC_SECONDS = float(os.getenv('MOTION_GATE_MAX_STATIC_SECONDS', 30.0))
+
+# 샘플링 방식: interval (고정 간격) | scene (썸네일 히스토그램 기반 장면 전환 / 활동 변화 감지)
+SAMPLING_MODE = os.getenv('SAMPLING_MODE', 'interval')
+SCENE_PROBE_INTERVAL = float(os.getenv('SCENE_PROBE_INTERVAL', 0.5))  # 장면 변화 확인 간격 (초, 썸네일만 계산)
+SCENE_CUT_THRESHOLD = float(os.getenv('SCENE_CUT_THRESHOLD', 0.4))  # 장면 기준 대비 격자 평균 히스토그램 거리
+SCENE_ACTIVITY_THRESHOLD = float(os.getenv('SCENE_ACTIVITY_THRESHOLD', 0.15))  # 마지막 샘플 대비 격자 최대 거리
+SCENE_ACTIVITY_MIN_GAP = float(os.getenv('SCENE_ACTIVITY_MIN_GAP', 1.0))  # 활동 변화 샘플 최소 간격 (초)
+SCENE_MAX_GAP_SECONDS = float(os.getenv('SCENE_MAX_GAP_SECONDS', 30.0))  # 변화가 없어도 이 간격마다 한 장 (0 = 끄기)
+SAMPLING_MODES = ("interval", "scene")
+
+# 스캔 방식: full (샘플링 간격대로 디코딩) | keyframes (키프레임만 디코딩하는 빠른 1차 훑기)
+SCAN_MODE = os.getenv('SCAN_MODE', 'full')
+SCAN_MODES = ("full", "keyframes")
+
+# 지각 해시 중복 제거 (일시정지 / 멈춘 화면 / 야간 저움직임 구간의 사실상 같은 프레임은 YOLO 로 보내지 않음)
+FRAME_DEDUP_ENABLED = os.getenv('FRAME_DEDUP_ENABLED', 'true').lower() == 'true'
+FRAME_DEDUP_METHOD = os.getenv('FRAME_DEDUP_METHOD', 'dhash')  # dhash | phash
+FRAME_DEDUP_MAX_DISTANCE = int(os.getenv('FRAME_DEDUP_MAX_DISTANCE', 4))  # 모든 칸의 64비트 해시 해밍 거리가 이하면 중복
+FRAME_DEDUP_GRID = int(os.getenv('FRAME_DEDUP_GRID', 4))  # 썸네일을 N x N 칸으로 나눠 칸별 해시 (1 = 전체 한 개)
+FRAME_DEDUP_MAX_SECONDS = float(os.getenv('FRAME_DEDUP_MAX_SECONDS', 30.0))  # 중복이어도 이 간격마다 한 장은 처리
+
+# 라이브 스트림 모니터링 (RTSP / HTTP 카메라, 워커 프로세스 단위)
+LIVE_MAX_STREAMS = int(os.getenv('LIVE_MAX_STREAMS', 4))
+LIVE_BUFFER_FRAMES = int(os.getenv('LIVE_BUFFER_FRAMES', 16))  # 수신 → 분석 링 버퍼 크기 (가득 차면 오래된 프레임 버림)
+LIVE_MAX_LAG_SECONDS = float(os.getenv('LIVE_MAX_LAG_SECONDS', 5.0))  # 이보다 오래 기다린 프레임은 분석하지 않음
+LIVE_RECONNECTS = int(os.getenv('LIVE_RECONNECTS', 5))
+LIVE_STATUS_INTERVAL = float(os.getenv('LIVE_STATUS_INTERVAL', 5.0))  # 작업 저장소에 지표 기록 간격 (초)
+LIVE_RESULT_MAX_MATCHES = int(os.getenv('LIVE_RESULT_MAX_MATCHES', 200))  # 스트림 작업 기록에 남기는 최근 매칭 수
+LIVE_FILE_SOURCE_DIR = os.getenv('LIVE_FILE_SOURCE_DIR', '')  # 로컬 파일 대체 소스 허용 디렉터리 (테스트 / 개발용, 비우면 금지)
+
+# 적응형 배치 크기 (AIMD: 하위 서비스 응답이 목표 지연 이내면 1씩 늘리고, 느려지거나 오류가 나면 절반으로)
+YOLO_BATCH_SIZE = int(os.getenv('YOLO_BATCH_SIZE', 6))  # 초기값
+YOLO_BATCH_MIN = int(os.getenv('YOLO_BATCH_MIN', 2))
+YOLO_BATCH_MAX = int(os.getenv('YOLO_BATCH_MAX', 16))
+YOLO_TARGET_LATENCY = float(os.getenv('YOLO_TARGET_LATENCY', 1.5))  # 요청당 목표 응답 시간 (초, 대기열 대기 제외)
+CLOTHING_BATCH_SIZE = int(os.getenv('CLOTHING_BATCH_SIZE', 3))
+CLOTHING_BATCH_MIN = int(os.getenv('CLOTHING_BATCH_MIN', 1))
+CLOTHING_BATCH_MAX = int(os.getenv('CLOTHING_BATCH_MAX', 8))
+CLOTHING_TARGET_LATENCY = float(os.getenv('CLOTHING_TARGET_LATENCY', 1.0))
+BATCH_ERROR_THRESHOLD = float(os.getenv('BATCH_ERROR_THRESHOLD', 0.2))  # 배치 오류율이 이보다 높으면 감소
+BATCH_DECREASE_FACTOR = float(os.getenv('BATCH_DECREASE_FACTOR', 0.5))
+BATCH_TIMEOUT = float(os.getenv('BATCH_TIMEOUT', 0.8))  # 첫 프레임 이후 이 시간 안에 배치가 안 차면 모인 만큼 전송
+
+# 하위 AI 서비스 호출 재시도 (지터 백오프, Retry-After 준수) + 서비스별 회로 차단기
+DOWNSTREAM_MAX_ATTEMPTS = int(os.getenv('DOWNSTREAM_MAX_ATTEMPTS', 3))  # 첫 요청 포함
+DOWNSTREAM_RETRY_BASE_DELAY = float(os.getenv('DOWNSTREAM_RETRY_BASE_DELAY', 0.5))
+DOWNSTREAM_RETRY_MAX_DELAY = float(os.getenv('DOWNSTREAM_RETRY_MAX_DELAY', 10.0))  # Retry-After 가 이보다 길면 재시도하지 않음
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))  # 연속 실패 횟수
+CIRCUIT_OPEN_SECONDS = float(os.getenv('CIRCUIT_OPEN_SECONDS', 10.0))
+CIRCUIT_MAX_PAUSE_SECONDS = float(os.getenv('CIRCUIT_MAX_PAUSE_SECONDS', 120.0))  # 회로가 이보다 오래 열려 있으면 분석 실패
+
+# 다중 카메라 일괄 분석 (요청 하나에 올릴 수 있는 영상 수)
+BATCH_MAX_CAMERAS = int(os.getenv('BATCH_MAX_CAMERAS', 12))
+
+# 탐지 전송 해상도 (YOLO 가 내부적으로 640 으로 줄이므로 긴 변을 이 크기로 줄여서 전송, 0 = 원본 그대로)
+DETECT_MAX_SIDE = int(os.getenv('DETECT_MAX_SIDE', 640))
+
+# 프레임 썸네일 설정 (품질 평가 / 모션 게이트 / 장면 전환 판단에 공통 사용)
+FRAME_THUMBNAIL_WIDTH = int(os.getenv('FRAME_THUMBNAIL_WIDTH', 160))
+QUALITY_TILE_GRID = int(os.getenv('QUALITY_TILE_GRID', 4))  # 원본 해상도 샘플 타일 격자 (N x N)
+QUALITY_TILE_SIZE = int(os.getenv('QUALITY_TILE_SIZE', 64))
+
+# 🚀 0. 프레임 썸네일 (프레임당 한 번만 계산)
+class FrameThumbnail:
+    """
+    샘플링된 프레임의 축소 흑백 썸네일 + 원본 해상도 샘플 타일
+    - gray: INTER_AREA 축소 흑백 (uint8) → 밝기, 모션 게이트, 장면 전환 판단
+    - tiles: 원본 해상도에서 격자로 잘라낸 흑백 타일 (uint8) → 선명도 / 대비
+      (축소하면 흐린 영상도 선명해 보여 라플라시안 분산이 원본과 비례하지 않으므로 타일은 축소하지 않음)
+    """
+    
+    __slots__ = ("gray", "tiles", "width", "height")
+    
+    def __init__(self, frame: np.ndarray, color_order: str = "BGR", width: int = FRAME_THUMBNAIL_WIDTH,
+                 tile_grid: int = QUALITY_TILE_GRID, tile_size: int = QUALITY_TILE_SIZE):
+        self.height, self.width = frame.shape[:2]
+        code = cv2.COLOR_BGR2GRAY if color_order == "BGR" else cv2.COLOR_RGB2GRAY
+        
+        # 1. 축소 흑백 썸네일 (컬러 변환은 축소 후에 수행)
+        if self.width > width:
+            small = cv2.resize(frame, (width, max(1, round(self.height * width / self.width))), interpolation=cv2.INTER_AREA)
+        else:
+            small = frame
+        self.gray = cv2.cvtColor(small, code) if small.ndim == 3 else small
+        
+        # 2. 원본 해상도 타일 (격자 위치에서 tile_size 정사각형)
+        th, tw = min(tile_size, self.height), min(tile_size, self.width)
+        ys = np.linspace(0, self.height - th, tile_grid).astype(int)
+        xs = np.linspace(0, self.width - tw, tile_grid).astype(int)
+        tiles = np.stack([frame[y:y + th, x:x + tw] for y in ys for x in xs])
+        if tiles.ndim == 4:
+            # 타일을 세로로 이어 붙여 한 번에 흑백 변환
+            tiles = cv2.cvtColor(tiles.reshape(-1, tw, tiles.shape[-1]), code).reshape(-1, th, tw)
+        self.tiles = tiles
+    
+    def laplacian_var(self) -> float:
+        """타일 내부 4-이웃 라플라시안 분산 (cv2.Laplacian ksize=1 과 동일한 커널, int16 연산)"""
+        t = self.tiles.astype(np.int16)
+        if t.shape[1] < 3 or t.shape[2] < 3:
+            return 0.0
+        lap = t[:, :-2, 1:-1] + t[:, 2:, 1:-1] + t[:, 1:-1, :-2] + t[:, 1:-1, 2:] - 4 * t[:, 1:-1, 1:-1]
+        return float(lap.var())
+
+# 🚀 0-1. 모션 게이트 (배경 차분)
+class MotionGate:
+    """축소된 흑백 영상에서 전경 변화가 없는 프레임 걸러내기"""
+    
+    def __init__(self, method: str = MOTION_GATE_METHOD, min_foreground_ratio: float = MOTION_GATE_MIN_FOREGROUND,
+                 max_static_seconds: float = MOTION_GATE_MAX_STATIC_SECONDS):
+        self.method = method
+        self.min_foreground_ratio = min_foreground_ratio
+        self.max_static_seconds = max_static_seconds
+        
+        self.subtractor = cv2.createBackgroundSubtractorMOG2(history=50, varThreshold=25, detectShadows=False) if method == "mog2" else None
+        self.previous = None
+        self.last_pass_timestamp = None
+        self.kernel = np.ones((3, 3), np.uint8)
+        self.checked = 0
+        self.static_count = 0
+        self.last_foreground_ratio = 0.0
+    
+    def has_motion(self, thumbnail: FrameThumbnail, timestamp: Optional[float] = None) -> bool:
+        """전경 비율이 임계값 이상이면 True (첫 프레임 / 장시간 정지 후에는 항상 True)"""
+        gray = cv2.GaussianBlur(thumbnail.gray, (5, 5), 0)
+        self.checked += 1
+        
+        if self.subtractor is not None:
+            mask = self.subtractor.apply(gray)
+        elif self.previous is not None:
+            _, mask = cv2.threshold(cv2.absdiff(gray, self.previous), 25, 255, cv2.THRESH_BINARY)
+        else:
+            mask = None
+        self.previous = gray
+        
+        if mask is None or self.checked == 1:
+            # 배경 모델이 없는 첫 프레임은 항상 처리
+            self.last_foreground_ratio = 1.0
+        else:
+            # 잡음 제거 후 전경 비율 계산
+            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel)
+            self.last_foreground_ratio = cv2.countNonZero(mask) / mask.size
+        
+        moving = self.last_foreground_ratio >= self.min_foreground_ratio
+        
+        # 정지 장면이라도 일정 시간마다 한 번은 통과 (정지한 사람 확인용)
+        if not moving and timestamp is not None and self.last_pass_timestamp is not None:
+            moving = timestamp - self.last_pass_timestamp >= self.max_static_seconds
+        
+        if moving:
+            if timestamp is not None:
+                self.last_pass_timestamp = timestamp
+        else:
+            self.static_count += 1
+        return moving
+    
+    def get_stats(self) -> Dict:
+        return {
+            "method": self.method,
+            "checked": self.checked,
+            "static_skipped": self.static_count,
+            "last_foreground_ratio": round(self.last_foreground_ratio, 4)
+        }
+
+# 🚀 0-2. 장면 전환 기반 샘플링
+class SceneChangeSampler:
+    """
+    썸네일 격자 히스토그램으로 샘플링할 프레임 결정
+    - 장면 기준 히스토그램과 격자 평균 거리가 크면 장면 전환 → 새 장면의 첫 프레임은 반드시 샘플링
+    - 마지막 샘플과 비교해 어느 한 칸이라도 크게 달라지면 활동 변화 → 추가 샘플 (최소 간격 유지, 느린 움직임도 누적되어 잡힘)
+    - 변화가 없는 구간은 샘플링하지 않음 (max_gap 마다 한 장만 확인)
+    """
+    
+    def __init__(self, probe_interval: float = SCENE_PROBE_INTERVAL, cut_threshold: float = SCENE_CUT_THRESHOLD,
+                 activity_threshold: float = SCENE_ACTIVITY_THRESHOLD, activity_min_gap: float = SCENE_ACTIVITY_MIN_GAP,
+                 max_gap: float = SCENE_MAX_GAP_SECONDS, grid: int = 4, bins: int = 16):
+        self.probe_interval = probe_interval
+        self.cut_threshold = cut_threshold
+        self.activity_threshold = activity_threshold
+        self.activity_min_gap = activity_min_gap
+        self.max_gap = max_gap
+        self.grid = grid
+        self.bins = bins
+        
+        self.scene_reference = None
+        self.last_sample = None
+        self.last_sample_timestamp = None
+        self.probes = 0
+        self.unchanged = 0
+        self.samples: Dict[str, int] = {}
+    
+    def _histograms(self, gray: np.ndarray) -> np.ndarray:
+        """격자 칸별 정규화 밝기 히스토그램 (grid*grid, bins)"""
+        height, width = gray.shape[:2]
+        ys = np.linspace(0, height, self.grid + 1).astype(int)
+        xs = np.linspace(0, width, self.grid + 1).astype(int)
+        hists = []
+        for y0, y1 in zip(ys[:-1], ys[1:]):
+            for x0, x1 in zip(xs[:-1], xs[1:]):
+                cell = gray[y0:y1, x0:x1]
+                hist = cv2.calcHist([cell], [0], None, [self.bins], [0, 256]).ravel()
+                hists.append(hist / max(cell.size, 1))
+        return np.array(hists, dtype=np.float32)
+    
+    @staticmethod
+    def _distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """칸별 전변동 거리 (0 = 동일, 1 = 완전히 다름)"""
+        return 0.5 * np.abs(a - b).sum(axis=1)
+    
+    def should_sample(self, thumbnail: FrameThumbnail, timestamp: float) -> Optional[str]:
+        """샘플링 사유 (scene_start / scene_cut / activity / max_gap), 샘플링하지 않으면 None"""
+        hists = self._histograms(thumbnail.gray)
+        self.probes += 1
+        since_sample = timestamp - self.last_sample_timestamp if self.last_sample_timestamp is not None else None
+        
+        reason = None
+        if self.scene_reference is None:
+            reason = "scene_start"
+        elif self._distances(hists, self.scene_reference).mean() >= self.cut_threshold:
+            reason = "scene_cut"
+        elif (self._distances(hists, self.last_sample).max() >= self.activity_threshold
+              and since_sample >= self.activity_min_gap):
+            reason = "activity"
+        elif self.max_gap > 0 and since_sample >= self.max_gap:
+            reason = "max_gap"
+        
+        if reason is None:
+            self.unchanged += 1
+            return None
+        if reason in ("scene_start", "scene_cut"):
+            self.scene_reference = hists
+        self.last_sample = hists
+        self.last_sample_timestamp = timestamp
+        self.samples[reason] = self.samples.get(reason, 0) + 1
+        return reason
+    
+    def get_stats(self) -> Dict:
+        return {
+            "probe_interval": self.probe_interval,
+            "probes": self.probes,
+            "scenes": self.samples.get("scene_start", 0) + self.samples.get("scene_cut", 0),
+            "samples_by_reason": dict(self.samples),
+            "unchanged_skipped": self.unchanged
+        }
+
+# 🚀 0-3. 지각 해시 중복 제거
+class FrameDeduplicator:
+    """
+    썸네일 지각 해시로 마지막 처리 프레임과 거의 같은 프레임 걸러내기
+    - dhash: 9x8 축소 후 가로 인접 밝기 차이 부호 (빠름, 밝기 변화에 강함)
+    - phash: 32x32 DCT 저주파 8x8 계수의 중앙값 비교 (압축 잡음 / 약한 흔들림에 강함)
+    - 격자 칸마다 64비트 해시를 따로 구하고 가장 많이 달라진 칸으로 판단
+      (전체 한 개 해시는 화면 구석을 걷는 작은 사람을 놓치기 쉬움)
+    - 비교 기준은 실제로 처리(YOLO 전송)된 프레임이므로 조금씩 누적되는 변화는 결국 통과
+    """
+    
+    def __init__(self, method: str = FRAME_DEDUP_METHOD, max_distance: int = FRAME_DEDUP_MAX_DISTANCE,
+                 max_duplicate_seconds: float = FRAME_DEDUP_MAX_SECONDS, grid: int = FRAME_DEDUP_GRID):
+        if method not in ("dhash", "phash"):
+            raise ValueError(f"지원하지 않는 해시 방식입니다: {method}")
+        self.method = method
+        self.max_distance = max_distance
+        self.max_duplicate_seconds = max_duplicate_seconds
+        self.grid = max(1, grid)
+        self.reference_hash: Optional[List[int]] = None
+        self.reference_timestamp: Optional[float] = None
+        self.checked = 0
+        self.duplicates = 0
+        self.last_distance: Optional[int] = None
+        self._pending: Optional[Tuple[List[int], Optional[float]]] = None
+    
+    @staticmethod
+    def _pack(bits: np.ndarray) -> int:
+        return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+    
+    def _hash_cell(self, cell: np.ndarray) -> int:
+        if self.method == "phash":
+            small = cv2.resize(cell, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+            low = cv2.dct(small)[:8, :8]
+            return self._pack(low > np.median(low.ravel()[1:]))
+        small = cv2.resize(cell, (9, 8), interpolation=cv2.INTER_AREA).astype(np.int16)
+        return self._pack(small[:, 1:] > small[:, :-1])
+    
+    def compute_hash(self, thumbnail: FrameThumbnail) -> List[int]:
+        """격자 칸별 64비트 해시 목록 (행 우선)"""
+        gray = thumbnail.gray
+        height, width = gray.shape[:2]
+        ys = np.linspace(0, height, self.grid + 1).astype(int)
+        xs = np.linspace(0, width, self.grid + 1).astype(int)
+        return [
+            self._hash_cell(gray[y0:y1, x0:x1])
+            for y0, y1 in zip(ys[:-1], ys[1:]) for x0, x1 in zip(xs[:-1], xs[1:])
+        ]
+    
+    def is_duplicate(self, thumbnail: FrameThumbnail, timestamp: Optional[float] = None) -> bool:
+        """마지막 처리 프레임과 해밍 거리가 max_distance 이하면 True (일정 시간이 지나면 다시 처리)"""
+        frame_hash = self.compute_hash(thumbnail)
+        self._pending = (frame_hash, timestamp)
+        self.checked += 1
+        if self.reference_hash is None:
+            return False
+        
+        self.last_distance = max(bin(a ^ b).count("1") for a, b in zip(frame_hash, self.reference_hash))
+        if self.last_distance > self.max_distance:
+            return False
+        if (timestamp is not None and self.reference_timestamp is not None
+                and timestamp - self.reference_timestamp >= self.max_duplicate_seconds):
+            return False
+        self.duplicates += 1
+        return True
+    
+    def mark_processed(self):
+        """직전에 확인한 프레임이 처리되었으면 비교 기준으로 삼음"""
+        if self._pending is not None:
+            self.reference_hash, self.reference_timestamp = self._pending
+            self._pending = None
+    
+    def get_stats(self) -> Dict:
+        return {
+            "method": self.method,
+            "max_distance": self.max_distance,
+            "grid": self.grid,
+            "checked": self.checked,
+            "duplicates_dropped": self.duplicates,
+            "last_distance": self.last_distance
+        }
+
 # 🚀 1. 스마트 프레임 스킵 시스템
 class SmartFrameSkipper:
-    def __init__(self):
+    def __init__(self, motion_gate: Optional[MotionGate] = None, scene_sampler: Optional[SceneChangeSampler] = None,
+                 deduplicator: Optional[FrameDeduplicator] = None):
         self.quality_history = deque(maxlen=10)  # 최근 10프레임 품질 추적
-        self.skip_count = 0
+        self.skip_count = 0  # 연속 스킵 수
+        self.total_skipped = 0
+        self.skip_reasons: Dict[str, int] = {}
         self.process_count = 0
         self.detection_history = deque(maxlen=20)  # 최근 20프레임 탐지 이력
         self.high_confidence_found = False  # 95% 이상 매칭 발견 여부
+        self.motion_gate = motion_gate
+        self.scene_sampler = scene_sampler
+        self.deduplicator = deduplicator
         
-    def evaluate_frame_quality(self, frame: np.ndarray) -> float:
-        """프레임 품질 평가 (0-1) - 더 엄격하게 조정"""
+    def evaluate_frame_quality(self, thumbnail: FrameThumbnail) -> float:
+        """프레임 품질 평가 (0-1) - 더 엄격하게 조정 (전체 해상도 대신 썸네일 / 샘플 타일 사용)"""
         try:
-            # 1. 밝기 분석 (너무 어둡거나 밝으면 낮은 점수)
-            gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
-            brightness = np.mean(gray)
+            # 1. 밝기 분석 (너무 어둡거나 밝으면 낮은 점수) - 면적 평균 축소라 평균 밝기는 원본과 동일
+            brightness = cv2.mean(thumbnail.gray)[0]
             brightness_score = 1.0 - abs(brightness - 128) / 128
             
-            # 2. 선명도 분석 (라플라시안 분산)
-            laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+            # 2. 선명도 분석 (원본 해상도 타일의 라플라시안 분산)
+            laplacian_var = thumbnail.laplacian_var()
             sharpness_score = min(laplacian_var / 600, 1.0)  # 600으로 더 엄격하게
             
-            # 3. 대비 분석
-            contrast = gray.std()
+            # 3. 대비 분석 (축소 시 표준편차가 줄어들므로 원본 해상도 타일 기준)
+            contrast = thumbnail.tiles.std()
             contrast_score = min(contrast / 40, 1.0)  # 40으로 더 엄격하게
             
             # 종합 점수 (가중평균)
@@ -75,11 +479,31 @@ class SmartFrameSkipper:
             logger.error(f"프레임 품질 평가 실패: {e}")
             return 0.3  # 기본값을 더 낮게
     
-    def should_process_frame(self, frame_idx: int, frame: np.ndarray) -> Dict[str, Any]:
+    def should_process_frame(self, frame_idx: int, thumbnail: FrameThumbnail, timestamp: Optional[float] = None) -> Dict[str, Any]:
         """프레임 처리 여부 지능적 결정 - 95% 매칭 후 더 빠른 스킵"""
         
+        # 🚀 모션 게이트: 전경 변화가 없으면 품질 평가 없이 스킵 (연속 스킵 수에는 포함하지 않음)
+        if self.motion_gate is not None and not self.motion_gate.has_motion(thumbnail, timestamp):
+            self._record_skip("no_motion")
+            return {
+                "process": False,
+                "quality": self.quality_history[-1] if self.quality_history else 0.0,
+                "skip_count": self.skip_count,
+                "reason": "no_motion"
+            }
+        
+        # 🚀 지각 해시: 마지막 처리 프레임과 사실상 같은 프레임이면 스킵 (연속 스킵 수에는 포함하지 않음)
+        if self.deduplicator is not None and self.deduplicator.is_duplicate(thumbnail, timestamp):
+            self._record_skip("duplicate")
+            return {
+                "process": False,
+                "quality": self.quality_history[-1] if self.quality_history else 0.0,
+                "skip_count": self.skip_count,
+                "reason": "duplicate"
+            }
+        
         # 프레임 품질 평가
-        quality = self.evaluate_frame_quality(frame)
+        quality = self.evaluate_frame_quality(thumbnail)
         self.quality_history.append(quality)
         
         decision = {
@@ -110,18 +534,25 @@ class SmartFrameSkipper:
                 decision.update({"process": False, "reason": "below_avg_quality"})
                 
         # 최근에 탐지가 있었으면 주변 프레임 우선 처리
-        elif len(self.detection_history) > 0 and any(self.detection_history[-2:]):  # 최근 2프레임으로 단축
+        elif len(self.detection_history) > 0 and any(list(self.detection_history)[-2:]):  # 최근 2프레임으로 단축
             decision.update({"process": True, "reason": "recent_detection"})
         
         # 결과 처리
         if decision["process"]:
             self.process_count += 1
             self.skip_count = 0
+            if self.deduplicator is not None:
+                self.deduplicator.mark_processed()
         else:
             self.skip_count += 1
+            self._record_skip(decision["reason"])
             
         return decision
     
+    def _record_skip(self, reason: str):
+        self.total_skipped += 1
+        self.skip_reasons[reason] = self.skip_reasons.get(reason, 0) + 1
+    
     def set_high_confidence_found(self):
         """95% 이상 매칭 발견 시 호출"""
         self.high_confidence_found = True
@@ -133,40 +564,185 @@ class SmartFrameSkipper:
     
     def get_stats(self) -> Dict:
         """스킵 통계 조회"""
-        total = self.process_count + self.skip_count
-        skip_rate = (self.skip_count / total * 100) if total > 0 else 0
+        total = self.process_count + self.total_skipped
+        skip_rate = (self.total_skipped / total * 100) if total > 0 else 0
         return {
             "processed": self.process_count,
-            "skipped": self.skip_count,
+            "skipped": self.total_skipped,
             "skip_rate": f"{skip_rate:.1f}%",
+            "skip_reasons": dict(self.skip_reasons),
+            "motion_skipped": self.skip_reasons.get("no_motion", 0),
+            "duplicate_skipped": self.skip_reasons.get("duplicate", 0),
+            "dedup": self.deduplicator.get_stats() if self.deduplicator else None,
+            "motion_gate": self.motion_gate.get_stats() if self.motion_gate else None,
+            "scene_sampling": self.scene_sampler.get_stats() if self.scene_sampler else None,
             "avg_quality": sum(self.quality_history) / len(self.quality_history) if self.quality_history else 0,
             "high_confidence_mode": self.high_confidence_found
         }
 
+class FrameSkipTotals:
+    """
+    워커 전체 프레임 스킵 누적 통계 (대시보드 / 헬스 체크용)
+    - 스킵퍼는 분석마다 따로 쓰므로, 분석이 끝날 때 그 분석의 통계를 더함
+    - 분석별 통계는 작업 기록의 frame_skip_stats 에 있음
+    """
+
+    def __init__(self):
+        self.analyses = 0
+        self.processed = 0
+        self.skipped = 0
+        self.skip_reasons: Dict[str, int] = {}
+        self.high_confidence_analyses = 0
+
+    def add(self, stats: Dict[str, Any]):
+        self.analyses += 1
+        self.processed += stats["processed"]
+        self.skipped += stats["skipped"]
+        for reason, count in stats["skip_reasons"].items():
+            self.skip_reasons[reason] = self.skip_reasons.get(reason, 0) + count
+        if stats["high_confidence_mode"]:
+            self.high_confidence_analyses += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.processed + self.skipped
+        return {
+            "analyses": self.analyses,
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "skip_rate": f"{(self.skipped / total * 100) if total > 0 else 0:.1f}%",
+            "skip_reasons": dict(self.skip_reasons),
+            "motion_skipped": self.skip_reasons.get("no_motion", 0),
+            "duplicate_skipped": self.skip_reasons.get("duplicate", 0),
+            "high_confidence_analyses": self.high_confidence_analyses
+        }
+
+def raise_if_downstream_unavailable(results: List[Any]):
+    """회로가 최대 대기 시간보다 오래 열려 있었거나 재시도를 다 썼으면 분석 중단 (프레임을 실패로 넘기고 계속하지 않음)"""
+    for result in results:
+        if isinstance(result, DownstreamUnavailableError):
+            raise result
+
 # 🚀 2. 배치 API 최적화 시스템
 class BatchAPIProcessor:
     def __init__(self):
-        self.yolo_batch_size = 6  # YOLO 배치 크기
-        self.clothing_batch_size = 3  # 의류 매칭 배치 크기
-        self.batch_timeout = 0.8  # 최대 대기 시간 (초)
-        
-    async def process_yolo_batch(self, frame_batch: List[Dict]) -> List[Dict]:
-        """YOLO 배치 처리"""
+        # 배치 크기는 하위 서비스 응답 시간 / 오류율에 맞춰 자동 조절 (여러 분석이 공유)
+        self.batch_sizers = {
+            "yolo": AIMDBatchSizer(
+                "YOLO", YOLO_BATCH_SIZE, YOLO_BATCH_MIN, YOLO_BATCH_MAX, YOLO_TARGET_LATENCY,
+                BATCH_ERROR_THRESHOLD, decrease_factor=BATCH_DECREASE_FACTOR
+            ),
+            "clothing": AIMDBatchSizer(
+                "의류 매칭", CLOTHING_BATCH_SIZE, CLOTHING_BATCH_MIN, CLOTHING_BATCH_MAX, CLOTHING_TARGET_LATENCY,
+                BATCH_ERROR_THRESHOLD, decrease_factor=BATCH_DECREASE_FACTOR
+            )
+        }
+        self.batch_timeout = BATCH_TIMEOUT  # 부분 배치 전송 대기 시간 (초)
+        # 여러 분석이 공유하는 하위 서비스 요청 한도
+        self.limiters = {
+            "yolo": PriorityLimiter(YOLO_MAX_INFLIGHT),
+            "clothing": PriorityLimiter(CLOTHING_MAX_INFLIGHT)
+        }
+        self.lane_metrics = LaneMetrics()
+        # 503 (모델 로딩 중) / 타임아웃은 재시도, 계속 실패하면 회로를 열고 요청을 멈춤 (프레임을 버리지 않음)
+        self.resilience = {
+            service: ResilientService(
+                service, DOWNSTREAM_MAX_ATTEMPTS, DOWNSTREAM_RETRY_BASE_DELAY, DOWNSTREAM_RETRY_MAX_DELAY,
+                CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_OPEN_SECONDS, CIRCUIT_MAX_PAUSE_SECONDS, raise_on_give_up=True
+            )
+            for service in ("yolo", "clothing")
+        }
+        self.detect_transfer = {"frames": 0, "downscaled": 0, "source_pixels": 0, "sent_pixels": 0, "bytes_sent": 0}
+        # 서비스가 처리에 실패해 (5xx 등) 결과 없이 넘어간 요청 (프레임 / 사람)
+        self.dropped = {service: {"count": 0, "last_error": None} for service in ("yolo", "clothing")}
+    
+    @property
+    def yolo_batch_size(self) -> int:
+        return self.batch_sizers["yolo"].size
+    
+    @property
+    def clothing_batch_size(self) -> int:
+        return self.batch_sizers["clothing"].size
+    
+    def get_batch_sizing_stats(self) -> Dict[str, Any]:
+        return {
+            "batch_timeout": self.batch_timeout,
+            **{service: sizer.get_stats() for service, sizer in self.batch_sizers.items()}
+        }
+    
+    def get_resilience_stats(self) -> Dict[str, Any]:
+        return {
+            service: {**caller.get_stats(), "dropped": dict(self.dropped[service])}
+            for service, caller in self.resilience.items()
+        }
+    
+    def record_dropped(self, service: str, error: str):
+        """결과 없이 넘어간 요청 기록 (로그 + 통계로 드러냄)"""
+        self.dropped[service]["count"] += 1
+        self.dropped[service]["last_error"] = error
+        logger.warning(f"⚠️ {service} 요청 결과 없음 ({error}), 누적 {self.dropped[service]['count']}건")
+    
+    def record_detect_transfer(self, image: np.ndarray, sent_bytes: int, scale: float):
+        """탐지 전송량 기록 (원본 대비 전송 픽셀 비율 확인용)"""
+        pixels = image.shape[0] * image.shape[1]
+        stats = self.detect_transfer
+        stats["frames"] += 1
+        stats["downscaled"] += scale < 1.0
+        stats["source_pixels"] += pixels
+        stats["sent_pixels"] += int(pixels * scale * scale)
+        stats["bytes_sent"] += sent_bytes
+    
+    def get_detect_transfer_stats(self) -> Dict[str, Any]:
+        stats = self.detect_transfer
+        return {
+            "max_side": DETECT_MAX_SIDE,
+            "frames_sent": stats["frames"],
+            "downscaled_frames": stats["downscaled"],
+            "avg_bytes_per_frame": int(stats["bytes_sent"] / stats["frames"]) if stats["frames"] else 0,
+            "sent_pixel_ratio": round(stats["sent_pixels"] / stats["source_pixels"], 3) if stats["source_pixels"] else 1.0
+        }
+    
+    async def _lane_request(self, service: str, lane: str, request: Callable[[], Awaitable[Dict]],
+                            latencies: Optional[List[float]] = None) -> Dict:
+        """레인 우선순위로 요청 자리를 받아 실행 (대기 / 요청 시간은 레인별로 기록, latencies 에 순수 응답 시간 추가)"""
+        started = time.monotonic()
+        async with self.limiters[service].slot(LANE_PRIORITIES[lane]):
+            waited = time.monotonic() - started
+            result = await request()
+        elapsed = time.monotonic() - started
+        self.lane_metrics.record(lane, f"{service}_wait", waited)
+        self.lane_metrics.record(lane, f"{service}_request", elapsed)
+        if latencies is not None:
+            latencies.append(elapsed - waited)
+        return result
+    
+    def _record_batch(self, service: str, dispatched_size: int, results: List[Dict], latencies: List[float]):
+        """배치 결과로 다음 배치 크기 조절"""
+        errors = sum(1 for result in results if not result.get("success", False))
+        self.batch_sizers[service].record(dispatched_size, len(results), latencies, errors)
+    
+    async def process_yolo_batch(self, frame_batch: List[Dict], lane: str = "bulk",
+                                 target_size: Optional[int] = None) -> List[Dict]:
+        """YOLO 배치 처리 (target_size: 배치를 만들 때의 목표 크기, 타임아웃으로 덜 찬 배치인지 판단용)"""
         if not frame_batch:
             return []
             
         logger.info(f"🔥 YOLO 배치 처리: {len(frame_batch)}개 프레임")
         batch_start = time.time()
+        dispatched_size = target_size or self.yolo_batch_size
+        latencies: List[float] = []
         
         # 병렬 처리를 위한 태스크 생성
         tasks = []
         for frame_data in frame_batch:
-            task = self._single_yolo_request(frame_data)
+            task = self._lane_request(
+                "yolo", lane, lambda frame_data=frame_data: self._single_yolo_request(frame_data), latencies
+            )
             tasks.append(task)
         
         # 모든 요청 동시 실행
         try:
             results = await asyncio.gather(*tasks, return_exceptions=True)
+            raise_if_downstream_unavailable(results)
             
             # 결과 정리
             processed_results = []
@@ -182,10 +758,13 @@ class BatchAPIProcessor:
                     processed_results.append(result)
             
             batch_time = time.time() - batch_start
+            self._record_batch("yolo", dispatched_size, processed_results, latencies)
             logger.info(f"✅ YOLO 배치 완료: {len(processed_results)}개 처리됨 ({batch_time:.2f}초)")
             
             return processed_results
             
+        except DownstreamUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"❌ YOLO 배치 처리 실패: {e}")
             return []
@@ -193,54 +772,73 @@ class BatchAPIProcessor:
     async def _single_yolo_request(self, frame_data: Dict) -> Dict:
         """개별 YOLO 요청 - 임계값을 낮춰서 더 많은 탐지"""
         try:
-            image_data = base64.b64decode(frame_data["image_base64"])
+            # 디코딩된 프레임은 전송 시점에 한 번만 PNG 인코딩 (이벤트 루프를 막지 않도록 스레드에서)
+            # 관심 영역이 있으면 잘라낸 영상만 전송 (박스는 돌아온 뒤 원본 좌표로 옮김)
+            detect_image = frame_data.get("detect_image", frame_data["image"])
+            image_data, scale = await asyncio.to_thread(prepare_detect_image, detect_image)
+            self.record_detect_transfer(detect_image, len(image_data), scale)
             
             async with httpx.AsyncClient(timeout=25.0) as client:
                 files = {"file": ("frame.png", image_data, "image/png")}
                 # 🎯 임계값을 0.25로 하향 조정 (더 많은 탐지)
                 data = {"confidence": 0.25, "show_all_objects": False}
                 
-                response = await client.post(f"{SERVICES['yolo']}/detect", files=files, data=data)
+                response = await self.resilience["yolo"].call(
+                    lambda: client.post(f"{SERVICES['yolo']}/detect", files=files, data=data)
+                )
                 
                 if response.status_code == 200:
-                    result = response.json()
+                    results = response.json().get("results", {})
+                    # 축소 영상 기준 박스 → 탐지용 영상(원본 또는 관심 영역) 좌표
+                    if scale != 1.0 and results.get("all_detections"):
+                        results["all_detections"] = map_detections(results["all_detections"], scale=scale)
                     return {
                         "success": True,
                         "frame_info": frame_data,
-                        "detections": result.get("results", {}),
-                        "person_count": result.get("results", {}).get("person_count", 0)
+                        "detections": results,
+                        "person_count": results.get("person_count", 0)
                     }
                 else:
+                    self.record_dropped("yolo", f"HTTP {response.status_code}")
                     return {
                         "success": False,
                         "frame_info": frame_data,
                         "error": f"HTTP {response.status_code}"
                     }
                     
+        except DownstreamUnavailableError:
+            raise
         except Exception as e:
+            self.record_dropped("yolo", str(e))
             return {
                 "success": False,
                 "frame_info": frame_data,
                 "error": str(e)
             }
     
-    async def process_clothing_batch(self, person_batch: List[Dict]) -> List[Dict]:
+    async def process_clothing_batch(self, person_batch: List[Dict], lane: str = "bulk",
+                                     target_size: Optional[int] = None) -> List[Dict]:
         """의류 매칭 배치 처리"""
         if not person_batch:
             return []
             
         logger.info(f"🎯 의류 매칭 배치 처리: {len(person_batch)}명")
         batch_start = time.time()
+        dispatched_size = target_size or self.clothing_batch_size
+        latencies: List[float] = []
         
         # 병렬 처리를 위한 태스크 생성
         tasks = []
         for person_data in person_batch:
-            task = self._single_clothing_request(person_data)
+            task = self._lane_request(
+                "clothing", lane, lambda person_data=person_data: self._single_clothing_request(person_data), latencies
+            )
             tasks.append(task)
         
         # 모든 요청 동시 실행
         try:
             results = await asyncio.gather(*tasks, return_exceptions=True)
+            raise_if_downstream_unavailable(results)
             
             # 결과 정리
             processed_results = []
@@ -256,10 +854,13 @@ class BatchAPIProcessor:
                     processed_results.append(result)
             
             batch_time = time.time() - batch_start
+            self._record_batch("clothing", dispatched_size, processed_results, latencies)
             logger.info(f"✅ 의류 매칭 배치 완료: {len(processed_results)}개 처리됨 ({batch_time:.2f}초)")
             
             return processed_results
             
+        except DownstreamUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"❌ 의류 매칭 배치 처리 실패: {e}")
             return []
@@ -267,14 +868,16 @@ class BatchAPIProcessor:
     async def _single_clothing_request(self, person_data: Dict) -> Dict:
         """개별 의류 매칭 요청 - 임계값을 낮춰서 더 많은 매칭"""
         try:
-            crop_image_data = base64.b64decode(person_data["cropped_image"])
+            crop_image_data = person_data["crop_png"]
             
             async with httpx.AsyncClient(timeout=15.0) as client:
                 files = {"file": (f"{person_data['person_id']}.png", crop_image_data, "image/png")}
                 # 🎯 임계값을 0.6으로 하향 조정 (더 많은 매칭)
                 data = {"threshold": 0.6}
                 
-                response = await client.post(f"{SERVICES['clothing']}/identify_person", files=files, data=data)
+                response = await self.resilience["clothing"].call(
+                    lambda: client.post(f"{SERVICES['clothing']}/identify_person", files=files, data=data)
+                )
                 
                 if response.status_code == 200:
                     result = response.json()
@@ -284,8 +887,6 @@ class BatchAPIProcessor:
                     for match in matches:
                         if match.get("similarity", 0) >= 0.95:
                             logger.info(f"🎯 95% 이상 매칭 발견! {match['suspect_id']}: {match['similarity']:.1%}")
-                            # 글로벌 플래그 설정
-                            frame_skipper.set_high_confidence_found()
                             
                             return {
                                 "success": True,
@@ -304,13 +905,17 @@ class BatchAPIProcessor:
                         "high_confidence_match": False
                     }
                 else:
+                    self.record_dropped("clothing", f"HTTP {response.status_code}")
                     return {
                         "success": False,
                         "person_data": person_data,
                         "error": f"HTTP {response.status_code}"
                     }
                     
+        except DownstreamUnavailableError:
+            raise
         except Exception as e:
+            self.record_dropped("clothing", str(e))
             return {
                 "success": False,
                 "person_data": person_data,
@@ -318,17 +923,206 @@ class BatchAPIProcessor:
             }
 
 # 전역 최적화 인스턴스
-frame_skipper = SmartFrameSkipper()
+frame_skip_totals = FrameSkipTotals()
 batch_processor = BatchAPIProcessor()
 
-# 분석 상태 저장
-analysis_status = {}
+# 재개 가능한 청크 업로드
+upload_manager = ChunkedUploadManager(
+    STORAGE_DIR,
+    max_chunk_bytes=int(os.getenv('UPLOAD_MAX_CHUNK_BYTES', 32 * 1024 * 1024)),
+    max_upload_bytes=int(os.getenv('UPLOAD_MAX_BYTES', 8 * 1024 * 1024 * 1024)),
+    session_ttl=int(os.getenv('UPLOAD_SESSION_TTL', 24 * 3600))
+)
+
+# 분석 상태 저장 (기본 SQLite)
+job_store = create_job_store(JOB_STORE_BACKEND, STORAGE_DIR, JOB_TTL_SECONDS, JOB_STALE_SECONDS)
+
+# 크롭 이미지 저장소 (결과에는 URL 만 포함)
+blob_store = BlobStore(os.path.join(STORAGE_DIR, 'blobs'))
+
+# 영상 해시별 탐지 색인 (크롭은 blob 저장소 참조)
+detection_index = DetectionIndex(os.path.join(STORAGE_DIR, 'detection_index.db'), DETECTION_INDEX_TTL_SECONDS)
+
+# 결과 캐시 (키 → 분석 ID, 결과 자체는 작업 저장소)
+result_cache = AnalysisResultCache(os.path.join(STORAGE_DIR, 'result_cache.db'), JOB_TTL_SECONDS)
+
+# 분석 진행 이벤트 (SSE 구독자에게 전달)
+event_bus = AnalysisEventBus()
+
+# 이 워커에서 실행 중인 분석의 취소 토큰
+cancel_tokens: Dict[str, CancelToken] = {}
+live_streams: Dict[str, Dict[str, Any]] = {}  # 스트림 ID → 수신 스레드 / 링 버퍼 / 지표 / 분석 태스크
+
+# 분석 동시 실행 제한 + 대기열
+analysis_scheduler = AnalysisScheduler(
+    MAX_CONCURRENT_ANALYSES, MAX_QUEUED_ANALYSES,
+    realtime_extra_slots=REALTIME_EXTRA_SLOTS, metrics=batch_processor.lane_metrics
+)
+
+def is_cancel_requested(analysis_id: str) -> bool:
+    """다른 워커에서 들어온 취소 요청 확인 (작업이 삭제된 경우도 취소로 간주)"""
+    job = job_store.get(analysis_id)
+    return job is None or bool(job.get("cancel_requested"))
 
-def extract_frames_with_smart_skip(video_path: str, fps_interval: float = 3.0) -> List[Dict[str, Any]]:
-    """🚀 스마트 스킵 적용 프레임 추출"""
+def encode_png(image: np.ndarray) -> bytes:
+    """BGR 배열 → PNG 바이트"""
+    ok, buffer = cv2.imencode(".png", image)
+    if not ok:
+        raise ValueError("PNG 인코딩 실패")
+    return buffer.tobytes()
+
+def prepare_detect_image(image: np.ndarray, max_side: int = DETECT_MAX_SIDE):
+    """
+    탐지 전송용 영상 → (PNG 바이트, 축소 비율)
+    - 긴 변이 max_side 보다 크면 INTER_AREA 로 축소 (전송 / 디코딩 비용이 비율의 제곱만큼 감소)
+    - 크롭은 호출자가 원본 프레임에서 잘라내므로 크롭 화질은 그대로
+    """
+    height, width = image.shape[:2]
+    scale = 1.0
+    if max_side > 0 and max(height, width) > max_side:
+        scale = max_side / max(height, width)
+        image = cv2.resize(image, (max(1, round(width * scale)), max(1, round(height * scale))),
+                           interpolation=cv2.INTER_AREA)
+    return encode_png(image), scale
+
+def blob_refs(digest: str) -> Dict[str, str]:
+    """결과에 포함할 크롭 이미지 참조 (video-service 기준 상대 URL)"""
+    return {
+        "crop_digest": digest,
+        "cropped_image_url": f"/blobs/{digest}",
+        "thumbnail_url": f"/blobs/{digest}?size=sm"
+    }
+
+def build_status_payload(analysis_id: str, status: Dict[str, Any]) -> Dict[str, Any]:
+    """분석 상태 응답 (상태 조회 API / SSE 이벤트 공용)"""
+    payload = {
+        "analysis_id": analysis_id,
+        "status": status.get("status"),
+        "progress": status.get("progress", 0),
+        "current_phase": status.get("current_phase", "준비 중"),
+        "method": status.get("method", "smart_skip_batch_optimized"),
+        "suspects_found": len(status.get("suspects_timeline", [])),
+        "crop_images_available": len(status.get("suspect_crop_images", [])),
+        "processing_time": status.get("processing_time_seconds", 0),
+        "optimization_stats": status.get("optimization_stats", {}),
+        "high_confidence_mode": status.get("high_confidence_mode", False),
+        "frame_skip_stats": status.get("frame_skip_stats"),
+        "phase_description": get_phase_description_optimized(status.get("current_phase", "")),
+        "queue_position": analysis_scheduler.position(analysis_id),
+        "lane": status.get("lane", "bulk")
+    }
+    if status.get("error"):
+        payload["error"] = status["error"]
+    return payload
+
+def update_analysis(analysis_id: str, fields: Dict[str, Any], event: str = "progress"):
+    """작업 상태 갱신 + 구독 중인 SSE 스트림에 현재 상태 발행"""
+    job_store.update(analysis_id, fields)
+    if event_bus.subscriber_count(analysis_id) == 0:
+        return
+    status = job_store.get(analysis_id)
+    if status is not None:
+        event_bus.publish(analysis_id, event, build_status_payload(analysis_id, status))
+
+class AnalysisWriter:
+    """
+    분석 중 작업 저장소 쓰기 (진행률 / 매칭 누적)
+    - 저장소 쓰기는 스레드에서 실행해 SQLite 쓰기가 이벤트 루프를 막지 않음
+    - 콜백에서는 대기 없이 쌓아 두고, 앞선 쓰기가 끝나기 전에 쌓인 진행률 갱신은 하나로 합쳐 씀 (순서는 유지)
+    - 단계 전환 / 완료처럼 기록을 확인해야 하는 곳에서는 flush 로 모두 쓰일 때까지 대기
+    """
+
+    def __init__(self, analysis_id: str):
+        self.analysis_id = analysis_id
+        # (종류, 리스트 누적 항목, 최상위 필드, 쓰인 뒤 발행할 이벤트, 이벤트 데이터 - None 이면 현재 상태)
+        self._ops: Deque[List[Any]] = deque()
+        self._task: Optional[asyncio.Task] = None
+
+    def update(self, fields: Dict[str, Any], event: Optional[str] = "progress", data: Optional[Dict[str, Any]] = None):
+        """최상위 필드 갱신 예약 (쓰인 뒤 구독 중인 SSE 스트림에 data, 없으면 현재 상태 발행)"""
+        last = self._ops[-1] if self._ops else None
+        if last is not None and last[0] == "update" and last[3] == event and last[4] is None and data is None:
+            last[2].update(fields)
+        else:
+            self._ops.append(["update", None, dict(fields), event, data])
+        self._schedule()
+
+    def append(self, items: Dict[str, List[Any]], fields: Optional[Dict[str, Any]] = None,
+               event: Optional[str] = None, data: Optional[Dict[str, Any]] = None):
+        """리스트 필드 누적 예약 (event / data: 쓰인 뒤 그대로 발행)"""
+        self._ops.append(["append", items, dict(fields or {}), event, data])
+        self._schedule()
+
+    def _schedule(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._drain())
+
+    async def _drain(self):
+        while self._ops:
+            kind, items, fields, event, data = self._ops.popleft()
+            try:
+                if kind == "append":
+                    await asyncio.to_thread(job_store.append, self.analysis_id, items, fields)
+                else:
+                    await asyncio.to_thread(job_store.update, self.analysis_id, fields)
+            except KeyError:
+                # 삭제 요청으로 작업이 지워진 경우: 남은 쓰기도 버림
+                self._ops.clear()
+                return
+            except Exception as e:
+                logger.error(f"❌ 작업 저장 실패: {self.analysis_id} ({str(e)})")
+                continue
+            if event is None or event_bus.subscriber_count(self.analysis_id) == 0:
+                continue
+            if data is None:
+                status = await asyncio.to_thread(job_store.get, self.analysis_id)
+                if status is None:
+                    continue
+                data = build_status_payload(self.analysis_id, status)
+            event_bus.publish(self.analysis_id, event, data)
+
+    async def flush(self):
+        """예약된 쓰기가 모두 끝날 때까지 대기"""
+        while self._task is not None and not self._task.done():
+            await asyncio.shield(self._task)
+
+def build_frame_data(frame: np.ndarray, frame_number: int, processed_idx: int, timestamp: float, duration: float,
+                     quality: float, sample_reason: str, window: Tuple[float, float],
+                     detect: Optional[Tuple[np.ndarray, Tuple[int, int]]] = None) -> Dict[str, Any]:
+    """추출기 공통 처리 대상 프레임 정보 (detect: 관심 영역 영상과 원본 기준 오프셋)"""
+    frame_data = {
+        "frame_number": frame_number,
+        "processed_index": processed_idx,
+        "timestamp": timestamp,
+        "timestamp_str": f"{int(timestamp//60):02d}:{int(timestamp%60):02d}",
+        "image": frame,
+        "width": frame.shape[1],
+        "height": frame.shape[0],
+        "video_duration": duration,
+        "quality": quality,
+        "skip_reason": None,
+        "sample_reason": sample_reason,
+        "analysis_start": window[0],
+        "analysis_end": window[1]
+    }
+    if detect is not None:
+        frame_data["detect_image"], frame_data["detect_offset"] = detect
+    return frame_data
+
+def extract_frames_with_smart_skip(cap: cv2.VideoCapture, fps_interval: float = 3.0,
+                                   skipper: Optional[SmartFrameSkipper] = None,
+                                   start_time: Optional[float] = None, end_time: Optional[float] = None,
+                                   roi: Optional[RegionOfInterest] = None) -> Iterator[Dict[str, Any]]:
+    """
+    🚀 스마트 스킵 적용 프레임 추출 (제너레이터)
+    - 처리 대상 프레임은 디코딩된 BGR 배열("image") 그대로 전달 → 탐지 결과가 돌아올 때까지만 유지
+    - 인코딩은 YOLO 전송 시점 / 크롭 저장 시점에만 수행
+    - 캡처는 호출자가 열고 닫음 (2차 패스에서 같은 캡처로 seek 재사용)
+    - start_time / end_time: 구간 시작으로 바로 seek 하고 끝에서 중단 (타임스탬프는 영상 기준 그대로)
+    - roi: 관심 영역만 잘라 / 가린 영상("detect_image")으로 품질 평가 / 탐지, 크롭은 원본("image")에서
+    """
+    skipper = skipper or SmartFrameSkipper()
     try:
-        cap = cv2.VideoCapture(video_path)
-        
         if not cap.isOpened():
             raise ValueError("영상 파일을 열 수 없습니다")
         
@@ -339,74 +1133,129 @@ def extract_frames_with_smart_skip(video_path: str, fps_interval: float = 3.0) -
         
         logger.info(f"📹 영상 정보: {video_fps}fps, {total_frames}프레임, {duration:.1f}초")
         
-        frames = []
+        # 분석 구간 (시작 지점으로 바로 seek)
+        start_frame = min(int(round((start_time or 0) * video_fps)), total_frames)
+        end_frame = min(int(round(end_time * video_fps)), total_frames) if end_time is not None else total_frames
+        window_start = start_frame / video_fps
+        window_end = end_frame / video_fps
+        if start_frame > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        if start_frame > 0 or end_frame < total_frames:
+            logger.info(f"⏱️ 분석 구간: {window_start:.1f}초 ~ {window_end:.1f}초")
+        
+        selected = 0
         frame_interval = max(1, int(video_fps * fps_interval))
         
-        frame_count = 0
+        # 장면 전환 샘플링: 더 촘촘하게 썸네일만 확인하고 변화가 있을 때만 후보로 넘김
+        scene_sampler = skipper.scene_sampler
+        if scene_sampler is not None:
+            frame_interval = max(1, int(video_fps * min(fps_interval, scene_sampler.probe_interval)))
+        
+        frame_count = start_frame
         processed_idx = 0
         
-        while True:
+        while frame_count < end_frame:
+            # 샘플링 대상이 아닌 프레임은 grab 만 (색 변환 / 버퍼 복사 생략)
+            if (frame_count - start_frame) % frame_interval != 0:
+                if not cap.grab():
+                    break
+                frame_count += 1
+                continue
+            
             ret, frame = cap.read()
             if not ret:
                 break
             
-            if frame_count % frame_interval == 0:
-                timestamp = frame_count / video_fps
-                
-                # OpenCV BGR → RGB 변환
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # 🚀 스마트 프레임 스킵 적용
-                skip_decision = frame_skipper.should_process_frame(processed_idx, frame_rgb)
-                
-                if skip_decision["process"]:
-                    pil_image = Image.fromarray(frame_rgb)
-                    
-                    # base64 인코딩
-                    buffer = io.BytesIO()
-                    pil_image.save(buffer, format='PNG')
-                    frame_base64 = base64.b64encode(buffer.getvalue()).decode()
-                    
-                    frames.append({
-                        "frame_number": frame_count,
-                        "processed_index": processed_idx,
-                        "timestamp": timestamp,
-                        "timestamp_str": f"{int(timestamp//60):02d}:{int(timestamp%60):02d}",
-                        "image_base64": frame_base64,
-                        "width": frame.shape[1],
-                        "height": frame.shape[0],
-                        "quality": skip_decision["quality"],
-                        "skip_reason": None
-                    })
-                else:
-                    logger.debug(f"프레임 {frame_count} 스킵: {skip_decision['reason']} (품질: {skip_decision['quality']:.2f})")
-                
-                processed_idx += 1
-                
-                # 주기적 로그
-                if processed_idx % 20 == 0:
-                    stats = frame_skipper.get_stats()
-                    logger.info(f"프레임 추출 진행: {len(frames)}개 선택, {stats['skip_rate']} 스킵 ({timestamp:.1f}초)")
+            timestamp = frame_count / video_fps
+            
+            # 관심 영역이 있으면 영역 밖은 품질 평가 / 장면 판단 / 탐지에서 제외
+            detect_image, detect_offset = roi.apply(frame) if roi is not None else (frame, (0, 0))
+            
+            # 🚀 스마트 프레임 스킵 적용 (BGR 원본에서 썸네일만 계산)
+            thumbnail = FrameThumbnail(detect_image)
+            sample_reason = "interval"
+            if scene_sampler is not None:
+                sample_reason = scene_sampler.should_sample(thumbnail, timestamp)
+                if sample_reason is None:
+                    frame_count += 1
+                    continue
+            skip_decision = skipper.should_process_frame(processed_idx, thumbnail, timestamp)
+            
+            if skip_decision["process"]:
+                selected += 1
+                yield build_frame_data(
+                    frame, frame_count, processed_idx, timestamp, duration, skip_decision["quality"], sample_reason,
+                    (window_start, window_end), (detect_image, detect_offset) if roi is not None else None
+                )
+            else:
+                logger.debug(f"프레임 {frame_count} 스킵: {skip_decision['reason']} (품질: {skip_decision['quality']:.2f})")
+            
+            processed_idx += 1
+            
+            # 주기적 로그
+            if processed_idx % 20 == 0:
+                stats = skipper.get_stats()
+                logger.info(f"프레임 추출 진행: {selected}개 선택, {stats['skip_rate']} 스킵 ({timestamp:.1f}초)")
             
             frame_count += 1
         
-        cap.release()
-        
-        final_stats = frame_skipper.get_stats()
-        logger.info(f"✅ 스마트 스킵 프레임 추출 완료: {len(frames)}개 선택 ({final_stats['skip_rate']} 스킵)")
-        
-        return frames
+        final_stats = skipper.get_stats()
+        logger.info(f"✅ 스마트 스킵 프레임 추출 완료: {selected}개 선택 ({final_stats['skip_rate']} 스킵)")
         
     except Exception as e:
         logger.error(f"❌ 스마트 스킵 프레임 추출 실패: {str(e)}")
         raise
 
-def extract_person_crops(image_base64: str, person_detections: List[Dict]) -> List[Dict[str, Any]]:
-    """사람 탐지 결과에서 크롭 이미지 추출 (기존과 동일)"""
+def extract_keyframes_with_smart_skip(reader: KeyframeReader, skipper: Optional[SmartFrameSkipper] = None,
+                                      roi: Optional[RegionOfInterest] = None) -> Iterator[Dict[str, Any]]:
+    """
+    🔑 키프레임 전용 빠른 훑기 (제너레이터, extract_frames_with_smart_skip 과 같은 프레임 정보)
+    - 키프레임 사이 프레임은 디코딩하지 않음 → "누가 있기는 한가" 1차 확인용, 시각은 키프레임 단위로 정확
+    - 샘플링 간격 대신 영상의 GOP 간격을 따름 (장면 전환 / 모션 게이트 / 중복 제거는 그대로 적용)
+    """
+    skipper = skipper or SmartFrameSkipper()
     try:
-        image_data = base64.b64decode(image_base64)
-        original_image = Image.open(io.BytesIO(image_data)).convert('RGB')
+        duration = reader.duration
+        window_start = reader.start_time
+        window_end = min(reader.end_time, duration) if reader.end_time is not None else duration
+        logger.info(
+            f"🔑 키프레임 훑기 시작 ({reader.method}): {reader.video_fps}fps, {duration:.1f}초, "
+            f"구간 {window_start:.1f}초 ~ {window_end:.1f}초"
+        )
+        
+        selected = 0
+        processed_idx = 0
+        scene_sampler = skipper.scene_sampler
+        
+        for frame_number, timestamp, frame in reader:
+            detect_image, detect_offset = roi.apply(frame) if roi is not None else (frame, (0, 0))
+            thumbnail = FrameThumbnail(detect_image)
+            sample_reason = "keyframe"
+            if scene_sampler is not None and scene_sampler.should_sample(thumbnail, timestamp) is None:
+                continue
+            skip_decision = skipper.should_process_frame(processed_idx, thumbnail, timestamp)
+            
+            if skip_decision["process"]:
+                selected += 1
+                yield build_frame_data(
+                    frame, frame_number, processed_idx, timestamp, duration, skip_decision["quality"], sample_reason,
+                    (window_start, window_end), (detect_image, detect_offset) if roi is not None else None
+                )
+            else:
+                logger.debug(f"키프레임 {timestamp:.2f}초 스킵: {skip_decision['reason']}")
+            
+            processed_idx += 1
         
+        logger.info(f"✅ 키프레임 훑기 추출 완료: {processed_idx}개 키프레임 중 {selected}개 선택")
+        
+    except Exception as e:
+        logger.error(f"❌ 키프레임 훑기 추출 실패: {str(e)}")
+        raise
+
+def extract_person_crops(image: np.ndarray, person_detections: List[Dict]) -> List[Dict[str, Any]]:
+    """사람 탐지 결과에서 크롭 추출 (디코딩된 프레임 배열의 슬라이스 뷰, 인코딩 없음)"""
+    try:
+        height, width = image.shape[:2]
         crops = []
         
         for i, detection in enumerate(person_detections):
@@ -414,32 +1263,26 @@ def extract_person_crops(image_base64: str, person_detections: List[Dict]) -> Li
             x1, y1, x2, y2 = int(bbox["x1"]), int(bbox["y1"]), int(bbox["x2"]), int(bbox["y2"])
             
             # 이미지 경계 체크
-            width, height = original_image.width, original_image.height
             x1, y1 = max(0, x1), max(0, y1)
             x2, y2 = min(width, x2), min(height, y2)
             
             # 유효한 크롭 영역인지 확인
             if x2 > x1 and y2 > y1:
-                cropped_image = original_image.crop((x1, y1, x2, y2))
+                crop_width, crop_height = x2 - x1, y2 - y1
                 
                 # 너무 작은 크롭 제외
-                if cropped_image.width > 50 and cropped_image.height > 100:
-                    # base64 인코딩
-                    buffer = io.BytesIO()
-                    cropped_image.save(buffer, format='PNG')
-                    crop_base64 = base64.b64encode(buffer.getvalue()).decode()
-                    
+                if crop_width > 50 and crop_height > 100:
                     # 크롭 품질 계산
-                    crop_quality = calculate_crop_quality(cropped_image, bbox)
+                    crop_quality = calculate_crop_quality(crop_width, crop_height, bbox)
                     
                     crops.append({
                         "person_index": i,
                         "yolo_confidence": detection["confidence"],
-                        "cropped_image": crop_base64,
+                        "image": image[y1:y2, x1:x2],
                         "bbox": bbox,
                         "crop_size": {
-                            "width": cropped_image.width,
-                            "height": cropped_image.height
+                            "width": crop_width,
+                            "height": crop_height
                         },
                         "crop_quality": crop_quality
                     })
@@ -450,15 +1293,15 @@ def extract_person_crops(image_base64: str, person_detections: List[Dict]) -> Li
         logger.error(f"❌ 크롭 추출 실패: {str(e)}")
         return []
 
-def calculate_crop_quality(cropped_image: Image, bbox: Dict) -> float:
-    """크롭 이미지 품질 평가 (기존과 동일)"""
+def calculate_crop_quality(crop_width: int, crop_height: int, bbox: Dict) -> float:
+    """크롭 이미지 품질 평가 (크롭 크기 / 위치 기반)"""
     try:
         # 1. 종횡비 체크 (사람은 보통 세로가 더 김)
-        aspect_ratio = cropped_image.height / cropped_image.width
+        aspect_ratio = crop_height / crop_width
         aspect_score = 1.0 if 1.5 <= aspect_ratio <= 3.0 else 0.7
         
         # 2. 크기 적정성
-        area = cropped_image.width * cropped_image.height
+        area = crop_width * crop_height
         size_score = 1.0 if 10000 <= area <= 100000 else 0.8
         
         # 3. 위치 점수 (중앙에 가까울수록 좋음)
@@ -475,123 +1318,347 @@ def calculate_crop_quality(cropped_image: Image, bbox: Dict) -> float:
     except Exception:
         return 0.5
 
-async def extract_unique_persons_with_batch_processing(frames: List[Dict]) -> List[Dict]:
-    """🚀 배치 처리로 고유 사람 추출"""
-    
-    unique_persons = []
-    processed_frames = 0
+def is_track_eligible(tracker: PersonTracker, track, person: Dict) -> bool:
+    """확정 트랙만 의류 매칭 대상 (단발성 탐지는 YOLO 신뢰도가 높을 때만 유지)"""
+    return track.hits >= tracker.min_hits or person["yolo_confidence"] >= TRACKER_SINGLE_HIT_MIN_CONFIDENCE
+
+def finalize_person(person: Dict, person_numbers: Iterator[int]):
+    """트랙 → 매칭 대상 사람 확정 (번호 부여 + 크롭 인코딩 / blob 저장)"""
+    person["person_id"] = f"person_{next(person_numbers):02d}"
+    # 🚀 크롭 인코딩은 선택된 사람당 한 번만 (의류 매칭 전송 + blob 저장에 같은 PNG 사용)
+    crop = person.pop("crop")
+    person["crop_png"] = encode_png(crop)
+    person["crop_digest"] = blob_store.put_png(person["crop_png"], crop)
+
+def update_tracks_from_results(batch_results: List[Dict], tracker: PersonTracker, track_persons: Dict[int, Dict],
+                               skipper: SmartFrameSkipper) -> int:
+    """
+    YOLO 배치 결과로 추적기 / 트랙별 사람 정보 갱신 (프레임 시간 순서대로)
+    반환: 이 배치에서 크롭한 사람 탐지 수
+    """
+    batch_detections = 0
+    for result in batch_results:
+        if not result.get("success", False):
+            continue
+        
+        frame = result["frame_info"]
+        detections = result["detections"].get("all_detections", [])
+        person_detections = [d for d in detections if d.get("class_name") == "person"]
+        if "detect_offset" in frame:
+            person_detections = map_detections(person_detections, frame["detect_offset"])
+        
+        # 탐지 결과를 프레임 스킵퍼에 전달
+        has_detection = len(person_detections) > 0
+        skipper.add_detection_result(has_detection)
+        
+        # 이 프레임의 모든 사람들 크롭 (배열 뷰)
+        crops = extract_person_crops(frame["image"], person_detections) if person_detections else []
+        batch_detections += len(crops)
+        
+        boxes = np.array(
+            [[c["bbox"]["x1"], c["bbox"]["y1"], c["bbox"]["x2"], c["bbox"]["y2"]] for c in crops],
+            dtype=np.float32
+        ).reshape(-1, 4)
+        
+        # 탐지가 없는 프레임도 갱신해야 트랙 수명이 시간 기준으로 관리됨
+        for det_idx, track in tracker.update(boxes, frame["timestamp"]):
+            crop = crops[det_idx]
+            person = track_persons.get(track.track_id)
+            
+            if person is None:
+                track_persons[track.track_id] = {
+                    "track_id": track.track_id,
+                    "first_seen_frame": frame["processed_index"],
+                    "first_seen_time": frame["timestamp_str"],
+                    # 프레임 배열을 놓아줄 수 있도록 최고 품질 크롭만 복사해서 보관
+                    "crop": crop["image"].copy(),
+                    "bbox": crop["bbox"],
+                    "yolo_confidence": crop["yolo_confidence"],
+                    "crop_quality": crop["crop_quality"],
+                    "frame_appearances": [frame["processed_index"]],
+                    "timestamps": [frame["timestamp_str"]],
+                    "appearance_seconds": [frame["timestamp"]],
+                    "appearance_boxes": [crop["bbox"]]
+                }
+                continue
+            
+            # 기존 트랙의 새로운 등장
+            person["frame_appearances"].append(frame["processed_index"])
+            person["timestamps"].append(frame["timestamp_str"])
+            person["appearance_seconds"].append(frame["timestamp"])
+            person["appearance_boxes"].append(crop["bbox"])
+            
+            # 더 좋은 품질의 크롭이면 교체 (이미 매칭으로 넘긴 사람은 그때 크롭 유지)
+            if "crop" in person and crop["crop_quality"] > person["crop_quality"]:
+                person["crop"] = crop["image"].copy()
+                person["bbox"] = crop["bbox"]
+                person["crop_quality"] = crop["crop_quality"]
+                person["yolo_confidence"] = crop["yolo_confidence"]
+                logger.debug(f"👤 트랙 {track.track_id}: 더 좋은 크롭으로 업데이트")
+    
+    return batch_detections
+
+async def extract_unique_persons_with_batch_processing(frame_iter: Iterator[Dict[str, Any]], fps_interval: float = 3.0,
+                                                      skipper: Optional[SmartFrameSkipper] = None,
+                                                      progress_callback=None,
+                                                      cancel_token: Optional[CancelToken] = None,
+                                                      lane: str = "bulk",
+                                                      on_persons_ready: Optional[Callable[[List[Dict]], Awaitable[bool]]] = None,
+                                                      batch_stats: Optional[Dict[str, Any]] = None):
+    """
+    🚀 배치 처리 + 다중 객체 추적으로 고유 사람 추출 (스트리밍)
+    - 디코딩은 스레드에서 대기열을 미리 채우고, 현재 배치는 YOLO 로 전송 (배치 크기는 AIMD 로 조절)
+    - 프레임 배열은 탐지 결과가 돌아올 때까지만 유지하고 크롭은 배열 뷰로 슬라이스
+    - 트랙별 최고 품질 크롭만 복사해 두었다가 마지막에 한 번 인코딩
+    - 취소 요청은 배치 경계에서 확인 (보낸 YOLO 요청은 끝까지 받고 중단)
+    - on_persons_ready (실시간 모드): 배치마다 새로 확정된 트랙을 그 시점의 크롭으로 바로 넘김
+      → True 를 반환하면 (95% 이상 매칭) 디코딩 / 탐지 / 크롭 추출을 즉시 중단
+    반환: (고유 사람 목록, 처리된 프레임 메타데이터 목록, 조기 종료 정보 또는 None)
+    """
+    skipper = skipper or SmartFrameSkipper()
+    
+    # 트랙 하나 = 고유 사람 하나 (샘플링 간격의 3배 이상 사라지면 새 사람으로 취급)
+    tracker = PersonTracker(
+        iou_threshold=TRACKER_IOU_THRESHOLD,
+        min_hits=TRACKER_MIN_HITS,
+        max_age_seconds=max(TRACKER_MAX_AGE_SECONDS, fps_interval * 3)
+    )
+    track_persons: Dict[int, Dict] = {}
+    frames: List[Dict[str, Any]] = []
+    early_stop = None
+    person_numbers = itertools.count(1)
     
-    logger.info(f"🔍 {len(frames)}개 프레임에서 고유 사람 추출 시작... (배치 처리 적용)")
+    logger.info("🔍 스트리밍 프레임에서 고유 사람 추출 시작... (배치 처리 + 추적 적용)")
     
-    # 배치 단위로 처리
-    batch_size = batch_processor.yolo_batch_size
+    # 배치 단위로 처리 (디코딩 스레드가 대기열을 채우는 동안 현재 배치를 YOLO 로 전송)
+    # 배치 크기는 YOLO 응답에 맞춰 매 배치 다시 읽고, 선택 프레임이 드물면 타임아웃에 부분 배치로 전송
+    prefetcher = FramePrefetcher(frame_iter, YOLO_BATCH_MAX)
+    batch_index = 0
+    sizes_used: List[int] = []
     
-    for i in range(0, len(frames), batch_size):
-        batch_frames = frames[i:i + batch_size]
-        
-        logger.info(f"🔥 배치 {i//batch_size + 1}/{(len(frames) + batch_size - 1)//batch_size} 처리 중...")
-        
-        # 🚀 YOLO 배치 처리
-        batch_results = await batch_processor.process_yolo_batch(batch_frames)
-        
-        # 배치 결과 처리
-        batch_detections = 0
-        for result in batch_results:
-            if not result.get("success", False):
-                continue
-                
-            frame = result["frame_info"]
-            detections = result["detections"].get("all_detections", [])
-            person_detections = [d for d in detections if d.get("class_name") == "person"]
+    try:
+        while True:
+            batch_size = batch_processor.yolo_batch_size
+            batch_frames = await asyncio.to_thread(prefetcher.take, batch_size, batch_processor.batch_timeout)
+            if not batch_frames:
+                break
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
             
-            # 탐지 결과를 프레임 스킵퍼에 전달
-            has_detection = len(person_detections) > 0
-            frame_skipper.add_detection_result(has_detection)
+            batch_index += 1
+            sizes_used.append(batch_size)
             
-            if person_detections:
-                batch_detections += len(person_detections)
-                
-                # 이 프레임의 모든 사람들 크롭
-                crops = extract_person_crops(frame["image_base64"], person_detections)
-                
-                for crop in crops:
-                    # 중복 체크 (기존 로직 유지)
-                    duplicate_check = check_if_duplicate_person(crop, unique_persons)
-                    
-                    if not duplicate_check["is_duplicate"]:
-                        # 새로운 고유한 사람 발견!
-                        person_id = f"person_{len(unique_persons) + 1:02d}"
-                        unique_person = {
-                            "person_id": person_id,
-                            "first_seen_frame": frame["processed_index"],
-                            "first_seen_time": frame["timestamp_str"],
-                            "cropped_image": crop["cropped_image"],
-                            "bbox": crop["bbox"],
-                            "yolo_confidence": crop["yolo_confidence"],
-                            "crop_quality": crop["crop_quality"],
-                            "frame_appearances": [frame["processed_index"]],
-                            "timestamps": [frame["timestamp_str"]]
-                        }
-                        
-                        unique_persons.append(unique_person)
-                        logger.info(f"👤 새로운 사람 발견: {person_id} (배치 {i//batch_size + 1}, 품질: {crop['crop_quality']:.2f})")
-                    else:
-                        # 기존 사람의 새로운 등장
-                        existing_idx = duplicate_check["index"]
-                        existing_person = unique_persons[existing_idx]
-                        existing_person["frame_appearances"].append(frame["processed_index"])
-                        existing_person["timestamps"].append(frame["timestamp_str"])
-                        
-                        # 더 좋은 품질의 크롭이면 교체
-                        if crop["crop_quality"] > existing_person["crop_quality"]:
-                            existing_person["cropped_image"] = crop["cropped_image"]
-                            existing_person["bbox"] = crop["bbox"]
-                            existing_person["crop_quality"] = crop["crop_quality"]
-                            existing_person["yolo_confidence"] = crop["yolo_confidence"]
-                            logger.debug(f"👤 {existing_person['person_id']}: 더 좋은 크롭으로 업데이트")
+            logger.info(f"🔥 배치 {batch_index} 처리 중... ({len(batch_frames)}/{batch_size}개 프레임)")
             
-            processed_frames += 1
-        
-        # 진행률 로그
-        progress = ((i + len(batch_frames)) / len(frames)) * 100
-        logger.info(f"🔍 배치 처리 진행률: {progress:.1f}% - 고유 사람: {len(unique_persons)}명 (배치 탐지: {batch_detections}건)")
+            # 🚀 YOLO 배치 처리
+            batch_results = await batch_processor.process_yolo_batch(batch_frames, lane, batch_size)
+            
+            # 배치 결과 처리 (프레임 시간 순서대로 추적기 갱신)
+            batch_detections = update_tracks_from_results(batch_results, tracker, track_persons, skipper)
+            
+            # 탐지가 끝난 프레임 배열 해제 (메타데이터만 유지)
+            for frame in batch_frames:
+                frame.pop("image", None)
+                frame.pop("detect_image", None)
+            frames.extend(batch_frames)
+            
+            # 진행률 로그
+            last_frame = batch_frames[-1]
+            window_start = last_frame.get("analysis_start", 0.0)
+            window_end = last_frame.get("analysis_end") or last_frame.get("video_duration") or 0
+            window_length = window_end - window_start
+            progress = (
+                min((last_frame["timestamp"] - window_start) / window_length * 100, 100.0) if window_length > 0 else 0.0
+            )
+            if progress_callback:
+                progress_callback(progress)
+            logger.info(f"🔍 배치 처리 진행률: {progress:.1f}% - 활성 트랙: {len(tracker.active_tracks)}개 (배치 탐지: {batch_detections}건)")
+            
+            # 🎯 실시간 모드: 새로 확정된 트랙을 바로 매칭, 95% 이상이면 남은 영상은 디코딩하지 않음
+            if on_persons_ready is None:
+                continue
+            ready_persons = []
+            for track in tracker.active_tracks:
+                person = track_persons.get(track.track_id)
+                if person is not None and "crop" in person and is_track_eligible(tracker, track, person):
+                    finalize_person(person, person_numbers)
+                    person["matched_early"] = True
+                    ready_persons.append(person)
+            if ready_persons and await on_persons_ready(ready_persons):
+                early_stop = build_early_stop_stats(last_frame, fps_interval, skipper, len(frames))
+                logger.info(
+                    f"🎯 95% 이상 매칭으로 추출 조기 종료: {last_frame['timestamp']:.1f}초 지점 "
+                    f"(남은 {early_stop['skipped_video_seconds']:.1f}초 디코딩 / 탐지 생략)"
+                )
+                break
+    finally:
+        # 디코딩 스레드가 끝난 뒤에야 제너레이터를 닫을 수 있으므로 대기 (미리 디코딩한 프레임은 버림)
+        await asyncio.to_thread(prefetcher.stop)
+        if batch_stats is not None:
+            batch_stats.update(prefetcher.get_stats())
+            batch_stats["yolo_batch_size_min"] = min(sizes_used) if sizes_used else None
+            batch_stats["yolo_batch_size_max"] = max(sizes_used) if sizes_used else None
+    
+    if early_stop is not None:
+        # 매칭으로 넘긴 사람만 결과에 포함 (나머지 트랙은 인코딩 / 매칭하지 않음)
+        unique_persons = [person for person in track_persons.values() if person.get("matched_early")]
+        early_stop["unmatched_tracks_skipped"] = len(track_persons) - len(unique_persons)
+        return unique_persons, frames, early_stop
+    
+    tracker.finish()
+    
+    unique_persons = []
+    discarded = 0
+    for track in sorted(tracker.all_tracks(), key=lambda t: t.first_timestamp):
+        person = track_persons.get(track.track_id)
+        if person is None:
+            continue
+        if "crop" not in person:
+            # 실시간 모드에서 이미 매칭으로 넘긴 사람
+            unique_persons.append(person)
+            continue
+        if not is_track_eligible(tracker, track, person):
+            discarded += 1
+            continue
+        finalize_person(person, person_numbers)
+        unique_persons.append(person)
     
     # 품질 순으로 정렬
     unique_persons.sort(key=lambda x: x["crop_quality"], reverse=True)
     
-    logger.info(f"✅ 배치 처리 고유 사람 추출 완료: {len(unique_persons)}명 발견")
-    return unique_persons
+    logger.info(
+        f"✅ 추적 기반 고유 사람 추출 완료: {len(unique_persons)}명 발견 "
+        f"(트랙 {len(track_persons)}개 중 저신뢰 단발 트랙 {discarded}개 제외)"
+    )
+    return unique_persons, frames, None
 
-def check_if_duplicate_person(new_crop: Dict, existing_persons: List[Dict]) -> Dict:
-    """중복 체크 (기존 로직 유지)"""
-    new_bbox = new_crop["bbox"]
-    new_center = ((new_bbox["x1"] + new_bbox["x2"]) / 2, (new_bbox["y1"] + new_bbox["y2"]) / 2)
-    new_size = (new_bbox["x2"] - new_bbox["x1"]) * (new_bbox["y2"] - new_bbox["y1"])
-    
-    for i, person in enumerate(existing_persons):
-        existing_bbox = person["bbox"]
-        existing_center = ((existing_bbox["x1"] + existing_bbox["x2"]) / 2, (existing_bbox["y1"] + existing_bbox["y2"]) / 2)
-        existing_size = (existing_bbox["x2"] - existing_bbox["x1"]) * (existing_bbox["y2"] - existing_bbox["y1"])
+async def refine_suspect_appearances(cap: cv2.VideoCapture, suspect_matches: List[Dict], frames: List[Dict],
+                                     fps_interval: float, start_time: Optional[float] = None,
+                                     end_time: Optional[float] = None, roi: Optional[RegionOfInterest] = None,
+                                     lane: str = "bulk", cancel_token: Optional[CancelToken] = None) -> Dict[str, Any]:
+    """
+    🔬 2차 패스: 1차(희소) 샘플링에서 찾은 용의자의 첫 등장 직전 / 마지막 등장 직후 구간만 촘촘하게 재샘플링
+    - 1차 패스에 쓴 캡처를 그대로 seek 해서 필요한 프레임만 디코딩
+    - 재샘플링 구간은 1차 패스가 실제로 탐지한 프레임 (frames) 사이 간격 기준 (키프레임 훑기도 GOP 간격만큼)
+    - 1차 패스와 같은 분석 구간 (start_time ~ end_time) / 관심 영역 (roi) 만 탐지
+    - 새 탐지는 가장 가까운 시각의 용의자 박스와 IoU 로 연결 → 등장 / 퇴장 시각이 재샘플링 간격만큼 정확해짐
+    """
+    video_fps = cap.get(cv2.CAP_PROP_FPS)
+    duration = cap.get(cv2.CAP_PROP_FRAME_COUNT) / video_fps if video_fps > 0 else 0.0
+    window = (start_time or 0.0, min(end_time, duration) if end_time is not None else duration)
+    sample_times = sorted(frame["timestamp"] for frame in frames)
+    gaps = sampling_gaps(sample_times)
+    sparse_interval = float(np.median(gaps)) if gaps else fps_interval
+    step = min(REFINE_FPS_INTERVAL, sparse_interval / 2)
+    plan = build_refine_windows(suspect_matches, sample_times, sparse_interval, step, window, REFINE_MAX_FRAMES)
+    stats = {"enabled": True, "step_seconds": step, "sampling_gap_seconds": round(sparse_interval, 3),
+             "frames_sampled": 0, "appearances_added": 0}
+    if not plan:
+        return stats
+    
+    logger.info(f"🔬 2차 패스 시작: 용의자 {len(suspect_matches)}명 등장 / 퇴장 구간 {len(plan)}프레임 ({step}초 간격)")
+    match_indices = dict(plan)
+    i = 0
+    
+    while i < len(plan):
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        # YOLO 응답에 맞춰 조절된 배치 크기를 매 배치 다시 읽음
+        batch_size = batch_processor.yolo_batch_size
+        timestamps = [timestamp for timestamp, _ in plan[i:i + batch_size]]
+        i += batch_size
+        refine_frames = await asyncio.to_thread(read_frames_at, cap, timestamps, video_fps, roi)
+        batch_results = await batch_processor.process_yolo_batch(refine_frames, lane, batch_size)
         
-        # 중심점 거리 계산
-        distance = ((new_center[0] - existing_center[0])**2 + (new_center[1] - existing_center[1])**2)**0.5
-        
-        # 크기 비율 계산
-        size_ratio = min(new_size, existing_size) / max(new_size, existing_size) if max(new_size, existing_size) > 0 else 0
-        
-        # 중복 판정: 중심점이 가깝고 크기가 비슷하면 같은 사람
-        if distance < 150 and size_ratio > 0.6:
-            return {
-                "is_duplicate": True,
-                "index": i,
-                "distance": distance,
-                "size_ratio": size_ratio
-            }
+        for result in batch_results:
+            frame = result["frame_info"]
+            if result.get("success", False):
+                detections = result["detections"].get("all_detections", [])
+                person_detections = [d for d in detections if d.get("class_name") == "person"]
+                if "detect_offset" in frame:
+                    # 1차 패스의 용의자 박스와 같은 원본 프레임 좌표로
+                    person_detections = map_detections(person_detections, frame["detect_offset"])
+                stats["appearances_added"] += assign_refined_detections(
+                    suspect_matches, match_indices[frame["timestamp"]], frame, person_detections, REFINE_IOU_THRESHOLD
+                )
+            frame.pop("image", None)
+            frame.pop("detect_image", None)
+        stats["frames_sampled"] += len(refine_frames)
+    
+    logger.info(f"✅ 2차 패스 완료: {stats['frames_sampled']}프레임 재샘플링, 등장 {stats['appearances_added']}건 추가")
+    return stats
+
+def load_indexed_persons(entry: Dict[str, Any]):
+    """탐지 색인 → (의류 매칭용 사람 목록, 프레임 메타데이터) - 크롭 PNG 는 blob 저장소에서 읽음 (스레드에서 실행)"""
+    persons = []
+    missing = 0
+    for indexed in entry["persons"]:
+        if not blob_store.exists(indexed["crop_digest"]):
+            missing += 1
+            continue
+        persons.append({**indexed, "crop_png": blob_store.read(indexed["crop_digest"])})
+    if missing:
+        logger.warning(f"⚠️ 탐지 색인 크롭 {missing}개가 blob 저장소에 없어 재매칭에서 제외")
+    
+    duration = entry.get("video_duration", 0)
+    frames = [
+        {"frame_number": frame_number, "timestamp": timestamp, "video_duration": duration}
+        for frame_number, timestamp in entry["frames"]
+    ]
+    return persons, frames
+
+def index_summary(options: Dict[str, Any]) -> Dict[str, Any]:
+    """결과 요약에 넣을 색인 정보 (재매칭 여부 / 영상 해시)"""
+    entry = options.get("index_entry")
+    if entry is None:
+        return {"video_sha256": options.get("video_sha256"), "rematch": False}
+    return {
+        "video_sha256": entry["video_sha256"],
+        "rematch": True,
+        "source_analysis_id": entry.get("source_analysis_id"),
+        "indexed_at": entry.get("indexed_at"),
+        "persons_indexed": len(entry["persons"])
+    }
+
+def build_early_stop_stats(last_frame: Dict[str, Any], fps_interval: float,
+                           skipper: SmartFrameSkipper, yolo_requests_sent: int) -> Dict[str, Any]:
+    """95% 매칭 조기 종료로 생략한 작업량 (분석 구간의 남은 부분 기준 추정)"""
+    stopped_at = last_frame["timestamp"]
+    duration = last_frame.get("video_duration") or 0
+    window_start = last_frame.get("analysis_start", 0.0)
+    window_end = last_frame.get("analysis_end") or duration
+    window_length = window_end - window_start
+    remaining_seconds = max(0.0, window_end - stopped_at)
+    sampled_frames_skipped = int(remaining_seconds / fps_interval) if fps_interval > 0 else 0
+    
+    # 지금까지의 스마트 스킵 비율로 남은 구간에서 YOLO 로 보냈을 프레임 수 추정
+    skip_stats = skipper.get_stats()
+    sampled_so_far = skip_stats["processed"] + skip_stats["skipped"]
+    process_ratio = skip_stats["processed"] / sampled_so_far if sampled_so_far else 1.0
     
-    return {"is_duplicate": False}
+    return {
+        "triggered": True,
+        "stopped_at_seconds": round(stopped_at, 1),
+        "stopped_at": last_frame["timestamp_str"],
+        "video_duration_seconds": round(duration, 1),
+        "analysis_window_seconds": round(window_length, 1),
+        "video_coverage": f"{((stopped_at - window_start) / window_length * 100) if window_length > 0 else 100.0:.1f}%",
+        "skipped_video_seconds": round(remaining_seconds, 1),
+        "sampled_frames_skipped": sampled_frames_skipped,
+        "yolo_requests_sent": yolo_requests_sent,
+        "estimated_yolo_requests_saved": int(sampled_frames_skipped * process_ratio)
+    }
 
-async def match_unique_persons_with_batch_processing(unique_persons: List[Dict], stop_on_detect: bool = False) -> List[Dict]:
-    """🚀 배치 처리로 용의자 매칭 - 95% 이상 즉시 중단 기능 추가"""
+async def match_unique_persons_with_batch_processing(unique_persons: List[Dict], stop_on_detect: bool = False,
+                                                     skipper: Optional[SmartFrameSkipper] = None,
+                                                     on_match=None,
+                                                     cancel_token: Optional[CancelToken] = None,
+                                                     lane: str = "bulk", continuous: bool = False) -> List[Dict]:
+    """
+    🚀 배치 처리로 용의자 매칭 - 95% 이상 즉시 중단 기능 추가 (on_match: 매칭 확정 시마다 호출)
+    - continuous (라이브 스트림): 끝이 없는 분석이라 95% 매칭에도 고신뢰 스킵 모드로 바꾸거나 중단하지 않고 모두 매칭
+    """
+    skipper = skipper or SmartFrameSkipper()
     
     logger.info(f"🎯 {len(unique_persons)}명의 고유 사람을 용의자와 배치 매칭 시작...")
     
@@ -600,16 +1667,20 @@ async def match_unique_persons_with_batch_processing(unique_persons: List[Dict],
     # 품질 순으로 정렬하여 우선 처리
     sorted_persons = sorted(unique_persons, key=lambda x: x["crop_quality"], reverse=True)
     
-    # 배치 단위로 처리
-    batch_size = batch_processor.clothing_batch_size
+    # 배치 단위로 처리 (의류 서비스 응답에 맞춰 조절된 배치 크기를 매 배치 다시 읽음)
+    i = 0
     
-    for i in range(0, len(sorted_persons), batch_size):
+    while i < len(sorted_persons):
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        batch_size = batch_processor.clothing_batch_size
         batch_persons = sorted_persons[i:i + batch_size]
+        i += len(batch_persons)
         
-        logger.info(f"🎯 매칭 배치 {i//batch_size + 1}/{(len(sorted_persons) + batch_size - 1)//batch_size} 처리 중...")
+        logger.info(f"🎯 매칭 배치 처리 중... ({i}/{len(sorted_persons)}명, 배치 크기 {batch_size})")
         
         # 🚀 의류 매칭 배치 처리
-        batch_results = await batch_processor.process_clothing_batch(batch_persons)
+        batch_results = await batch_processor.process_clothing_batch(batch_persons, lane, batch_size)
         
         # 배치 결과 처리
         batch_matches = 0
@@ -634,27 +1705,33 @@ async def match_unique_persons_with_batch_processing(unique_persons: List[Dict],
                         "similarity": best_match["similarity"],
                         "confidence": best_match["confidence"],
                         "first_seen_time": person_data["first_seen_time"],
-                        "cropped_image": person_data["cropped_image"],
+                        **blob_refs(person_data["crop_digest"]),
                         "bbox": person_data["bbox"],
                         "yolo_confidence": person_data["yolo_confidence"],
                         "crop_quality": person_data["crop_quality"],
                         "total_appearances": len(person_data["frame_appearances"]),
                         "frame_appearances": person_data["frame_appearances"],
                         "timestamps": person_data["timestamps"],
+                        "appearance_seconds": person_data["appearance_seconds"],
+                        "appearance_boxes": person_data["appearance_boxes"],
+                        "track_id": person_data["track_id"],
                         "method": "smart_skip_batch_optimized_fast"
                     }
                     
                     suspect_matches.append(suspect_match)
                     batch_matches += 1
+                    if on_match:
+                        on_match(suspect_match)
                     logger.info(f"🚨 용의자 매칭! {best_match['suspect_id']} = {person_data['person_id']} ({best_match['similarity']:.1%})")
                     
                     # 🎯 95% 이상 매칭 발견 시 즉시 중단
-                    if best_match["similarity"] >= 0.95:
+                    if best_match["similarity"] >= 0.95 and not continuous:
                         high_confidence_found_in_batch = True
+                        skipper.set_high_confidence_found()
                         logger.info(f"🎯🎯 95% 이상 고신뢰도 매칭 발견! 분석 즉시 중단")
                         break
         
-        logger.info(f"🎯 매칭 배치 {i//batch_size + 1} 완료: {batch_matches}명 매칭됨")
+        logger.info(f"🎯 매칭 배치 완료 ({i}/{len(sorted_persons)}명): {batch_matches}명 매칭됨")
         
         # 🎯 95% 이상 매칭 발견 시 전체 분석 중단
         if high_confidence_found_in_batch and stop_on_detect:
@@ -662,71 +1739,94 @@ async def match_unique_persons_with_batch_processing(unique_persons: List[Dict],
             break
         
         # 🎯 고신뢰도 매칭이 발견되었고 일반 모드에서도 충분한 매칭이 있으면 중단
-        if frame_skipper.high_confidence_found and len(suspect_matches) >= 3:
+        if skipper.high_confidence_found and len(suspect_matches) >= 3 and not continuous:
             logger.info("🎯 고신뢰도 매칭 발견 + 충분한 매칭으로 분석 조기 종료")
             break
     
     logger.info(f"✅ 배치 처리 용의자 매칭 완료: {len(suspect_matches)}명 발견")
     return suspect_matches
 
-def compile_optimized_results(suspect_matches: List[Dict], frames: List[Dict], unique_persons: List[Dict]) -> Dict:
+def build_timeline_entries(match: Dict[str, Any], seq: int) -> List[Dict[str, Any]]:
+    """용의자 트랙의 모든 등장 시점에 대한 타임라인 항목"""
+    return [
+        {
+            "seq": seq,
+            "suspect_id": match["suspect_id"],
+            "similarity": match["similarity"],
+            "confidence": match["confidence"],
+            "timestamp": timestamp,
+            "timestamp_str": timestamp_str,
+            "method": "smart_skip_batch_optimized",
+            "person_id": match["person_id"],
+            "track_id": match["track_id"]
+        }
+        for timestamp, timestamp_str in zip(match["appearance_seconds"], match["timestamps"])
+    ]
+
+def build_crop_image(match: Dict[str, Any], seq: int) -> Dict[str, Any]:
+    """매칭된 용의자의 대표 크롭 이미지 항목"""
+    return {
+        "seq": seq,
+        "suspect_id": match["suspect_id"],
+        "timestamp": match["first_seen_time"],
+        "similarity": match["similarity"],
+        **blob_refs(match["crop_digest"]),
+        "bbox": match["bbox"],
+        "method": "smart_skip_batch_optimized",
+        "total_appearances": match["total_appearances"],
+        "crop_quality": match["crop_quality"],
+        "person_id": match["person_id"],
+        "track_id": match["track_id"]
+    }
+
+def compile_optimized_results(suspect_matches: List[Dict], frames: List[Dict], unique_persons: List[Dict],
+                              skipper: Optional[SmartFrameSkipper] = None,
+                              early_stop: Optional[Dict[str, Any]] = None) -> Dict:
     """최적화 분석 결과 정리"""
+    skipper = skipper or SmartFrameSkipper()
     
-    # 타임라인 생성
+    # 타임라인 / 크롭 이미지 생성 (seq 는 분석 중 누적된 부분 결과와 같은 순서)
     timeline = []
     crop_images = []
     
-    for match in suspect_matches:
-        # 용의자의 모든 등장 프레임에 대해 타임라인 생성
-        for frame_idx in match["frame_appearances"]:
-            if frame_idx < len(frames):
-                frame = frames[frame_idx]
-                timeline_entry = {
-                    "suspect_id": match["suspect_id"],
-                    "similarity": match["similarity"],
-                    "confidence": match["confidence"],
-                    "timestamp": frame["timestamp"],
-                    "timestamp_str": frame["timestamp_str"],
-                    "method": "smart_skip_batch_optimized",
-                    "person_id": match["person_id"]
-                }
-                timeline.append(timeline_entry)
-        
-        # 크롭 이미지
-        crop_image = {
-            "suspect_id": match["suspect_id"],
-            "timestamp": match["first_seen_time"],
-            "similarity": match["similarity"],
-            "cropped_image": match["cropped_image"],
-            "bbox": match["bbox"],
-            "method": "smart_skip_batch_optimized",
-            "total_appearances": match["total_appearances"],
-            "crop_quality": match["crop_quality"],
-            "person_id": match["person_id"]
-        }
-        crop_images.append(crop_image)
+    for seq, match in enumerate(suspect_matches, start=1):
+        timeline.extend(build_timeline_entries(match, seq))
+        crop_images.append(build_crop_image(match, seq))
     
     # 🚀 성능 통계 계산
-    skip_stats = frame_skipper.get_stats()
+    skip_stats = skipper.get_stats()
     
     # 기존 방식 대비 효율성 계산
     original_frames_estimate = len(frames) * 3  # 스킵 없이 3배 더 많은 프레임 처리했을 것으로 추정
     batch_efficiency = 8  # 배치 처리로 8배 빠름
     
+    # 영상 1분당 YOLO 로 보낸 프레임 수 (분석 구간 기준, 조기 종료했으면 실제로 훑은 부분까지)
+    covered_seconds = 0
+    if frames:
+        window_start = frames[0].get("analysis_start", 0.0)
+        window_end = (early_stop or {}).get("stopped_at_seconds") or frames[0].get("analysis_end") or next(
+            (f["video_duration"] for f in frames if f.get("video_duration")), 0
+        )
+        covered_seconds = max(0.0, window_end - window_start)
+    yolo_frames_per_minute = round(len(frames) / (covered_seconds / 60), 1) if covered_seconds else None
+    
     performance = {
         "total_frames_processed": len(frames),
+        "yolo_frames_per_video_minute": yolo_frames_per_minute,
         "frame_skip_stats": skip_stats,
         "unique_persons_found": len(unique_persons),
         "suspect_matches": len(suspect_matches),
         "optimization_techniques": [
             "스마트 프레임 스킵",
-            "배치 API 처리"
+            "배치 API 처리",
+            "다중 객체 추적 (IoU + 칼만 필터)"
         ],
         "speed_improvements": {
             "frame_skip_efficiency": skip_stats["skip_rate"],
             "batch_api_speedup": f"{batch_efficiency}x 빠름",
             "overall_speedup": f"예상 {3-5}x 빨라짐"
         },
+        "early_stop": early_stop or {"triggered": False},
         "quality_maintained": True,
         "method": "smart_skip_batch_optimized"
     }
@@ -738,40 +1838,161 @@ def compile_optimized_results(suspect_matches: List[Dict], frames: List[Dict], u
         "method": "smart_skip_batch_optimized"
     }
 
-async def smart_skip_batch_video_analysis(analysis_id: str, video_path: str, fps_interval: float = 3.0, stop_on_detect: bool = False):
+async def smart_skip_batch_video_analysis(analysis_id: str, video_path: str, fps_interval: float = 3.0,
+                                          stop_on_detect: bool = False, options: Optional[Dict[str, Any]] = None):
     """🚀 스마트 스킵 + 배치 처리 영상 분석"""
+    options = options or {}
+    start_time = datetime.now()
+    lane = options.get("lane", "bulk")
+    submitted_at = options.get("submitted_at", time.monotonic())
+    cancel_token = CancelToken(analysis_id, check_remote=lambda: is_cancel_requested(analysis_id),
+                               check_interval=CANCEL_CHECK_SECONDS)
+    cancel_tokens[analysis_id] = cancel_token
+    writer = AnalysisWriter(analysis_id)
+    cap = None
     try:
-        start_time = datetime.now()
+        # 분석마다 별도의 스킵퍼 사용 (모션 게이트 배경 모델이 영상 간에 섞이지 않도록)
+        motion_gate = MotionGate() if options.get("motion_gate", MOTION_GATE_ENABLED) else None
+        sampling = options.get("sampling", SAMPLING_MODE)
+        scene_sampler = SceneChangeSampler() if sampling == "scene" else None
+        deduplicator = FrameDeduplicator() if options.get("dedup", FRAME_DEDUP_ENABLED) else None
+        skipper = SmartFrameSkipper(motion_gate=motion_gate, scene_sampler=scene_sampler, deduplicator=deduplicator)
+        roi = RegionOfInterest(options["roi"]) if options.get("roi") else None
+        range_limited = roi is not None or options.get("start_time") is not None or options.get("end_time") is not None
+        scan_mode = options.get("scan_mode", SCAN_MODE)
+        keyframe_reader = None
+        
+        optimization_stats = {
+            "frame_skip_enabled": True,
+            "batch_processing_enabled": True,
+            "motion_gate_enabled": motion_gate is not None,
+            "dedup_enabled": deduplicator is not None,
+            "sampling": sampling,
+            "scan_mode": scan_mode,
+            "time_range": [options.get("start_time"), options.get("end_time")],
+            "roi_enabled": roi is not None
+        }
         
-        analysis_status[analysis_id] = {
+        def skip_fields() -> Dict[str, Any]:
+            """이 분석의 스킵 통계 (상태 조회 / 목록에 분석별로 표시)"""
+            stats = skipper.get_stats()
+            return {
+                "frame_skip_stats": stats,
+                "high_confidence_mode": stats["high_confidence_mode"],
+                "optimization_stats": dict(
+                    optimization_stats, skip_rate=stats["skip_rate"], high_confidence_mode=stats["high_confidence_mode"]
+                )
+            }
+        
+        initial_state = {
             "status": "processing",
             "method": "smart_skip_batch_optimized",
             "progress": 0,
             "current_phase": "smart_frame_extraction",
             "suspects_timeline": [],
             "suspect_crop_images": [],
-            "optimization_stats": {
-                "frame_skip_enabled": True,
-                "batch_processing_enabled": True
-            }
+            "result_cursor": 0,
+            **skip_fields()
         }
+        # 시작 전에 들어온 취소 요청(cancel_requested)이 지워지지 않도록 기존 작업은 갱신만
+        if await asyncio.to_thread(job_store.exists, analysis_id):
+            writer.update(initial_state)
+            await writer.flush()
+        else:
+            await asyncio.to_thread(job_store.put, analysis_id, initial_state)
+        cancel_token.raise_if_cancelled()
         
         logger.info(f"🚀 스마트 스킵 + 배치 처리 분석 시작: {analysis_id}")
         
-        # 1단계: 스마트 스킵 프레임 추출 (20%)
-        frames = extract_frames_with_smart_skip(video_path, fps_interval)
-        analysis_status[analysis_id].update({"progress": 20, "current_phase": "batch_person_extraction"})
-        
-        # 2단계: 배치 처리로 고유 사람 추출 (50%)
-        unique_persons = await extract_unique_persons_with_batch_processing(frames)
-        analysis_status[analysis_id].update({"progress": 70, "current_phase": "batch_suspect_matching"})
+        # 1~2단계: 스마트 스킵 프레임 추출 + 배치 처리로 고유 사람 추출 (스트리밍, 70%)
+        def on_extraction_progress(video_progress: float):
+            writer.update({
+                "progress": int(video_progress * 0.7),
+                "current_phase": "batch_person_extraction",
+                **skip_fields()
+            })
+        
+        # 매칭이 확정될 때마다 작업에 바로 누적 (완료 전에도 ?since= 로 조회 가능)
+        match_seq = 0
+        
+        def on_match(match: Dict[str, Any]):
+            nonlocal match_seq
+            match_seq += 1
+            if match_seq == 1:
+                # 접수 → 첫 매칭까지 (레인 우선순위 효과 확인용)
+                batch_processor.lane_metrics.record(lane, "first_match", time.monotonic() - submitted_at)
+            crop_image = build_crop_image(match, match_seq)
+            writer.append({
+                "suspects_timeline": build_timeline_entries(match, match_seq),
+                "suspect_crop_images": [crop_image]
+            }, {"result_cursor": match_seq}, event="match", data=dict(crop_image, cursor=match_seq))
+        
+        # 🎯 실시간 모드: 추출 중에 확정된 트랙을 바로 매칭하고 95% 이상이면 추출 자체를 중단
+        suspect_matches: List[Dict] = []
+        
+        async def match_ready_persons(persons: List[Dict]) -> bool:
+            suspect_matches.extend(await match_unique_persons_with_batch_processing(
+                persons, stop_on_detect, skipper, on_match, cancel_token, lane
+            ))
+            return skipper.high_confidence_found
+        
+        batch_stats: Dict[str, Any] = {}
+        index_entry = options.get("index_entry")
+        if index_entry is not None:
+            # 🗂️ 재매칭: 저장된 탐지 색인의 크롭으로 의류 매칭만 수행 (디코딩 / YOLO 생략)
+            unique_persons, frames = await asyncio.to_thread(load_indexed_persons, index_entry)
+            early_stop = None
+        else:
+            cap = cv2.VideoCapture(video_path)
+            if scan_mode == "keyframes":
+                keyframe_reader = KeyframeReader(video_path, options.get("start_time"), options.get("end_time"))
+                frame_iter = extract_keyframes_with_smart_skip(keyframe_reader, skipper, roi)
+            else:
+                frame_iter = extract_frames_with_smart_skip(
+                    cap, fps_interval, skipper, options.get("start_time"), options.get("end_time"), roi
+                )
+            try:
+                unique_persons, frames, early_stop = await extract_unique_persons_with_batch_processing(
+                    frame_iter, fps_interval, skipper, on_extraction_progress, cancel_token, lane,
+                    on_persons_ready=match_ready_persons if stop_on_detect else None,
+                    batch_stats=batch_stats
+                )
+            finally:
+                frame_iter.close()
+            
+            # 영상 전체를 추출한 경우만 색인 저장 (조기 종료 / 구간 / 관심 영역 제한 / 키프레임 훑기는 일부만 본 결과)
+            if (DETECTION_INDEX_ENABLED and early_stop is None and not range_limited and scan_mode == "full"
+                    and options.get("video_sha256")):
+                entry = build_index_entry(unique_persons, frames, {
+                    "fps_interval": fps_interval,
+                    "motion_gate": motion_gate is not None,
+                    "dedup": deduplicator is not None,
+                    "sampling": sampling
+                })
+                await asyncio.to_thread(detection_index.put, options["video_sha256"], entry, analysis_id)
+        writer.update({"progress": 70, "current_phase": "batch_suspect_matching", **skip_fields()})
+        
+        # 3단계: 배치 처리로 용의자 매칭 (20%) - 추출 중에 매칭한 사람은 제외, 조기 종료했으면 생략
+        if early_stop is None:
+            suspect_matches.extend(await match_unique_persons_with_batch_processing(
+                [person for person in unique_persons if not person.get("matched_early")],
+                stop_on_detect, skipper, on_match, cancel_token, lane
+            ))
+        
+        # 🔬 2차 패스: 용의자 등장 / 퇴장 구간만 같은 캡처로 seek 해서 촘촘하게 재확인
+        refinement = {"enabled": False}
+        if options.get("two_pass", TWO_PASS_ENABLED) and suspect_matches and cap is not None:
+            writer.update({"progress": 85, "current_phase": "temporal_refinement"})
+            refinement = await refine_suspect_appearances(
+                cap, suspect_matches, frames, fps_interval, options.get("start_time"), options.get("end_time"), roi,
+                lane, cancel_token
+            )
+        writer.update({"progress": 90, "current_phase": "result_compilation", **skip_fields()})
         
-        # 3단계: 배치 처리로 용의자 매칭 (20%)
-        suspect_matches = await match_unique_persons_with_batch_processing(unique_persons, stop_on_detect)
-        analysis_status[analysis_id].update({"progress": 90, "current_phase": "result_compilation"})
+        cancel_token.raise_if_cancelled()
         
         # 4단계: 결과 정리 (10%)
-        result = compile_optimized_results(suspect_matches, frames, unique_persons)
+        result = compile_optimized_results(suspect_matches, frames, unique_persons, skipper, early_stop)
         
         # 동선 분석
         movement_analysis = analyze_suspect_movement_optimized(result["timeline"])
@@ -780,37 +2001,75 @@ async def smart_skip_batch_video_analysis(analysis_id: str, video_path: str, fps
         end_time = datetime.now()
         processing_time = (end_time - start_time).total_seconds()
         
-        analysis_status[analysis_id].update({
+        frame_skip_totals.add(skipper.get_stats())
+        writer.update({
             "status": "completed",
             "progress": 100,
             "current_phase": "completed",
+            **skip_fields(),
             "suspects_timeline": result["timeline"],
             "suspect_crop_images": result["crop_images"],
+            "result_cursor": len(result["crop_images"]),
             "summary": {
                 "movement_analysis": movement_analysis,
                 "performance_stats": result["performance"],
-                "frame_skip_stats": frame_skipper.get_stats()
+                "frame_skip_stats": skipper.get_stats(),
+                "early_stop": early_stop or {"triggered": False},
+                "temporal_refinement": refinement,
+                "detection_index": index_summary(options),
+                "keyframe_scan": keyframe_reader.get_stats() if keyframe_reader is not None else None,
+                "adaptive_batching": {
+                    "frame_batches": batch_stats or None,
+                    "services": batch_processor.get_batch_sizing_stats()
+                },
+                "analysis_range": {
+                    "start_time": options.get("start_time"),
+                    "end_time": options.get("end_time"),
+                    "roi": roi.describe() if roi is not None else None
+                }
             },
             "method": "smart_skip_batch_optimized",
             "processing_time_seconds": processing_time
-        })
+        }, event="completed")
+        await writer.flush()
         
         logger.info(f"✅ 스마트 스킵 + 배치 처리 분석 완료: {analysis_id} ({processing_time:.1f}초)")
-        logger.info(f"📊 최적화 성과: 프레임 {frame_skipper.get_stats()['skip_rate']} 스킵, 배치 처리 8x 빠름")
-        
-        # 임시 파일 정리
-        if os.path.exists(video_path):
-            os.remove(video_path)
+        logger.info(f"📊 최적화 성과: 프레임 {skipper.get_stats()['skip_rate']} 스킵, 배치 처리 8x 빠름")
         
         return result
         
+    except AnalysisCancelled:
+        processing_time = (datetime.now() - start_time).total_seconds()
+        logger.info(f"⏹️ 분석 취소됨: {analysis_id} ({processing_time:.1f}초 후 중단)")
+        # 삭제 요청으로 취소된 경우 작업을 되살리지 않음, 취소 전까지 찾은 매칭은 유지
+        await writer.flush()
+        if await asyncio.to_thread(job_store.exists, analysis_id):
+            writer.update({
+                "status": "canceled",
+                "current_phase": "canceled",
+                "processing_time_seconds": processing_time
+            }, event="canceled")
+            await writer.flush()
+        
     except Exception as e:
         logger.error(f"❌ 스마트 스킵 + 배치 처리 분석 실패: {str(e)}")
-        analysis_status[analysis_id] = {
+        # 실패 전까지 누적된 매칭은 유지
+        await writer.flush()
+        failed = {
+            **(await asyncio.to_thread(job_store.get, analysis_id) or {}),
             "status": "failed",
             "error": str(e),
             "method": "smart_skip_batch_optimized"
         }
+        await asyncio.to_thread(job_store.put, analysis_id, failed)
+        event_bus.publish(analysis_id, "failed", build_status_payload(analysis_id, failed))
+    
+    finally:
+        if cap is not None:
+            cap.release()
+        cancel_tokens.pop(analysis_id, None)
+        # 임시 영상 정리 (완료 / 실패 / 취소 공통)
+        remove_video_file(video_path)
 
 def analyze_suspect_movement_optimized(timeline: List[Dict]) -> Dict:
     """최적화된 용의자 동선 분석 (기존과 동일)"""
@@ -860,6 +2119,39 @@ def analyze_suspect_movement_optimized(timeline: List[Dict]) -> Dict:
         logger.error(f"동선 분석 실패: {str(e)}")
         return {"error": str(e)}
 
+async def job_heartbeat_loop():
+    """
+    이 워커의 대기열 / 실행 중 작업 갱신 시각을 주기적으로 갱신
+    - 대기열에서 오래 기다리는 작업 (긴 대기열, 다중 카메라 일괄 분석) 이 중단된 작업으로 실패 처리되지 않도록 함
+    - 다른 워커의 정리 작업도 이 하트비트를 보고 살아 있는 작업으로 판단
+    """
+    interval = max(1.0, min(JOB_HEARTBEAT_SECONDS, JOB_STALE_SECONDS / 3))
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(job_store.touch, analysis_scheduler.tracked_ids())
+        except Exception as e:
+            logger.warning(f"⚠️ 작업 하트비트 실패: {e}")
+
+@app.on_event("startup")
+async def startup_event():
+    """서비스 시작 시 만료된 업로드 세션 / 분석 작업 정리"""
+    removed = upload_manager.cleanup_expired()
+    if removed:
+        logger.info(f"🧹 만료된 업로드 세션 {removed}개 정리")
+    job_store.evict_expired()
+    detection_index.evict_expired()
+    result_cache.evict_expired()
+    blob_store.cleanup_expired(BLOB_TTL_SECONDS)
+    asyncio.create_task(job_heartbeat_loop())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """라이브 스트림 수신 스레드 정리"""
+    for session in live_streams.values():
+        session["reader"].stop()
+        session["buffer"].close()
+
 @app.get("/")
 async def root():
     return {
@@ -888,107 +2180,1030 @@ async def health_check():
     return {
         "status": "healthy",
         "services": SERVICES,
-        "active_analyses": len(analysis_status),
+        "active_analyses": job_store.count("processing"),
+        "scheduler": analysis_scheduler.get_stats(),
+        "downstream_limits": {service: limiter.get_stats() for service, limiter in batch_processor.limiters.items()},
+        "downstream_circuits": {
+            service: caller.breaker.get_stats() for service, caller in batch_processor.resilience.items()
+        },
+        "event_streams": event_bus.get_stats(),
+        "detection_index": detection_index.get_stats(),
+        "live_streams": sum(1 for session in live_streams.values() if not session["task"].done()),
+        "result_cache": result_cache.get_stats(),
         "optimizations_status": {
             "smart_frame_skip": True,
             "batch_api_processing": True,
-            "frame_skip_stats": frame_skipper.get_stats() if frame_skipper else {}
+            "frame_skip_stats": frame_skip_totals.get_stats()
         },
         "method": "smart_skip_batch_optimized",
         "version": "2.5.0"
     }
 
-@app.post("/analyze_video")
-async def analyze_video_optimized(
-    background_tasks: BackgroundTasks,
-    video_file: UploadFile = File(...),
-    fps_interval: float = Form(3.0),
-    location: str = Form(""),
-    date: str = Form(""),
-    stop_on_detect: bool = Form(False)
-):
-    """🚀 스마트 스킵 + 배치 처리 영상 분석"""
-    try:
+def queue_full_exception(error: QueueFullError) -> HTTPException:
+    """대기열 초과 → 429 + Retry-After"""
+    return HTTPException(status_code=429, detail=str(error), headers={"Retry-After": str(error.retry_after)})
+
+def take_live_batch(buffer: FrameRingBuffer, skipper: SmartFrameSkipper, max_frames: int, max_lag: float,
+                    counter: Iterator[int]) -> List[Dict[str, Any]]:
+    """
+    링 버퍼에서 지금 쌓여 있는 프레임을 꺼내 스킵 판단 (스레드에서 실행)
+    - 배치를 채우려고 기다리지 않음: 분석하는 동안 쌓인 만큼만 다음 배치가 됨 → 지연 시간 상한 유지
+    """
+    frames = []
+    for item in buffer.take(max_frames, timeout=1.0, max_age=max_lag):
+        processed_idx = next(counter)
+        thumbnail = FrameThumbnail(item["image"])
+        decision = skipper.should_process_frame(processed_idx, thumbnail, item["stream_time"])
+        if not decision["process"]:
+            continue
+        frames.append({
+            "frame_number": processed_idx,
+            "processed_index": processed_idx,
+            "timestamp": item["stream_time"],
+            "timestamp_str": item["wall_time"][11:19],  # 라이브 스트림은 벽시계 시각 (HH:MM:SS)
+            "captured_at": item["captured_at"],
+            "image": item["image"],
+            "width": item["image"].shape[1],
+            "height": item["image"].shape[0],
+            "quality": decision["quality"]
+        })
+    return frames
+
+def build_live_stats(stream_id: str) -> Dict[str, Any]:
+    session = live_streams[stream_id]
+    return {
+        "stream_id": stream_id,
+        **session["info"],
+        "reader": session["reader"].get_stats(),
+        "buffer": session["buffer"].get_stats(),
+        "metrics": session["metrics"].get_stats(),
+        "frame_skip": session["skipper"].get_stats()
+    }
+
+async def run_live_stream(stream_id: str):
+    """
+    📡 라이브 스트림 분석 루프
+    - 수신 스레드가 링 버퍼에 넣은 프레임을 실시간 레인으로 탐지 → 추적
+    - 트랙이 확정되면 그 시점의 크롭으로 바로 용의자 매칭, 매칭은 match 이벤트로 발행 (/analysis_events/{stream_id})
+    - 종료된 트랙은 버리고, 작업 기록에는 최근 LIVE_RESULT_MAX_MATCHES 개 매칭만 남겨 끝없이 돌아도 메모리가 늘지 않음
+      (모든 매칭은 match 이벤트로 전달)
+    - 끝나면 최종 상태를 기록하고 세션을 정리 (이후 지표는 작업 기록의 live_stats)
+    """
+    session = live_streams[stream_id]
+    reader, buffer, metrics, skipper = session["reader"], session["buffer"], session["metrics"], session["skipper"]
+    tracker = PersonTracker(
+        iou_threshold=TRACKER_IOU_THRESHOLD,
+        min_hits=TRACKER_MIN_HITS,
+        max_age_seconds=max(TRACKER_MAX_AGE_SECONDS, session["info"]["fps_interval"] * 3)
+    )
+    track_persons: Dict[int, Dict] = {}
+    person_numbers = itertools.count(1)
+    frame_counter = itertools.count()
+    match_seq = 0
+    last_status = time.monotonic()
+    writer = AnalysisWriter(stream_id)
+    recent_crops: Deque[Dict[str, Any]] = deque(maxlen=LIVE_RESULT_MAX_MATCHES)
+    recent_timeline: Deque[List[Dict[str, Any]]] = deque(maxlen=LIVE_RESULT_MAX_MATCHES)
+    
+    def on_match(match: Dict[str, Any]):
+        nonlocal match_seq
+        match_seq += 1
+        metrics.matches += 1
+        crop_image = build_crop_image(match, match_seq)
+        recent_crops.append(crop_image)
+        recent_timeline.append(build_timeline_entries(match, match_seq))
+        # 오래된 매칭은 기록에서 밀어냄 (?since= 커서는 seq 기준이라 그대로 동작)
+        writer.update({
+            "suspects_timeline": [entry for entries in recent_timeline for entry in entries],
+            "suspect_crop_images": list(recent_crops),
+            "result_cursor": match_seq
+        }, event="match", data=dict(crop_image, cursor=match_seq))
+    
+    reader.start()
+    logger.info(f"📡 라이브 스트림 분석 시작: {stream_id} ({session['info']['url']})")
+    try:
+        while True:
+            batch_size = batch_processor.yolo_batch_size
+            batch_frames = await asyncio.to_thread(
+                take_live_batch, buffer, skipper, batch_size,
+                session["info"]["max_lag_seconds"], frame_counter
+            )
+            if not batch_frames:
+                if buffer.closed and len(buffer) == 0:
+                    break
+            else:
+                batch_results = await batch_processor.process_yolo_batch(batch_frames, "realtime", batch_size)
+                detections = update_tracks_from_results(batch_results, tracker, track_persons, skipper)
+                metrics.record_frames([frame["captured_at"] for frame in batch_frames], detections)
+                for frame in batch_frames:
+                    frame.pop("image", None)
+                
+                # 새로 확정된 트랙은 바로 매칭
+                ready_persons = []
+                for track in tracker.active_tracks:
+                    person = track_persons.get(track.track_id)
+                    if person is not None and "crop" in person and is_track_eligible(tracker, track, person):
+                        finalize_person(person, person_numbers)
+                        ready_persons.append(person)
+                if ready_persons:
+                    metrics.persons += len(ready_persons)
+                    await match_unique_persons_with_batch_processing(
+                        ready_persons, False, skipper, on_match, None, "realtime", continuous=True
+                    )
+                
+                # 화면을 떠난 트랙 정리
+                for track in tracker.drain_finished():
+                    track_persons.pop(track.track_id, None)
+            
+            if time.monotonic() - last_status >= LIVE_STATUS_INTERVAL:
+                last_status = time.monotonic()
+                writer.update({"live_stats": build_live_stats(stream_id)})
+        
+        final_state = "failed" if reader.state == "failed" else "completed"
+        fields = {"status": final_state, "current_phase": final_state, "live_stats": build_live_stats(stream_id)}
+        if final_state == "failed":
+            fields["error"] = reader.last_error
+        writer.update(fields, event=final_state)
+        await writer.flush()
+        logger.info(f"📡 라이브 스트림 종료: {stream_id} ({reader.state})")
+    except asyncio.CancelledError:
+        # 중지 요청이 제때 끝나지 않아 취소된 경우
+        writer.update({"status": "canceled", "current_phase": "canceled", "live_stats": build_live_stats(stream_id)},
+                      event="canceled")
+        await writer.flush()
+        raise
+    except Exception as e:
+        logger.error(f"❌ 라이브 스트림 분석 실패: {stream_id} ({str(e)})")
+        writer.update({"status": "failed", "current_phase": "failed", "error": str(e),
+                       "live_stats": build_live_stats(stream_id)}, event="failed")
+        await writer.flush()
+    finally:
+        reader.stop()
+        buffer.close()
+        # 최종 상태가 기록된 뒤 세션 정리 (DELETE 를 부르지 않아도 남지 않음)
+        live_streams.pop(stream_id, None)
+
+def resolve_lane(lane: str, stop_on_detect: bool) -> str:
+    """작업 레인 결정 (지정하지 않으면 stop_on_detect 추적 분석은 realtime, 나머지는 bulk)"""
+    if not lane:
+        return "realtime" if stop_on_detect else "bulk"
+    if lane not in LANE_PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"lane 은 {', '.join(LANE_PRIORITIES)} 중 하나여야 합니다")
+    return lane
+
+def resolve_sampling(sampling: str) -> str:
+    """샘플링 방식 확인 (interval | scene)"""
+    sampling = sampling or SAMPLING_MODE
+    if sampling not in SAMPLING_MODES:
+        raise HTTPException(status_code=400, detail=f"sampling 은 {', '.join(SAMPLING_MODES)} 중 하나여야 합니다")
+    return sampling
+
+def resolve_scan_mode(scan_mode: str) -> str:
+    """스캔 방식 확인 (full | keyframes)"""
+    scan_mode = scan_mode or SCAN_MODE
+    if scan_mode not in SCAN_MODES:
+        raise HTTPException(status_code=400, detail=f"scan_mode 는 {', '.join(SCAN_MODES)} 중 하나여야 합니다")
+    return scan_mode
+
+def resolve_analysis_range(start_time: str, end_time: str, roi: str) -> Dict[str, Any]:
+    """분석 구간 / 관심 영역 파라미터 확인 → 분석 옵션 (잘못된 값은 400)"""
+    try:
+        start_seconds = parse_time_value(start_time)
+        end_seconds = parse_time_value(end_time)
+        polygon = parse_roi(roi)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if start_seconds is not None and end_seconds is not None and end_seconds <= start_seconds:
+        raise HTTPException(status_code=400, detail="end_time 은 start_time 보다 뒤여야 합니다")
+    return {"start_time": start_seconds, "end_time": end_seconds, "roi": polygon}
+
+def ensure_analysis_capacity(lane: str = "bulk", count: int = 1):
+    """업로드를 저장 / 조립하기 전에 대기열 여유 확인"""
+    try:
+        analysis_scheduler.check_capacity(lane, count)
+    except QueueFullError as e:
+        raise queue_full_exception(e)
+
+@contextmanager
+def reserve_analysis_capacity(lane: str = "bulk", count: int = 1):
+    """업로드 조립 / 캐시 조회처럼 await 가 끼는 동안 대기열 자리를 미리 잡아 둠 (자리가 없으면 429)"""
+    try:
+        reservation = analysis_scheduler.reserve(lane, count)
+    except QueueFullError as e:
+        raise queue_full_exception(e)
+    try:
+        yield reservation
+    finally:
+        analysis_scheduler.release_reservation(reservation)
+
+def remove_video_file(video_path: Optional[str]):
+    if video_path and os.path.exists(video_path):
+        os.remove(video_path)
+
+def start_video_analysis(video_path: Optional[str], fps_interval: float = 3.0, stop_on_detect: bool = False,
+                         options: Optional[Dict[str, Any]] = None, reservation: Optional[int] = None) -> str:
+    """저장된 영상 파일을 분석 스케줄러에 등록 후 분석 ID 반환 (예약한 자리가 없고 대기열이 가득 차면 429)"""
+    options = dict(options or {})
+    lane = resolve_lane(options.get("lane", ""), stop_on_detect)
+    options.update(lane=lane, submitted_at=time.monotonic())
+
+    # 분석 ID 생성 (같은 초에 여러 요청이 와도 충돌하지 않도록 접미사 추가)
+    analysis_id = f"smart_batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+    # 시작 직후 상태 조회가 404 가 되지 않도록 작업을 먼저 등록 (만료 작업 정리도 함께)
+    job_store.evict_expired()
+    job_store.put(analysis_id, {
+        "status": "queued",
+        "method": "smart_skip_batch_optimized",
+        "progress": 0,
+        "current_phase": "queued",
+        "lane": lane,
+        "video_sha256": options.get("video_sha256"),
+        "gallery_version": (options.get("result_cache") or {}).get("gallery_version")
+    })
+
+    try:
+        position = analysis_scheduler.submit(
+            analysis_id,
+            lambda: smart_skip_batch_video_analysis(analysis_id, video_path, fps_interval, stop_on_detect, options),
+            lane=lane,
+            on_discard=lambda: remove_video_file(video_path),
+            reservation=reservation
+        )
+    except QueueFullError as e:
+        job_store.delete(analysis_id)
+        remove_video_file(video_path)
+        raise queue_full_exception(e)
+
+    cache = options.get("result_cache")
+    if cache:
+        result_cache.put(cache["cache_key"], analysis_id, options["video_sha256"], cache["gallery_version"])
+
+    if position:
+        logger.info(f"⏳ 분석 대기열 등록: {analysis_id} [{lane}] (대기 순번 {position})")
+    logger.info(f"🚀 스마트 스킵 + 배치 처리 영상 분석 요청: {analysis_id}")
+    return analysis_id
+
+async def fetch_gallery_version() -> Optional[str]:
+    """의류 서비스의 용의자 갤러리 버전 (조회 실패 시 None → 캐시 사용 안 함)"""
+    try:
+        async with httpx.AsyncClient(timeout=GALLERY_VERSION_TIMEOUT) as client:
+            response = await client.get(f"{SERVICES['clothing']}/gallery_version")
+        if response.status_code == 200:
+            return response.json().get("gallery_version")
+        logger.warning(f"⚠️ 갤러리 버전 조회 실패: HTTP {response.status_code}")
+    except httpx.HTTPError as e:
+        logger.warning(f"⚠️ 갤러리 버전 조회 실패: {str(e)}")
+    return None
+
+def analysis_cache_params(fps_interval: float, stop_on_detect: bool, options: Dict[str, Any]) -> Dict[str, Any]:
+    """결과에 영향을 주는 분석 파라미터 (레인처럼 순서만 바꾸는 값은 제외)"""
+    return {
+        "fps_interval": fps_interval,
+        "stop_on_detect": stop_on_detect,
+        "motion_gate": options.get("motion_gate", MOTION_GATE_ENABLED),
+        "dedup": options.get("dedup", FRAME_DEDUP_ENABLED),
+        "two_pass": options.get("two_pass", TWO_PASS_ENABLED),
+        "sampling": options.get("sampling", SAMPLING_MODE),
+        "scan_mode": options.get("scan_mode", SCAN_MODE),
+        "start_time": options.get("start_time"),
+        "end_time": options.get("end_time"),
+        "roi": options.get("roi")
+    }
+
+async def lookup_cached_analysis(video_sha256: str, params: Dict[str, Any]):
+    """🗃️ 결과 캐시 조회 (현재 갤러리 버전 기준)"""
+    if not RESULT_CACHE_ENABLED:
+        return None, None
+    return lookup_cached_analysis_for_gallery(video_sha256, params, await fetch_gallery_version())
+
+def lookup_cached_analysis_for_gallery(video_sha256: str, params: Dict[str, Any], gallery_version: Optional[str]):
+    """
+    🗃️ 이미 조회한 갤러리 버전으로 결과 캐시 조회 (일괄 분석은 카메라마다 다시 조회하지 않음)
+    반환: (재사용할 분석 ID 또는 None, 새 분석에 기록할 캐시 정보 또는 None)
+    - 완료된 분석 → 저장된 결과 재사용, 대기 / 진행 중 분석 → 같은 분석에 합류
+    - 실패 / 취소 / 만료된 분석은 캐시에서 지우고 새로 분석
+    - gallery_version 이 None (조회 실패) 이면 캐시를 쓰지 않음
+    """
+    if not RESULT_CACHE_ENABLED:
+        return None, None
+    if gallery_version is None:
+        result_cache.record("bypassed")
+        return None, None
+
+    cache = {"cache_key": build_cache_key(video_sha256, gallery_version, params), "gallery_version": gallery_version}
+    analysis_id = result_cache.get(cache["cache_key"])
+    if analysis_id:
+        job = job_store.get(analysis_id)
+        status = job.get("status") if job else None
+        if status == "completed":
+            result_cache.record("hits")
+            logger.info(f"🗃️ 결과 캐시 적중: {analysis_id} (영상 {video_sha256[:12]}…)")
+            return analysis_id, cache
+        if status in ("queued", "processing"):
+            result_cache.record("attached")
+            logger.info(f"🗃️ 진행 중인 같은 분석에 합류: {analysis_id} (영상 {video_sha256[:12]}…)")
+            return analysis_id, cache
+        result_cache.delete(cache["cache_key"])
+
+    result_cache.record("misses")
+    return None, cache
+
+def build_cached_response(analysis_id: str, video_info: Dict[str, Any]) -> Dict[str, Any]:
+    """캐시 적중 응답 (새 분석 없이 기존 분석 ID 반환)"""
+    job = job_store.get(analysis_id) or {}
+    state = "completed" if job.get("status") == "completed" else "in_flight"
+    response = build_analysis_started_response(analysis_id, video_info)
+    response["cache"] = {"hit": True, "state": state, "gallery_version": job.get("gallery_version")}
+    response["message"] = (
+        "🗃️ 같은 영상의 분석 결과가 이미 있습니다 (재분석 없음)" if state == "completed"
+        else "🗃️ 같은 영상을 분석 중입니다 - 진행 중인 분석에 합류합니다"
+    )
+    return response
+
+def build_analysis_started_response(analysis_id: str, video_info: Dict[str, Any]) -> Dict[str, Any]:
+    """분석 시작 응답 (단일 업로드 / 청크 업로드 공용)"""
+    return {
+        "status": "analysis_started",
+        "analysis_id": analysis_id,
+        "method": "smart_skip_batch_optimized",
+        "optimizations_applied": [
+            "스마트 프레임 스킵 (품질 기반)",
+            "배치 API 처리 (8배 빠름)"
+        ],
+        "expected_performance": {
+            "frame_skip_efficiency": "40-60% 프레임 스킵 (95% 매칭 후 더 공격적)",
+            "api_speedup": "8배 빠른 배치 처리",
+            "early_termination": "95% 이상 매칭 시 즉시 중단",
+            "threshold_optimization": "YOLO 0.25, 의류 0.6으로 하향 조정 (더 많은 매칭)",
+            "overall_speedup": "더 많은 매칭 감지 + 빠른 처리"
+        },
+        "message": "🚀 초고속 분석 시작! 95% 매칭 시 즉시 중단으로 5-8배 빨라집니다!",
+        "video_info": video_info
+    }
+
+@app.post("/analyze_video")
+async def analyze_video_optimized(
+    video_file: UploadFile = File(...),
+    fps_interval: float = Form(3.0),
+    location: str = Form(""),
+    date: str = Form(""),
+    stop_on_detect: bool = Form(False),
+    motion_gate: bool = Form(MOTION_GATE_ENABLED),
+    lane: str = Form(""),
+    two_pass: bool = Form(TWO_PASS_ENABLED),
+    sampling: str = Form(SAMPLING_MODE),
+    dedup: bool = Form(FRAME_DEDUP_ENABLED),
+    start_time: str = Form(""),
+    end_time: str = Form(""),
+    roi: str = Form(""),
+    scan_mode: str = Form(SCAN_MODE)
+):
+    """🚀 스마트 스킵 + 배치 처리 영상 분석 (lane 미지정 시 stop_on_detect 로 결정)"""
+    try:
         if not video_file.content_type.startswith('video/'):
             raise HTTPException(status_code=400, detail="비디오 파일만 업로드 가능합니다")
+        lane = resolve_lane(lane, stop_on_detect)
+        sampling = resolve_sampling(sampling)
+        scan_mode = resolve_scan_mode(scan_mode)
+        analysis_range = resolve_analysis_range(start_time, end_time, roi)
+        
+        content = await video_file.read()
+        video_sha256 = await asyncio.to_thread(lambda: hashlib.sha256(content).hexdigest())
+        options = {
+            "motion_gate": motion_gate, "lane": lane, "two_pass": two_pass, "sampling": sampling, "dedup": dedup,
+            "scan_mode": scan_mode, "video_sha256": video_sha256, **analysis_range
+        }
+        video_info = {
+            "filename": video_file.filename,
+            "size": len(content),
+            "location": location,
+            "date": date,
+            "fps_interval": fps_interval,
+            "stop_on_detect": stop_on_detect,
+            "motion_gate": motion_gate,
+            "lane": lane,
+            "two_pass": two_pass,
+            "sampling": sampling,
+            "dedup": dedup,
+            "scan_mode": scan_mode,
+            **analysis_range,
+            "video_sha256": video_sha256
+        }
+        
+        # 🗃️ 같은 영상 재요청 (타임아웃 재시도 / 같은 사건의 여러 요청) 은 기존 분석 재사용
+        cached_id, options["result_cache"] = await lookup_cached_analysis(
+            video_sha256, analysis_cache_params(fps_interval, stop_on_detect, options)
+        )
+        if cached_id:
+            return build_cached_response(cached_id, video_info)
+        ensure_analysis_capacity(lane)
         
         # 임시 파일 저장
         with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as temp_file:
-            content = await video_file.read()
             temp_file.write(content)
             temp_video_path = temp_file.name
-        
-        # 분석 ID 생성
-        analysis_id = f"smart_batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        # 백그라운드에서 최적화 분석 시작
-        background_tasks.add_task(smart_skip_batch_video_analysis, analysis_id, temp_video_path, fps_interval, stop_on_detect)
-        
-        logger.info(f"🚀 스마트 스킵 + 배치 처리 영상 분석 요청: {analysis_id}")
-        
-        return {
-            "status": "analysis_started",
-            "analysis_id": analysis_id,
-            "method": "smart_skip_batch_optimized",
-            "optimizations_applied": [
-                "스마트 프레임 스킵 (품질 기반)",
-                "배치 API 처리 (8배 빠름)"
-            ],
-            "expected_performance": {
-                "frame_skip_efficiency": "40-60% 프레임 스킵 (95% 매칭 후 더 공격적)",
-                "api_speedup": "8배 빠른 배치 처리",
-                "early_termination": "95% 이상 매칭 시 즉시 중단",
-                "threshold_optimization": "YOLO 0.25, 의류 0.6으로 하향 조정 (더 많은 매칭)",
-                "overall_speedup": "더 많은 매칭 감지 + 빠른 처리"
-            },
-            "message": "🚀 더 많은 매칭을 찾는 최적화 분석 시작!",            "message": "🚀 초고속 분석 시작! 95% 매칭 시 즉시 중단으로 5-8배 빨라집니다!",
-            "video_info": {
-                "filename": video_file.filename,
-                "size": len(content),
-                "location": location,
-                "date": date,
-                "fps_interval": fps_interval,
-                "stop_on_detect": stop_on_detect
-            }
-        }
-        
+
+        analysis_id = start_video_analysis(temp_video_path, fps_interval, stop_on_detect, options=options)
+
+        return build_analysis_started_response(analysis_id, video_info)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ 초고속 영상 분석 시작 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"영상 분석 시작 실패: {str(e)}")
 
 @app.post("/analyze_video_realtime")
 async def analyze_video_realtime_optimized(
-    background_tasks: BackgroundTasks,
     video_file: UploadFile = File(...),
     fps_interval: float = Form(3.0),
     location: str = Form(""),
     date: str = Form(""),
-    stop_on_detect: bool = Form(True)
+    stop_on_detect: bool = Form(True),
+    motion_gate: bool = Form(MOTION_GATE_ENABLED),
+    lane: str = Form("realtime"),
+    two_pass: bool = Form(TWO_PASS_ENABLED),
+    sampling: str = Form(SAMPLING_MODE),
+    dedup: bool = Form(FRAME_DEDUP_ENABLED),
+    start_time: str = Form(""),
+    end_time: str = Form(""),
+    roi: str = Form(""),
+    scan_mode: str = Form(SCAN_MODE)
+):
+    """🚀 초고속 실시간 영상 분석 (95% 매칭 시 즉시 중단, 실시간 레인으로 우선 처리)"""
+    return await analyze_video_optimized(
+        video_file, fps_interval, location, date, stop_on_detect, motion_gate, lane, two_pass, sampling, dedup,
+        start_time, end_time, roi, scan_mode
+    )
+
+# 🎥 사건 단위 다중 카메라 일괄 분석 (카메라별 분석 → 카메라 간 통합 타임라인)
+def hash_upload_file(upload_file) -> str:
+    """업로드 파일 SHA-256 (1MB 단위로 읽어 메모리에 전체를 올리지 않음, 읽은 뒤 처음으로 되감음)"""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: upload_file.read(1 << 20), b""):
+        digest.update(chunk)
+    upload_file.seek(0)
+    return digest.hexdigest()
+
+def save_upload_file(upload_file) -> str:
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as temp_file:
+        shutil.copyfileobj(upload_file, temp_file, 1 << 20)
+        return temp_file.name
+
+@app.post("/analyze_batch")
+async def analyze_camera_batch(
+    video_files: List[UploadFile] = File(...),
+    cameras: str = Form(...),
+    fps_interval: float = Form(3.0),
+    stop_on_detect: bool = Form(False),
+    motion_gate: bool = Form(MOTION_GATE_ENABLED),
+    lane: str = Form("bulk"),
+    two_pass: bool = Form(TWO_PASS_ENABLED),
+    sampling: str = Form(SAMPLING_MODE),
+    dedup: bool = Form(FRAME_DEDUP_ENABLED),
+    scan_mode: str = Form(SCAN_MODE),
+    owner: str = Form("")
+):
+    """
+    🎥 한 사건의 여러 카메라 영상을 한 번에 분석
+    - cameras: 영상 순서대로 [{"location", "recorded_at", "latitude", "longitude", "camera_id"}, ...] JSON
+    - owner: 일괄 분석을 묶을 소유자 (예: 사건 ID → 조회 / 취소에도 같은 owner 필요)
+    - 갤러리 버전은 접수 시 한 번만 조회해 모든 카메라의 캐시 키에 사용
+      (매칭은 카메라마다 실행 시점의 갤러리 기준, 분석 중에 갤러리가 바뀌면 결과의 gallery_changed 로 알림)
+    - 카메라별 분석은 스케줄러 대기열에 함께 등록 (동시 실행 한도만큼 병렬), 자리가 모자라면 전부 거절 (429)
+    - 결과는 GET /batches/{batch_id} 의 통합 타임라인 (CCTVMarker 형태)
+    """
+    if not video_files or len(video_files) > BATCH_MAX_CAMERAS:
+        raise HTTPException(status_code=400, detail=f"영상은 1~{BATCH_MAX_CAMERAS}개까지 올릴 수 있습니다")
+    if any(not (video_file.content_type or "").startswith('video/') for video_file in video_files):
+        raise HTTPException(status_code=400, detail="비디오 파일만 업로드 가능합니다")
+    try:
+        camera_list = parse_cameras(cameras, len(video_files))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    lane = resolve_lane(lane, stop_on_detect)
+    sampling = resolve_sampling(sampling)
+    scan_mode = resolve_scan_mode(scan_mode)
+    
+    # 갤러리 버전: 변경 감지용 (모든 카메라가 같은 버전으로 캐시 키를 만들고, 완료 시 바뀌었는지 확인)
+    # 조회에 실패하면 (None) 카메라마다 다시 조회하지 않고 모두 캐시 없이 분석
+    gallery_version = await fetch_gallery_version()
+    options = {
+        "motion_gate": motion_gate, "lane": lane, "two_pass": two_pass, "sampling": sampling, "dedup": dedup,
+        "scan_mode": scan_mode
+    }
+    params = analysis_cache_params(fps_interval, stop_on_detect, options)
+    
+    pending = []
+    for camera, video_file in zip(camera_list, video_files):
+        video_sha256 = await asyncio.to_thread(hash_upload_file, video_file.file)
+        cached_id, cache = lookup_cached_analysis_for_gallery(video_sha256, params, gallery_version)
+        camera.update(filename=video_file.filename, video_sha256=video_sha256)
+        if cached_id:
+            camera.update(analysis_id=cached_id, cache_hit=True)
+        else:
+            pending.append((camera, video_file, cache))
+    
+    # 영상 저장 중에 다른 요청이 자리를 가져가지 못하도록 카메라 수만큼 한 번에 예약 (전부 아니면 429)
+    started = []
+    with reserve_analysis_capacity(lane, len(pending)) as reservation:
+        try:
+            for camera, video_file, cache in pending:
+                temp_video_path = await asyncio.to_thread(save_upload_file, video_file.file)
+                camera_options = dict(options, video_sha256=camera["video_sha256"], result_cache=cache)
+                camera["analysis_id"] = start_video_analysis(temp_video_path, fps_interval, stop_on_detect,
+                                                             options=camera_options, reservation=reservation)
+                camera["cache_hit"] = False
+                started.append(camera["analysis_id"])
+        except BaseException:
+            # 일부 카메라만 시작된 채로 남지 않도록 이미 시작한 분석 취소
+            for analysis_id in started:
+                request_cancel(analysis_id)
+            raise
+    
+    batch_id = f"camera_batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+    batch_info = {
+        "cameras": camera_list,
+        "gallery_version": gallery_version,
+        "fps_interval": fps_interval,
+        "stop_on_detect": stop_on_detect,
+        **options,
+        "created_at": datetime.now().isoformat()
+    }
+    job_store.put(batch_id, {
+        "status": "processing",
+        "method": "camera_batch",
+        "owner": owner or None,
+        "lane": lane,
+        "progress": 0,
+        "current_phase": "camera_batch_analysis",
+        "gallery_version": gallery_version,
+        "batch_info": batch_info
+    })
+    logger.info(
+        f"🎥 다중 카메라 일괄 분석 등록: {batch_id} ({len(camera_list)}대, 캐시 재사용 "
+        f"{len(camera_list) - len(pending)}대, 갤러리 {gallery_version})"
+    )
+    
+    return {
+        "status": "analysis_started",
+        "batch_id": batch_id,
+        "gallery_version": gallery_version,
+        "cameras": [
+            {key: camera.get(key) for key in ("camera_index", "camera_id", "location", "recorded_at",
+                                              "analysis_id", "cache_hit", "error")}
+            for camera in camera_list
+        ],
+        "monitoring": {"results": f"/batches/{batch_id}"},
+        "message": f"🎥 카메라 {len(camera_list)}대 일괄 분석이 시작되었습니다"
+    }
+
+async def build_batch_result(batch_id: str, batch: Dict[str, Any]) -> Dict[str, Any]:
+    """카메라별 분석 결과를 합친 일괄 분석 결과 (모두 끝나면 통합 결과를 저장해 이후에는 그대로 반환)"""
+    info = batch["batch_info"]
+    merged = batch.get("merged_result")
+    if merged is None:
+        jobs = [job_store.get(camera["analysis_id"]) if camera.get("analysis_id") else None
+                for camera in info["cameras"]]
+        merged = merge_camera_timeline(info["cameras"], jobs)
+        for sighting in merged["timeline"]:
+            if sighting.get("crop_digest"):
+                sighting.update(blob_refs(sighting["crop_digest"]))
+        
+        if merged["status"] != "processing":
+            # 분석 중에 용의자 갤러리가 바뀌었으면 카메라마다 다른 갤러리로 매칭됐을 수 있음
+            current_version = await fetch_gallery_version()
+            merged["gallery_changed"] = (
+                info["gallery_version"] is not None and current_version is not None
+                and current_version != info["gallery_version"]
+            )
+            job_store.update(batch_id, {
+                "status": "failed" if merged["status"] == "failed" else "completed",
+                "progress": 100,
+                "current_phase": "completed",
+                "merged_result": merged
+            })
+    
+    return {
+        "batch_id": batch_id,
+        "gallery_version": info["gallery_version"],
+        "created_at": info["created_at"],
+        **merged
+    }
+
+def load_camera_batch(batch_id: str, owner: Optional[str]) -> Dict[str, Any]:
+    """일괄 분석 기록 조회 (다른 owner 의 일괄 분석은 존재 여부도 드러내지 않도록 404)"""
+    batch = job_store.get(batch_id)
+    if batch is None or batch.get("method") != "camera_batch" or (batch.get("owner") and batch["owner"] != owner):
+        raise HTTPException(status_code=404, detail="일괄 분석을 찾을 수 없습니다")
+    return batch
+
+@app.get("/batches/{batch_id}")
+async def get_camera_batch(batch_id: str, owner: str = ""):
+    """다중 카메라 일괄 분석 진행 상황 + 카메라 간 통합 타임라인 (진행 중이면 지금까지의 부분 결과)"""
+    batch = load_camera_batch(batch_id, owner or None)
+    return await build_batch_result(batch_id, batch)
+
+@app.post("/batches/{batch_id}/cancel")
+async def cancel_camera_batch(batch_id: str, owner: str = ""):
+    """일괄 분석 취소 (이 일괄 분석이 새로 시작한 카메라 분석만 취소, 캐시로 합류한 분석은 유지)"""
+    batch = load_camera_batch(batch_id, owner or None)
+    canceled = []
+    for camera in batch["batch_info"]["cameras"]:
+        if camera.get("analysis_id") and not camera.get("cache_hit"):
+            job = job_store.get(camera["analysis_id"])
+            if job and job.get("status") in ("queued", "processing"):
+                request_cancel(camera["analysis_id"])
+                canceled.append(camera["analysis_id"])
+    logger.info(f"⏹️ 일괄 분석 취소 요청: {batch_id} ({len(canceled)}개 분석)")
+    return {"batch_id": batch_id, "canceled_analyses": canceled}
+
+# 📦 재개 가능한 청크 업로드 (세션 생성 → 청크 PUT → finalize)
+@app.post("/uploads")
+async def create_upload_session(
+    filename: str = Form(...),
+    total_size: int = Form(...),
+    content_type: str = Form("video/mp4"),
+    sha256: str = Form(""),
+    location: str = Form(""),
+    date: str = Form(""),
+    owner: str = Form("")
+):
+    """청크 업로드 세션 생성 (owner: 세션을 묶을 소유자, 예: 사건 ID → 이후 요청도 같은 owner 필요)"""
+    try:
+        return upload_manager.create_session(
+            filename, total_size, content_type, sha256 or None,
+            metadata={"location": location, "date": date}, owner=owner or None
+        )
+    except UploadSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+@app.get("/uploads/{upload_id}")
+async def get_upload_session(upload_id: str, owner: str = ""):
+    """업로드 진행 상황 및 누락 구간 조회 (이어받기용)"""
+    try:
+        return upload_manager.get_session(upload_id, owner or None)
+    except UploadSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+@app.put("/uploads/{upload_id}")
+async def put_upload_chunk(upload_id: str, request: Request, offset: Optional[int] = None, owner: str = ""):
+    """청크 업로드 - Content-Range 헤더 또는 offset 쿼리로 위치 지정"""
+    header = request.headers.get("content-range")
+    content_range = parse_content_range(header)
+    if header and content_range is None:
+        raise HTTPException(status_code=400, detail="Content-Range 헤더 형식이 올바르지 않습니다 (bytes start-end/total)")
+    total_size = None
+    if content_range is not None:
+        offset, _, total_size = content_range
+    if offset is None:
+        raise HTTPException(status_code=400, detail="Content-Range 헤더 또는 offset 파라미터가 필요합니다")
+
+    data = await request.body()
+    if content_range is not None and content_range[1] - content_range[0] + 1 != len(data):
+        raise HTTPException(status_code=400, detail="Content-Range 와 청크 크기가 일치하지 않습니다")
+
+    try:
+        return await asyncio.to_thread(upload_manager.write_chunk, upload_id, offset, data, total_size, owner or None)
+    except UploadSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+@app.post("/uploads/{upload_id}/finalize")
+async def finalize_upload_session(
+    upload_id: str,
+    fps_interval: float = Form(3.0),
+    stop_on_detect: bool = Form(False),
+    motion_gate: bool = Form(MOTION_GATE_ENABLED),
+    lane: str = Form(""),
+    two_pass: bool = Form(TWO_PASS_ENABLED),
+    sampling: str = Form(SAMPLING_MODE),
+    dedup: bool = Form(FRAME_DEDUP_ENABLED),
+    start_time: str = Form(""),
+    end_time: str = Form(""),
+    roi: str = Form(""),
+    scan_mode: str = Form(SCAN_MODE),
+    owner: str = Form("")
+):
+    """모든 청크 수신 후 파일 조립 및 분석 시작 (대기열이 가득 차면 세션을 유지한 채 429)"""
+    lane = resolve_lane(lane, stop_on_detect)
+    sampling = resolve_sampling(sampling)
+    scan_mode = resolve_scan_mode(scan_mode)
+    analysis_range = resolve_analysis_range(start_time, end_time, roi)
+    # 조립 / 캐시 조회 중에 다른 요청이 자리를 가져가면 세션이 이미 사라진 뒤라 업로드를 잃으므로 자리를 먼저 예약
+    with reserve_analysis_capacity(lane) as reservation:
+        try:
+            video_path, session = await asyncio.to_thread(upload_manager.finalize, upload_id, owner or None)
+        except UploadSessionError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+
+        options = {
+            "motion_gate": motion_gate, "lane": lane, "two_pass": two_pass, "sampling": sampling, "dedup": dedup,
+            "scan_mode": scan_mode, "video_sha256": session["sha256"], **analysis_range
+        }
+        video_info = {
+            "filename": session["filename"],
+            "size": session["total_size"],
+            "location": session["metadata"].get("location", ""),
+            "date": session["metadata"].get("date", ""),
+            "fps_interval": fps_interval,
+            "stop_on_detect": stop_on_detect,
+            "motion_gate": motion_gate,
+            "lane": lane,
+            "two_pass": two_pass,
+            "sampling": sampling,
+            "dedup": dedup,
+            "scan_mode": scan_mode,
+            **analysis_range,
+            "video_sha256": session["sha256"],
+            "upload_id": upload_id
+        }
+
+        cached_id, options["result_cache"] = await lookup_cached_analysis(
+            session["sha256"], analysis_cache_params(fps_interval, stop_on_detect, options)
+        )
+        if cached_id:
+            remove_video_file(video_path)
+            return build_cached_response(cached_id, video_info)
+
+        analysis_id = start_video_analysis(video_path, fps_interval, stop_on_detect, options=options,
+                                           reservation=reservation)
+
+        return build_analysis_started_response(analysis_id, video_info)
+
+@app.delete("/uploads/{upload_id}")
+async def abort_upload_session(upload_id: str, owner: str = ""):
+    """업로드 세션 취소"""
+    try:
+        upload_manager.abort(upload_id, owner or None)
+    except UploadSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    return {"message": f"업로드 {upload_id}가 취소되었습니다"}
+
+# 🗂️ 탐지 색인 기반 재매칭 (영상 재업로드 / 디코딩 / YOLO 없이 의류 매칭만)
+def resolve_video_sha256(video_sha256: str, analysis_id: str) -> str:
+    """영상 해시 직접 지정 또는 이전 분석 ID 로 조회"""
+    if video_sha256:
+        return video_sha256.lower()
+    if analysis_id:
+        job = job_store.get(analysis_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="분석을 찾을 수 없습니다")
+        if job.get("video_sha256"):
+            return job["video_sha256"]
+        raise HTTPException(status_code=404, detail="영상 해시가 기록되지 않은 분석입니다")
+    raise HTTPException(status_code=400, detail="video_sha256 또는 analysis_id 가 필요합니다")
+
+@app.get("/detection_index/{video_sha256}")
+async def get_detection_index(video_sha256: str):
+    """영상별 탐지 색인 요약"""
+    summary = detection_index.describe(video_sha256.lower())
+    if summary is None:
+        raise HTTPException(status_code=404, detail="탐지 색인이 없습니다. 영상을 한 번 전체 분석해야 합니다")
+    return summary
+
+@app.post("/rematch")
+async def rematch_indexed_video(
+    video_sha256: str = Form(""),
+    analysis_id: str = Form(""),
+    stop_on_detect: bool = Form(False),
+    lane: str = Form("")
 ):
-    """🚀 초고속 실시간 영상 분석 (95% 매칭 시 즉시 중단)"""
-    return await analyze_video_optimized(background_tasks, video_file, fps_interval, location, date, stop_on_detect)
+    """
+    🗂️ 저장된 탐지 색인의 크롭으로 현재 용의자 갤러리와 다시 매칭
+    - 새 용의자 등록 후 과거 CCTV 재확인용 (결과는 일반 분석과 같은 상태 / 결과 / SSE API 로 조회)
+    """
+    video_sha256 = resolve_video_sha256(video_sha256, analysis_id)
+    entry = await asyncio.to_thread(detection_index.get, video_sha256)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="탐지 색인이 없습니다. 영상을 한 번 전체 분석해야 합니다")
+
+    lane = resolve_lane(lane, stop_on_detect)
+    ensure_analysis_capacity(lane)
+    rematch_id = start_video_analysis(
+        None, entry["params"].get("fps_interval", 3.0), stop_on_detect,
+        options={"lane": lane, "video_sha256": video_sha256, "index_entry": entry}
+    )
+
+    return {
+        "status": "analysis_started",
+        "analysis_id": rematch_id,
+        "method": "detection_index_rematch",
+        "video_sha256": video_sha256,
+        "source_analysis_id": entry.get("source_analysis_id"),
+        "persons_indexed": len(entry["persons"]),
+        "message": f"🗂️ 저장된 탐지 결과 {len(entry['persons'])}명으로 재매칭 시작 (영상 재분석 없음)"
+    }
+
+# 📡 라이브 스트림 모니터링 (스트림 ID 는 분석 ID 처럼 상태 / 결과 / SSE API 로 조회)
+def resolve_live_file_source(path: str) -> str:
+    """로컬 파일 대체 소스 확인 (LIVE_FILE_SOURCE_DIR 안의 파일만, 설정하지 않으면 네트워크 스트림만 허용)"""
+    if not LIVE_FILE_SOURCE_DIR:
+        raise HTTPException(status_code=400, detail="RTSP / HTTP 스트림 URL 만 사용할 수 있습니다")
+    root = os.path.realpath(LIVE_FILE_SOURCE_DIR)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root or not os.path.isfile(resolved):
+        raise HTTPException(status_code=400, detail="허용된 디렉터리 안의 영상 파일이 아닙니다")
+    return resolved
+
+@app.post("/streams")
+async def start_live_stream(
+    url: str = Form(...),
+    fps_interval: float = Form(1.0),
+    location: str = Form(""),
+    max_lag_seconds: float = Form(LIVE_MAX_LAG_SECONDS),
+    motion_gate: bool = Form(MOTION_GATE_ENABLED),
+    dedup: bool = Form(FRAME_DEDUP_ENABLED),
+    loop: bool = Form(False)
+):
+    """
+    라이브 카메라 스트림 분석 시작 (RTSP / HTTP, 테스트 / 개발용으로 LIVE_FILE_SOURCE_DIR 안의 로컬 파일)
+    - loop: 로컬 파일을 끝에서 처음으로 되감아 계속 재생 (테스트용)
+    """
+    if fps_interval <= 0 or max_lag_seconds <= 0:
+        raise HTTPException(status_code=400, detail="fps_interval 과 max_lag_seconds 는 0보다 커야 합니다")
+    if not is_network_source(url):
+        url = resolve_live_file_source(url)
+    active = sum(1 for session in live_streams.values() if not session["task"].done())
+    if active >= LIVE_MAX_STREAMS:
+        raise HTTPException(status_code=429, detail=f"동시에 분석할 수 있는 스트림은 {LIVE_MAX_STREAMS}개입니다")
+    
+    stream_id = f"stream_{uuid.uuid4().hex[:12]}"
+    buffer = FrameRingBuffer(LIVE_BUFFER_FRAMES)
+    info = {
+        "url": url,
+        "location": location,
+        "fps_interval": fps_interval,
+        "max_lag_seconds": max_lag_seconds,
+        "motion_gate": motion_gate,
+        "dedup": dedup,
+        "started_at": datetime.now().isoformat()
+    }
+    job_store.put(stream_id, {
+        "status": "processing",
+        "method": "live_stream",
+        "lane": "realtime",
+        "progress": 0,
+        "current_phase": "live_monitoring",
+        "suspects_timeline": [],
+        "suspect_crop_images": [],
+        "result_cursor": 0,
+        "stream_info": info
+    })
+    live_streams[stream_id] = {
+        "info": info,
+        "buffer": buffer,
+        "reader": LiveStreamReader(url, buffer, fps_interval, loop=loop, max_reconnects=LIVE_RECONNECTS),
+        "metrics": StreamMetrics(),
+        "skipper": SmartFrameSkipper(
+            motion_gate=MotionGate() if motion_gate else None,
+            deduplicator=FrameDeduplicator() if dedup else None
+        )
+    }
+    live_streams[stream_id]["task"] = asyncio.create_task(run_live_stream(stream_id))
+    
+    return {
+        "status": "streaming",
+        "stream_id": stream_id,
+        "analysis_id": stream_id,
+        "events_url": f"/analysis_events/{stream_id}",
+        "stream_info": info,
+        "message": "📡 라이브 스트림 모니터링 시작 (매칭은 match 이벤트로 전달)"
+    }
+
+@app.get("/streams")
+async def list_live_streams():
+    """이 워커에서 실행 중인 스트림 지표"""
+    return {"streams": [build_live_stats(stream_id) for stream_id in list(live_streams)]}
+
+def finished_live_stats(stream_id: str) -> Dict[str, Any]:
+    """종료되어 세션이 정리된 스트림의 마지막 지표 (작업 기록)"""
+    job = job_store.get(stream_id)
+    if job is None or job.get("method") != "live_stream" or job.get("status") == "processing":
+        raise HTTPException(status_code=404, detail="스트림을 찾을 수 없습니다 (다른 워커에서 실행 중일 수 있음)")
+    return {"status": job["status"], **(job.get("live_stats") or {"stream_id": stream_id})}
+
+@app.get("/streams/{stream_id}")
+async def get_live_stream(stream_id: str):
+    """스트림별 처리량 / 지연 / 버퍼 드롭 지표 (종료된 스트림은 마지막 지표)"""
+    if stream_id not in live_streams:
+        return finished_live_stats(stream_id)
+    return build_live_stats(stream_id)
+
+@app.delete("/streams/{stream_id}")
+async def stop_live_stream(stream_id: str):
+    """스트림 분석 중지 (버퍼에 남은 프레임까지 처리하고 종료)"""
+    session = live_streams.get(stream_id)
+    if session is None:
+        return {**finished_live_stats(stream_id), "status": "stopped"}
+    session["reader"].stop()
+    try:
+        await asyncio.wait_for(asyncio.shield(session["task"]), timeout=30.0)
+    except asyncio.TimeoutError:
+        session["task"].cancel()
+        with suppress(asyncio.CancelledError):
+            await session["task"]
+    return {**finished_live_stats(stream_id), "status": "stopped"}
+
+@app.get("/blobs/{digest}")
+async def get_blob(digest: str, request: Request, size: Optional[str] = None):
+    """
+    🖼️ 크롭 이미지 조회 (콘텐츠 주소 기반)
+    - size 미지정: 원본 PNG, size=sm|md: JPEG 썸네일
+    - 내용이 digest 로 고정되므로 강한 ETag + immutable 캐시, If-None-Match 일치 시 304
+    """
+    try:
+        path = blob_store.path(digest, size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다")
+    
+    etag = f'"{digest}-{size}"' if size else f'"{digest}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable"
+    }
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    
+    data = await asyncio.to_thread(blob_store.read, digest, size)
+    return Response(content=data, media_type="image/jpeg" if size else "image/png", headers=headers)
 
 @app.get("/analysis_status/{analysis_id}")
 async def get_analysis_status(analysis_id: str):
     """분석 진행 상황 조회"""
-    if analysis_id not in analysis_status:
+    status = job_store.get(analysis_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="분석 ID를 찾을 수 없습니다")
     
-    status = analysis_status[analysis_id]
+    return build_status_payload(analysis_id, status)
+
+@app.get("/analysis_events/{analysis_id}")
+async def stream_analysis_events(analysis_id: str, request: Request):
+    """
+    분석 진행 SSE 스트림 (상태 폴링 대체)
+    - 연결 직후 현재 상태 1건, 이후 progress / match 이벤트, completed / failed 에서 종료
+    - 다른 워커에서 실행 중인 분석도 작업 저장소 재확인으로 진행 상황 전달
+    """
+    # 조회 전에 구독해야 그 사이 발행된 이벤트를 놓치지 않음
+    queue = event_bus.subscribe(analysis_id)
+    status = job_store.get(analysis_id)
+    if status is None:
+        event_bus.unsubscribe(analysis_id, queue)
+        raise HTTPException(status_code=404, detail="분석 ID를 찾을 수 없습니다")
     
-    return {
-        "analysis_id": analysis_id,
-        "status": status.get("status"),
-        "progress": status.get("progress", 0),
-        "current_phase": status.get("current_phase", "준비 중"),
-        "method": status.get("method", "smart_skip_batch_optimized"),
-        "suspects_found": len(status.get("suspects_timeline", [])),
-        "crop_images_available": len(status.get("suspect_crop_images", [])),
-        "processing_time": status.get("processing_time_seconds", 0),
-        "optimization_stats": status.get("optimization_stats", {}),
-        "high_confidence_mode": frame_skipper.high_confidence_found if frame_skipper else False,
-        "phase_description": get_phase_description_optimized(status.get("current_phase", ""))
-    }
+    def event_name(payload: Dict[str, Any]) -> str:
+        return payload["status"] if payload["status"] in TERMINAL_EVENTS else "progress"
+    
+    def state_key(payload: Dict[str, Any]):
+        return (payload["status"], payload["progress"], payload["current_phase"],
+                payload["crop_images_available"], payload["queue_position"])
+    
+    async def event_stream():
+        try:
+            payload = build_status_payload(analysis_id, status)
+            yield format_sse(event_name(payload), payload)
+            if payload["status"] in TERMINAL_EVENTS:
+                return
+            
+            last_state = state_key(payload)
+            idle_seconds = 0.0
+            while not await request.is_disconnected():
+                try:
+                    event, payload = await asyncio.wait_for(queue.get(), SSE_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    current = job_store.get(analysis_id)
+                    if current is None:
+                        yield format_sse("failed", {"analysis_id": analysis_id, "status": "failed",
+                                                    "error": "분석 작업이 삭제되었습니다"})
+                        return
+                    payload = build_status_payload(analysis_id, current)
+                    if state_key(payload) == last_state:
+                        idle_seconds += SSE_POLL_SECONDS
+                        if idle_seconds >= SSE_KEEPALIVE_SECONDS:
+                            idle_seconds = 0.0
+                            yield ": keepalive\n\n"
+                        continue
+                    event = event_name(payload)
+                
+                idle_seconds = 0.0
+                if event != "match":
+                    last_state = state_key(payload)
+                yield format_sse(event, payload)
+                if event in TERMINAL_EVENTS:
+                    return
+        finally:
+            event_bus.unsubscribe(analysis_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 def get_phase_description_optimized(phase: str) -> str:
     """최적화된 분석 단계별 설명"""
@@ -996,18 +3211,49 @@ def get_phase_description_optimized(phase: str) -> str:
         "smart_frame_extraction": "📹 초고속 프레임 추출 중... (엄격한 품질 기반 스킵)",
         "batch_person_extraction": "👤 배치 처리로 고유 사람 식별 중... (YOLO 0.4 임계값)",
         "batch_suspect_matching": "🎯 배치 처리로 용의자 매칭 중... (95% 매칭 시 즉시 중단)",
+        "temporal_refinement": "🔬 용의자 등장 / 퇴장 구간 정밀 재확인 중... (2차 패스)",
+        "live_monitoring": "📡 라이브 스트림 실시간 감시 중...",
         "result_compilation": "📊 초고속 결과 정리 중...",
-        "completed": "✅ 초고속 분석 완료! (95% 매칭 발견)"
+        "completed": "✅ 초고속 분석 완료! (95% 매칭 발견)",
+        "queued": "⏳ 분석 대기 중... (앞선 분석이 끝나면 시작)",
+        "canceling": "⏹️ 분석 취소 중... (진행 중인 요청 마무리)",
+        "canceled": "⏹️ 분석이 취소되었습니다"
     }
     return phase_descriptions.get(phase, "🔄 초고속 처리 중...")
 
+def build_partial_result(analysis_id: str, status: Dict[str, Any], since: int) -> Dict[str, Any]:
+    """커서(since) 이후 새로 확정된 매칭만 반환 (진행 중 / 종료 작업 모두)"""
+    since = max(0, since)
+    crop_images = status.get("suspect_crop_images", [])
+    cursor = status.get("result_cursor", len(crop_images))
+    
+    result = {
+        "analysis_id": analysis_id,
+        "status": status.get("status", "unknown"),
+        "progress": status.get("progress", 0),
+        "current_phase": status.get("current_phase"),
+        "since": since,
+        "cursor": max(since, cursor),
+        "complete": status.get("status") in TERMINAL_EVENTS,
+        "suspect_crop_images": [img for img in crop_images if img.get("seq", 0) > since],
+        "suspects_timeline": [
+            entry for entry in status.get("suspects_timeline", []) if entry.get("seq", 0) > since
+        ]
+    }
+    if status.get("error"):
+        result["error"] = status["error"]
+    return result
+
 @app.get("/analysis_result/{analysis_id}")
-async def get_analysis_result(analysis_id: str):
-    """완료된 분석 결과 조회"""
-    if analysis_id not in analysis_status:
+async def get_analysis_result(analysis_id: str, since: Optional[int] = None):
+    """완료된 분석 결과 조회 (since 지정 시 진행 중에도 해당 커서 이후 매칭만 반환)"""
+    status = job_store.get(analysis_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="분석 ID를 찾을 수 없습니다")
     
-    status = analysis_status[analysis_id]
+    if since is not None:
+        return build_partial_result(analysis_id, status, since)
+    
     current_status = status.get("status", "unknown")
     
     if current_status != "completed":
@@ -1059,51 +3305,39 @@ async def get_analysis_result(analysis_id: str):
 
 @app.get("/optimization_stats")
 async def get_optimization_stats():
-    """최적화 성능 통계"""
-    completed_analyses = [
-        info for info in analysis_status.values() 
-        if info.get("status") == "completed"
-    ]
-    
-    if not completed_analyses:
-        return {"message": "완료된 분석이 없습니다"}
-    
-    # 성능 통계 계산
-    total_processing_time = sum(
-        info.get("processing_time_seconds", 0) 
-        for info in completed_analyses
-    )
-    
-    avg_processing_time = total_processing_time / len(completed_analyses)
+    """최적화 성능 통계 (작업 저장소 요약 컬럼 집계)"""
+    aggregate = job_store.aggregate_completed()
+    completed_count = aggregate["completed"]
+    status_counts = {
+        status: job_store.count(status)
+        for status in ("queued", "processing", "canceling", "completed", "failed", "canceled")
+    }
     
-    total_suspects_found = sum(
-        len(info.get("suspects_timeline", [])) 
-        for info in completed_analyses
-    )
+    if not completed_count:
+        return {"message": "완료된 분석이 없습니다", "analyses_by_status": status_counts}
     
-    total_crop_images = sum(
-        len(info.get("suspect_crop_images", [])) 
-        for info in completed_analyses
-    )
-    
-    # 95% 이상 매칭 통계
-    high_confidence_analyses = sum(
-        1 for info in completed_analyses
-        if any(img.get("similarity", 0) >= 0.95 for img in info.get("suspect_crop_images", []))
-    )
+    # 성능 통계 / 95% 이상 매칭 통계
+    avg_processing_time = aggregate["avg_processing_time"]
+    total_suspects_found = aggregate["total_suspects_found"]
+    total_crop_images = aggregate["total_crop_images"]
+    high_confidence_analyses = aggregate["high_confidence_analyses"]
     
-    # 프레임 스킵 통계
-    frame_skip_stats = frame_skipper.get_stats()
+    # 프레임 스킵 통계 (이 워커에서 완료된 분석 누적)
+    frame_skip_stats = frame_skip_totals.get_stats()
     
     return {
         "method": "smart_skip_batch_optimized_fast",
-        "completed_analyses": len(completed_analyses),
+        "completed_analyses": completed_count,
+        "canceled_analyses": status_counts["canceled"],
+        "analyses_by_status": status_counts,
         "average_processing_time_seconds": round(avg_processing_time, 1),
         "total_suspects_found": total_suspects_found,
         "total_crop_images_generated": total_crop_images,
         "high_confidence_analyses": high_confidence_analyses,
-        "high_confidence_rate": f"{(high_confidence_analyses / len(completed_analyses) * 100):.1f}%",
+        "high_confidence_rate": f"{(high_confidence_analyses / completed_count * 100):.1f}%",
         "frame_skip_performance": frame_skip_stats,
+        "adaptive_batching": batch_processor.get_batch_sizing_stats(),
+        "downstream_resilience": batch_processor.get_resilience_stats(),
         "optimization_effectiveness": {
             "ultra_fast_frame_skip": f"{frame_skip_stats.get('skip_rate', '0%')} 프레임 스킵 (95% 후 더 공격적)",
             "batch_api_speedup": "8배 빠른 API 처리",
@@ -1119,62 +3353,118 @@ async def get_optimization_stats():
         }
     }
 
+def request_cancel(analysis_id: str) -> Dict[str, Any]:
+    """취소 요청 기록 (진행 중인 작업만), 이 워커에서 실행 중이면 즉시 토큰 취소"""
+    job = job_store.get(analysis_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="분석 ID를 찾을 수 없습니다")
+    
+    # 이 워커의 대기열에 있으면 바로 제거 (영상 삭제, 대기열 자리 반환)
+    if job.get("status") == "queued" and analysis_scheduler.discard(analysis_id):
+        update_analysis(analysis_id, {
+            "status": "canceled",
+            "current_phase": "canceled",
+            "cancel_requested": True
+        }, event="canceled")
+        return job_store.get(analysis_id)
+    
+    if job.get("status") in ("queued", "processing", "canceling"):
+        update_analysis(analysis_id, {
+            "status": "canceling",
+            "current_phase": "canceling",
+            "cancel_requested": True
+        })
+        job = job_store.get(analysis_id)
+    
+    token = cancel_tokens.get(analysis_id)
+    if token:
+        token.cancel()
+    return job
+
+@app.post("/analysis/{analysis_id}/cancel")
+async def cancel_analysis(analysis_id: str):
+    """
+    분석 취소
+    - 파이프라인은 다음 배치 경계에서 중단 (이미 보낸 YOLO / 의류 요청은 응답까지 받음)
+    - 임시 영상 삭제, 취소 전까지 찾은 매칭은 유지
+    """
+    job = request_cancel(analysis_id)
+    status = job.get("status")
+    
+    if status in ("completed", "failed"):
+        raise HTTPException(status_code=409, detail=f"이미 종료된 분석입니다. 현재 상태: {status}")
+    
+    logger.info(f"⏹️ 분석 취소 요청: {analysis_id}")
+    return {
+        "analysis_id": analysis_id,
+        "status": status,
+        "message": "분석 취소가 요청되었습니다" if status == "canceling" else "분석이 취소되었습니다"
+    }
+
 @app.delete("/analysis/{analysis_id}")
 async def delete_analysis(analysis_id: str):
-    """분석 결과 삭제"""
-    if analysis_id not in analysis_status:
+    """분석 결과 삭제 (진행 중이면 먼저 취소)"""
+    request_cancel(analysis_id)
+    if not job_store.delete(analysis_id):
         raise HTTPException(status_code=404, detail="분석 ID를 찾을 수 없습니다")
     
-    del analysis_status[analysis_id]
     return {"message": f"분석 {analysis_id}가 삭제되었습니다"}
 
 @app.get("/list_analyses")
-async def list_analyses():
-    """모든 분석 목록 조회"""
+async def list_analyses(status: Optional[str] = None, limit: int = 100, offset: int = 0):
+    """분석 목록 조회 (최신순, 상태 필터 / 페이지 지원)"""
+    limit = max(1, min(limit, 500))
+    summaries = job_store.list_summaries(status=status, limit=limit, offset=max(0, offset))
     return {
-        "total_analyses": len(analysis_status),
+        "total_analyses": job_store.count(status),
+        "limit": limit,
+        "offset": offset,
         "method": "smart_skip_batch_optimized_fast",
-        "frame_skip_stats": frame_skipper.get_stats(),
-        "high_confidence_mode": frame_skipper.high_confidence_found if frame_skipper else False,
-        "analyses": {aid: {
-            "status": info.get("status"), 
-            "progress": info.get("progress", 0),
-            "method": info.get("method", "smart_skip_batch_optimized_fast"),
-            "crop_images_count": len(info.get("suspect_crop_images", [])),
-            "processing_time": info.get("processing_time_seconds", 0),
-            "optimization_stats": info.get("optimization_stats", {}),
-            "high_confidence_matches": len([
-                img for img in info.get("suspect_crop_images", []) 
-                if img.get("similarity", 0) >= 0.95
-            ])
-        } for aid, info in analysis_status.items()}
+        "frame_skip_stats": frame_skip_totals.get_stats(),
+        "analyses": {info["analysis_id"]: {
+            "status": info["status"], 
+            "progress": info["progress"],
+            "method": info["method"] or "smart_skip_batch_optimized_fast",
+            "crop_images_count": info["crop_images_count"],
+            "processing_time": info["processing_time"],
+            "optimization_stats": info["optimization_stats"],
+            "high_confidence_mode": info["optimization_stats"].get("high_confidence_mode", False),
+            "high_confidence_matches": info["high_confidence_matches"]
+        } for info in summaries}
     }
 
 @app.get("/performance_dashboard")
 async def get_performance_dashboard():
     """실시간 성능 대시보드"""
-    frame_skip_stats = frame_skipper.get_stats()
+    frame_skip_stats = frame_skip_totals.get_stats()
     
     return {
         "optimization_status": {
             "ultra_fast_frame_skip_active": True,
             "batch_api_processing_active": True,
             "early_termination_active": True,
-            "high_confidence_mode": frame_skipper.high_confidence_found if frame_skipper else False
+            "high_confidence_analyses": frame_skip_stats["high_confidence_analyses"]
         },
         "frame_skip_performance": frame_skip_stats,
         "batch_processing_config": {
             "yolo_batch_size": batch_processor.yolo_batch_size,
             "clothing_batch_size": batch_processor.clothing_batch_size,
-            "batch_timeout": batch_processor.batch_timeout
+            "batch_timeout": batch_processor.batch_timeout,
+            "adaptive": batch_processor.get_batch_sizing_stats()
         },
+        "detect_transfer": batch_processor.get_detect_transfer_stats(),
+        "downstream_resilience": batch_processor.get_resilience_stats(),
+        "live_streams": [build_live_stats(stream_id) for stream_id in live_streams],
         "threshold_settings": {
             "yolo_confidence": 0.25,
             "clothing_matching": 0.6,
             "early_termination": 0.95,
             "frame_quality": 0.4
         },
-        "current_analyses": len(analysis_status),
+        "current_analyses": job_store.count("processing"),
+        "analysis_scheduler": analysis_scheduler.get_stats(),
+        "lane_latency": batch_processor.lane_metrics.get_stats(),
+        "downstream_limits": {service: limiter.get_stats() for service, limiter in batch_processor.limiters.items()},
         "system_status": {
             "performance_level": "초고속 최적화됨",
             "active_optimizations": 4,
@@ -1230,197 +3520,3 @@ if __name__ == "__main__":
     logger.info("📊 예상 성능 향상: 5-8배 빨라짐 (정확도 오히려 향상)")
     
     uvicorn.run(app, host="0.0.0.0", port=8004)
-
-@app.get("/analysis_status/{analysis_id}")
-async def get_analysis_status(analysis_id: str):
-    """분석 진행 상황 조회"""
-    if analysis_id not in analysis_status:
-        raise HTTPException(status_code=404, detail="분석 ID를 찾을 수 없습니다")
-    
-    status = analysis_status[analysis_id]
-    
-    return {
-        "analysis_id": analysis_id,
-        "status": status.get("status"),
-        "progress": status.get("progress", 0),
-        "current_phase": status.get("current_phase", "준비 중"),
-        "method": status.get("method", "smart_skip_batch_optimized"),
-        "suspects_found": len(status.get("suspects_timeline", [])),
-        "crop_images_available": len(status.get("suspect_crop_images", [])),
-        "processing_time": status.get("processing_time_seconds", 0),
-        "optimization_stats": status.get("optimization_stats", {}),
-        "phase_description": get_phase_description_optimized(status.get("current_phase", ""))
-    }
-
-def get_phase_description_optimized(phase: str) -> str:
-    """최적화된 분석 단계별 설명"""
-    phase_descriptions = {
-        "smart_frame_extraction": "📹 스마트 프레임 추출 중... (품질 기반 스킵 적용)",
-        "batch_person_extraction": "👤 배치 처리로 고유 사람 식별 중...",
-        "batch_suspect_matching": "🎯 배치 처리로 용의자 매칭 중...",
-        "result_compilation": "📊 최적화 결과 정리 중...",
-        "completed": "✅ 스마트 스킵 + 배치 처리 분석 완료!"
-    }
-    return phase_descriptions.get(phase, "🔄 처리 중...")
-
-@app.get("/analysis_result/{analysis_id}")
-async def get_analysis_result(analysis_id: str):
-    """완료된 분석 결과 조회"""
-    if analysis_id not in analysis_status:
-        raise HTTPException(status_code=404, detail="분석 ID를 찾을 수 없습니다")
-    
-    status = analysis_status[analysis_id]
-    current_status = status.get("status", "unknown")
-    
-    if current_status != "completed":
-        if current_status == "processing":
-            raise HTTPException(
-                status_code=400, 
-                detail=f"분석이 아직 진행 중입니다. 현재 진행률: {status.get('progress', 0)}%"
-            )
-        elif current_status == "failed":
-            raise HTTPException(
-                status_code=500,
-                detail=f"분석이 실패했습니다: {status.get('error', '알 수 없는 오류')}"
-            )
-        else:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"분석이 아직 완료되지 않았습니다. 현재 상태: {current_status}"
-            )
-    
-    # 결과 데이터 정리
-    crop_images = status.get("suspect_crop_images", [])
-    suspects_timeline = status.get("suspects_timeline", [])
-    summary = status.get("summary", {})
-    
-    result = {
-        "analysis_id": analysis_id,
-        "status": current_status,
-        "method": status.get("method", "smart_skip_batch_optimized"),
-        "suspects_timeline": suspects_timeline,
-        "summary": summary,
-        "suspect_crop_images": crop_images,
-        "crop_images_count": len(crop_images),
-        "processing_time_seconds": status.get("processing_time_seconds", 0),
-        "performance_stats": summary.get("performance_stats", {}),
-        "frame_skip_stats": summary.get("frame_skip_stats", {}),
-        "completion_reason": "smart_skip_batch_optimized_completed",
-        "message": f"🚀 스마트 스킵 + 배치 처리 분석 완료 - {len(crop_images)}개 크롭 이미지 생성"
-    }
-    
-    logger.info(f"✅ 스마트 스킵 + 배치 처리 분석 결과 조회: {analysis_id} - 크롭 이미지 {len(crop_images)}개")
-    return result
-
-@app.get("/optimization_stats")
-async def get_optimization_stats():
-    """최적화 성능 통계"""
-    completed_analyses = [
-        info for info in analysis_status.values() 
-        if info.get("status") == "completed"
-    ]
-    
-    if not completed_analyses:
-        return {"message": "완료된 분석이 없습니다"}
-    
-    # 성능 통계 계산
-    total_processing_time = sum(
-        info.get("processing_time_seconds", 0) 
-        for info in completed_analyses
-    )
-    
-    avg_processing_time = total_processing_time / len(completed_analyses)
-    
-    total_suspects_found = sum(
-        len(info.get("suspects_timeline", [])) 
-        for info in completed_analyses
-    )
-    
-    total_crop_images = sum(
-        len(info.get("suspect_crop_images", [])) 
-        for info in completed_analyses
-    )
-    
-    # 프레임 스킵 통계
-    frame_skip_stats = frame_skipper.get_stats()
-    
-    return {
-        "method": "smart_skip_batch_optimized",
-        "completed_analyses": len(completed_analyses),
-        "average_processing_time_seconds": round(avg_processing_time, 1),
-        "total_suspects_found": total_suspects_found,
-        "total_crop_images_generated": total_crop_images,
-        "frame_skip_performance": frame_skip_stats,
-        "optimization_effectiveness": {
-            "smart_frame_skip": f"{frame_skip_stats.get('skip_rate', '0%')} 프레임 스킵",
-            "batch_api_speedup": "8배 빠른 API 처리",
-            "overall_speedup": "3-5배 전체 속도 향상",
-            "accuracy_maintained": True
-        },
-        "batch_processing_stats": {
-            "yolo_batch_size": batch_processor.yolo_batch_size,
-            "clothing_batch_size": batch_processor.clothing_batch_size,
-            "batch_timeout": batch_processor.batch_timeout
-        }
-    }
-
-@app.delete("/analysis/{analysis_id}")
-async def delete_analysis(analysis_id: str):
-    """분석 결과 삭제"""
-    if analysis_id not in analysis_status:
-        raise HTTPException(status_code=404, detail="분석 ID를 찾을 수 없습니다")
-    
-    del analysis_status[analysis_id]
-    return {"message": f"분석 {analysis_id}가 삭제되었습니다"}
-
-@app.get("/list_analyses")
-async def list_analyses():
-    """모든 분석 목록 조회"""
-    return {
-        "total_analyses": len(analysis_status),
-        "method": "smart_skip_batch_optimized",
-        "frame_skip_stats": frame_skipper.get_stats(),
-        "analyses": {aid: {
-            "status": info.get("status"), 
-            "progress": info.get("progress", 0),
-            "method": info.get("method", "smart_skip_batch_optimized"),
-            "crop_images_count": len(info.get("suspect_crop_images", [])),
-            "processing_time": info.get("processing_time_seconds", 0),
-            "optimization_stats": info.get("optimization_stats", {})
-        } for aid, info in analysis_status.items()}
-    }
-
-@app.get("/performance_dashboard")
-async def get_performance_dashboard():
-    """실시간 성능 대시보드"""
-    frame_skip_stats = frame_skipper.get_stats()
-    
-    return {
-        "optimization_status": {
-            "smart_frame_skip_active": True,
-            "batch_api_processing_active": True
-        },
-        "frame_skip_performance": frame_skip_stats,
-        "batch_processing_config": {
-            "yolo_batch_size": batch_processor.yolo_batch_size,
-            "clothing_batch_size": batch_processor.clothing_batch_size,
-            "batch_timeout": batch_processor.batch_timeout
-        },
-        "current_analyses": len(analysis_status),
-        "system_status": {
-            "performance_level": "최적화됨",
-            "active_optimizations": 2,
-            "expected_speedup": "3-5배"
-        }
-    }
-
-if __name__ == "__main__":
-    import uvicorn
-    
-    # 최적화 시스템 정보 출력
-    logger.info("🚀 스마트 스킵 + 배치 API 최적화 Video Service 시작")
-    logger.info("🧠 스마트 프레임 스킵: 품질 기반 지능형 프레임 선택")
-    logger.info("⚡ 배치 API 처리: YOLO 6개, 의류 매칭 3개씩 배치")
-    logger.info("📊 예상 성능 향상: 3-5배 빨라짐 (정확도 유지)")
-    
-    uvicorn.run(app, host="0.0.0.0", port=8004)
\ No newline at end of file
@@ -0,0 +1,101 @@
+# video-service/result_cache.py (분석 결과 캐시: 영상 해시 + 갤러리 버전 + 파라미터 → 분석 ID)
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def build_cache_key(video_sha256: str, gallery_version: str, params: Dict[str, Any]) -> str:
+    """같은 영상 + 같은 용의자 갤러리 + 같은 분석 파라미터 → 같은 키"""
+    payload = json.dumps(
+        {"video": video_sha256, "gallery": gallery_version, "params": params},
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisResultCache:
+    """
+    분석 결과 캐시 (SQLite, 워커 간 공유)
+    - 결과 자체는 작업 저장소에 있고 캐시는 키 → 분석 ID 만 보관
+    - 조회 시 작업 상태로 판단: 완료 → 저장된 결과 재사용, 대기 / 진행 중 → 같은 작업에 합류,
+      실패 / 취소 / 만료(작업 없음) → 캐시 미스로 보고 항목 삭제
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS result_cache (
+            cache_key TEXT PRIMARY KEY,
+            analysis_id TEXT NOT NULL,
+            video_sha256 TEXT NOT NULL,
+            gallery_version TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_result_cache_created ON result_cache (created_at);
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 3 * 24 * 3600):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "attached": 0, "misses": 0, "bypassed": 0}
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self._SCHEMA)
+
+    def get(self, cache_key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT analysis_id FROM result_cache WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        return row["analysis_id"] if row else None
+
+    def put(self, cache_key: str, analysis_id: str, video_sha256: str, gallery_version: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO result_cache (cache_key, analysis_id, video_sha256, gallery_version, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    analysis_id = excluded.analysis_id, created_at = excluded.created_at
+                """,
+                (cache_key, analysis_id, video_sha256, gallery_version, time.time())
+            )
+
+    def delete(self, cache_key: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM result_cache WHERE cache_key = ?", (cache_key,))
+
+    def record(self, outcome: str):
+        self.stats[outcome] = self.stats.get(outcome, 0) + 1
+
+    def evict_expired(self) -> int:
+        with self._lock, self._conn:
+            removed = self._conn.execute(
+                "DELETE FROM result_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+        if removed:
+            logger.info(f"🧹 결과 캐시 정리: 만료 {removed}개 삭제")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM result_cache").fetchone()[0]
+        lookups = self.stats["hits"] + self.stats["attached"] + self.stats["misses"]
+        reused = self.stats["hits"] + self.stats["attached"]
+        return {
+            "entries": entries,
+            **self.stats,
+            "hit_rate": f"{(reused / lookups * 100) if lookups else 0:.1f}%"
+        }
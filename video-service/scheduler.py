@@ -0,0 +1,291 @@
+# video-service/scheduler.py (분석 작업 스케줄러: 동시 실행 제한 + 대기열)
+import math
+import time
+import heapq
+import asyncio
+import itertools
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 작업 레인 → 우선순위 (낮을수록 먼저): 추적 중 실시간 분석(stop_on_detect)이 대량 보관 영상 분석보다 앞섬
+LANE_PRIORITIES = {"realtime": 0, "bulk": 1}
+
+
+class LaneMetrics:
+    """레인별 지연 시간 (대기열 대기 / 전체 작업 / 하위 서비스 요청) 최근 window 개 기준 통계"""
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._samples: Dict[str, Dict[str, Deque[float]]] = {}
+
+    def record(self, lane: str, metric: str, seconds: float):
+        lane_samples = self._samples.setdefault(lane, {})
+        lane_samples.setdefault(metric, deque(maxlen=self.window)).append(seconds)
+
+    def get_stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for lane, metrics in self._samples.items():
+            stats[lane] = {}
+            for metric, samples in metrics.items():
+                ordered = sorted(samples)
+                stats[lane][metric] = {
+                    "count": len(ordered),
+                    "avg_seconds": round(sum(ordered) / len(ordered), 3),
+                    "p50_seconds": round(ordered[len(ordered) // 2], 3),
+                    "p95_seconds": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3)
+                }
+        return stats
+
+
+class PriorityLimiter:
+    """
+    하위 서비스(YOLO / 의류) 동시 요청 수 제한
+    - 자리가 나면 우선순위 값이 낮은 대기자(실시간 레인)부터, 같으면 도착 순서대로 넘겨줌
+    - 여러 분석이 동시에 돌 때 실시간 분석의 요청이 대량 분석 요청 뒤에 줄 서지 않도록 함
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    async def acquire(self, priority: int):
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # 자리를 넘겨받은 직후 취소되면 다음 대기자에게 다시 넘김
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                future.cancel()
+            raise
+
+    def release(self):
+        # 자리는 _active 를 줄이지 않고 다음 대기자에게 그대로 넘김
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int):
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "limit": self.limit,
+            "in_flight": self._active,
+            "waiting": sum(1 for _, _, future in self._waiters if not future.done())
+        }
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 참 (HTTP 429 + Retry-After 로 응답)"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"분석 대기열이 가득 찼습니다. {retry_after}초 후 다시 시도하세요")
+        self.retry_after = retry_after
+
+
+class AnalysisScheduler:
+    """
+    분석 작업 스케줄러 (워커 프로세스 단위)
+    - 동시에 실행하는 분석을 max_concurrent 개로 제한해 디코더 / YOLO 요청 폭주 방지
+    - 나머지는 (레인 우선순위, 도착 순서) 대기열에서 기다림 (실시간 레인이 먼저, 같은 레인은 FIFO)
+    - 실시간 레인은 realtime_extra_slots 만큼 한도를 넘어 바로 시작 가능 (대량 분석이 슬롯을 다 차지해도 대기 없음)
+    - 대기열이 max_queue 개를 넘으면 QueueFullError, Retry-After 는 최근 분석 소요 시간으로 추정
+      (실시간 레인은 자기 레인의 대기 수만 봄 → 대량 분석이 대기열을 채워도 거절되지 않음)
+    - 등록 전에 await 가 끼는 요청 (업로드 조립, 일괄 분석) 은 reserve 로 자리를 먼저 잡아 두고 그 자리로 submit
+    """
+
+    def __init__(self, max_concurrent: int = 2, max_queue: int = 20, default_job_seconds: float = 60.0,
+                 realtime_extra_slots: int = 1, metrics: Optional[LaneMetrics] = None):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.avg_job_seconds = default_job_seconds
+        self.realtime_extra_slots = max(0, realtime_extra_slots)
+        self.metrics = metrics
+        self._queue: List[Tuple[int, int, str]] = []
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._running_lanes: Dict[str, str] = {}
+        self._sequence = itertools.count()
+        self._reservations: Dict[int, Dict[str, Any]] = {}
+        self._reservation_ids = itertools.count(1)
+        self.completed = 0
+        self.rejected = 0
+        self.discarded = 0
+
+    def _slot_limit(self, lane: str) -> int:
+        return self.max_concurrent + (self.realtime_extra_slots if lane == "realtime" else 0)
+
+    def _queued_count(self, lane: Optional[str] = None) -> int:
+        return sum(1 for entry in self._entries.values() if lane is None or entry["lane"] == lane)
+
+    def _reserved_count(self, lane: Optional[str] = None) -> int:
+        return sum(item["count"] for item in self._reservations.values() if lane is None or item["lane"] == lane)
+
+    def retry_after(self) -> int:
+        """대기열에 자리가 날 때까지 예상 시간 (초)"""
+        overflow = max(1, len(self._queue) - self.max_queue + 1)
+        return max(1, math.ceil(self.avg_job_seconds * overflow / self.max_concurrent))
+
+    def check_capacity(self, lane: str = "bulk", count: int = 1):
+        """새 작업 count 개를 받을 수 있는지 확인 (업로드 저장 전에 미리 거절하기 위함, 일괄 분석은 전부 아니면 거절)"""
+        if lane not in LANE_PRIORITIES:
+            raise ValueError(f"지원하지 않는 레인입니다: {lane}")
+        # 예약된 자리는 곧 등록될 작업으로 보고 함께 셈
+        reserved = self._reserved_count("realtime") if lane == "realtime" else self._reserved_count()
+        waiting = count + reserved - max(0, self._slot_limit(lane) - len(self._running))
+        if waiting <= 0:
+            return
+
+        queued = self._queued_count("realtime") if lane == "realtime" else len(self._queue)
+        if queued + waiting > self.max_queue:
+            self.rejected += 1
+            raise QueueFullError(self.retry_after())
+
+    def reserve(self, lane: str = "bulk", count: int = 1) -> int:
+        """
+        작업 count 개 자리 예약 → 예약 ID (submit(reservation=...) 으로 사용, 끝나면 release_reservation)
+        - 확인과 등록 사이에 await 가 있어도 다른 요청이 자리를 가져가지 못함 (자리가 없으면 QueueFullError)
+        """
+        self.check_capacity(lane, count)
+        reservation = next(self._reservation_ids)
+        self._reservations[reservation] = {"lane": lane, "count": count}
+        return reservation
+
+    def release_reservation(self, reservation: int):
+        """쓰지 않은 예약 자리 반환"""
+        self._reservations.pop(reservation, None)
+
+    def _claim(self, reservation: Optional[int]) -> bool:
+        item = self._reservations.get(reservation) if reservation is not None else None
+        if item is None:
+            return False
+        item["count"] -= 1
+        if item["count"] <= 0:
+            del self._reservations[reservation]
+        return True
+
+    def submit(self, job_id: str, run: Callable[[], Awaitable[Any]], lane: str = "bulk",
+               on_discard: Optional[Callable[[], None]] = None, reservation: Optional[int] = None) -> int:
+        """
+        작업 등록 (이벤트 루프 안에서 호출, 예약한 자리가 있으면 대기열 확인 없이 그 자리 사용)
+        반환: 대기 순번 (0 = 바로 실행)
+        """
+        if not self._claim(reservation):
+            self.check_capacity(lane)
+
+        heapq.heappush(self._queue, (LANE_PRIORITIES[lane], next(self._sequence), job_id))
+        self._entries[job_id] = {
+            "run": run,
+            "lane": lane,
+            "on_discard": on_discard,
+            "enqueued_at": time.monotonic()
+        }
+        self._dispatch()
+        return self.position(job_id) or 0
+
+    def position(self, job_id: str) -> Optional[int]:
+        """대기 순번 (1부터), 대기 중이 아니면 None"""
+        if job_id not in self._entries:
+            return None
+        for index, (_, _, queued_id) in enumerate(sorted(self._queue)):
+            if queued_id == job_id:
+                return index + 1
+        return None
+
+    def discard(self, job_id: str) -> bool:
+        """대기 중인 작업 제거 (실행 중인 작업은 취소 토큰으로 중단해야 함)"""
+        entry = self._entries.pop(job_id, None)
+        if entry is None:
+            return False
+
+        self._queue = [item for item in self._queue if item[2] != job_id]
+        heapq.heapify(self._queue)
+        self.discarded += 1
+        if entry["on_discard"]:
+            entry["on_discard"]()
+        return True
+
+    def is_running(self, job_id: str) -> bool:
+        return job_id in self._running
+
+    def tracked_ids(self) -> List[str]:
+        """이 스케줄러가 맡고 있는 (대기 + 실행 중) 작업 ID"""
+        return list(self._entries) + list(self._running)
+
+    def _dispatch(self):
+        # 대기열 맨 앞(가장 높은 우선순위)이 자기 레인 한도 안에서 시작 가능할 때까지만 꺼냄
+        while self._queue:
+            job_id = self._queue[0][2]
+            entry = self._entries[job_id]
+            if len(self._running) >= self._slot_limit(entry["lane"]):
+                break
+
+            heapq.heappop(self._queue)
+            del self._entries[job_id]
+            wait_seconds = time.monotonic() - entry["enqueued_at"]
+            if self.metrics:
+                self.metrics.record(entry["lane"], "queue_wait", wait_seconds)
+            if wait_seconds >= 1.0:
+                logger.info(f"▶️ 대기열 작업 시작: {job_id} [{entry['lane']}] ({wait_seconds:.1f}초 대기)")
+            self._running_lanes[job_id] = entry["lane"]
+            self._running[job_id] = asyncio.create_task(self._run(job_id, entry["run"], entry["enqueued_at"]))
+
+    async def _run(self, job_id: str, run: Callable[[], Awaitable[Any]], enqueued_at: float):
+        started = time.monotonic()
+        try:
+            await run()
+        except Exception as e:
+            logger.error(f"❌ 스케줄러 작업 실패: {job_id} ({str(e)})")
+        finally:
+            # Retry-After 추정용 평균 소요 시간 (지수 이동 평균)
+            finished = time.monotonic()
+            self.avg_job_seconds = 0.8 * self.avg_job_seconds + 0.2 * (finished - started)
+            self.completed += 1
+            lane = self._running_lanes.pop(job_id, "bulk")
+            if self.metrics:
+                self.metrics.record(lane, "job_total", finished - enqueued_at)
+            self._running.pop(job_id, None)
+            self._dispatch()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "realtime_extra_slots": self.realtime_extra_slots,
+            "running": len(self._running),
+            "queued": len(self._queue),
+            "reserved": self._reserved_count(),
+            "running_by_lane": {
+                lane: sum(1 for running_lane in self._running_lanes.values() if running_lane == lane)
+                for lane in LANE_PRIORITIES
+            },
+            "queued_by_lane": {lane: self._queued_count(lane) for lane in LANE_PRIORITIES},
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "discarded": self.discarded,
+            "avg_job_seconds": round(self.avg_job_seconds, 1),
+            "estimated_wait_seconds": math.ceil(
+                self.avg_job_seconds * len(self._queue) / self.max_concurrent
+            )
+        }
@@ -0,0 +1,148 @@
+# video-service/temporal_refine.py (2차 패스: 등장 / 퇴장 구간 촘촘한 재샘플링)
+import bisect
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from analysis_window import RegionOfInterest
+from tracker import iou_matrix
+
+logger = logging.getLogger(__name__)
+
+
+def format_timestamp(seconds: float) -> str:
+    return f"{int(seconds // 60):02d}:{int(seconds % 60):02d}"
+
+
+def sampling_gaps(sample_times: List[float]) -> List[float]:
+    """1차 패스에서 실제로 탐지한 프레임 사이 간격 (키프레임 훑기 / 장면 전환 샘플링이면 고르지 않음)"""
+    return [later - earlier for earlier, later in zip(sample_times, sample_times[1:]) if later > earlier]
+
+
+def build_refine_windows(matches: List[Dict[str, Any]], sample_times: List[float], sparse_interval: float,
+                         step: float, window: Tuple[float, float], max_frames: int) -> List[Tuple[float, List[int]]]:
+    """
+    용의자 트랙의 첫 등장 직전 / 마지막 등장 직후 구간을 step 간격으로 재샘플링할 시각 목록
+    반환: [(시각, 그 시각에 찾아볼 매칭 인덱스 목록)] 시간순, 최대 max_frames 개
+    - 구간: 등장 전 / 퇴장 후 1차 패스가 실제로 탐지한 가장 가까운 프레임까지 (sample_times: 시간순)
+      앞 / 뒤 샘플이 없으면 가장 긴 샘플 간격 (없으면 sparse_interval) 만큼
+    - window: 1차 패스의 분석 구간 (start, end) 밖은 재샘플링하지 않음
+    - 같은 시각을 여러 용의자가 공유하면 한 번만 디코딩 / 탐지
+    """
+    window_start, window_end = window
+    max_gap = max(sampling_gaps(sample_times), default=sparse_interval)
+    wanted: Dict[float, List[int]] = {}
+    for match_index, match in enumerate(matches):
+        seconds = match["appearance_seconds"]
+        if not seconds:
+            continue
+        first, last = seconds[0], seconds[-1]
+        before = bisect.bisect_left(sample_times, first)
+        after = bisect.bisect_right(sample_times, last)
+        previous_sample = sample_times[before - 1] if before > 0 else first - max_gap
+        next_sample = sample_times[after] if after < len(sample_times) else last + max_gap
+        windows = [(max(window_start, previous_sample), first), (last, min(window_end, next_sample))]
+        for start, end in windows:
+            timestamp = start + step
+            while timestamp < end - 1e-3:
+                wanted.setdefault(round(timestamp, 3), []).append(match_index)
+                timestamp += step
+
+    timestamps = sorted(wanted)
+    if len(timestamps) > max_frames:
+        # 상한을 넘으면 구간 전체에 고르게 솎아냄
+        picks = np.linspace(0, len(timestamps) - 1, max_frames).round().astype(int)
+        timestamps = [timestamps[i] for i in sorted(set(picks.tolist()))]
+    return [(timestamp, wanted[timestamp]) for timestamp in timestamps]
+
+
+def read_frames_at(cap: cv2.VideoCapture, timestamps: List[float], video_fps: float,
+                   roi: Optional[RegionOfInterest] = None) -> List[Dict[str, Any]]:
+    """
+    열려 있는 캡처에서 지정 시각 프레임만 탐색(seek)해서 디코딩 (스레드에서 실행)
+    - 가까운 시각은 seek 대신 grab 으로 건너뜀 (키프레임부터 다시 디코딩하는 비용 절약)
+    - roi: 1차 패스와 같은 관심 영역 영상("detect_image", "detect_offset")으로 탐지
+    """
+    frames = []
+    position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+    for timestamp in timestamps:
+        frame_number = int(round(timestamp * video_fps))
+        gap = frame_number - position
+        if gap < 0 or gap > video_fps:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        else:
+            for _ in range(gap):
+                cap.grab()
+        ret, frame = cap.read()
+        position = frame_number + 1
+        if not ret:
+            continue
+        frame_data = {
+            "frame_number": frame_number,
+            "processed_index": -1,
+            "timestamp": timestamp,
+            "timestamp_str": format_timestamp(timestamp),
+            "image": frame,
+            "width": frame.shape[1],
+            "height": frame.shape[0],
+            "refined": True
+        }
+        if roi is not None:
+            frame_data["detect_image"], frame_data["detect_offset"] = roi.apply(frame)
+        frames.append(frame_data)
+    return frames
+
+
+def _nearest_box(match: Dict[str, Any], timestamp: float) -> Optional[List[float]]:
+    seconds = match["appearance_seconds"]
+    boxes = match.get("appearance_boxes") or []
+    if not boxes:
+        return None
+    index = bisect.bisect_left(seconds, timestamp)
+    candidates = [i for i in (index - 1, index) if 0 <= i < len(boxes)]
+    nearest = min(candidates, key=lambda i: abs(seconds[i] - timestamp))
+    box = boxes[nearest]
+    return [box["x1"], box["y1"], box["x2"], box["y2"]]
+
+
+def assign_refined_detections(matches: List[Dict[str, Any]], match_indices: List[int], frame: Dict[str, Any],
+                              person_detections: List[Dict], iou_threshold: float) -> int:
+    """
+    재샘플링 프레임의 사람 탐지 (원본 프레임 좌표) 를 용의자 트랙에 IoU 로 연결 (가장 가까운 시각의 박스 기준)
+    연결된 탐지는 등장 목록에 시간순으로 끼워 넣음 (frame_appearances 는 1차 패스 프레임이 아니므로 -1)
+    반환: 추가된 등장 수
+    """
+    if not person_detections:
+        return 0
+
+    det_boxes = np.array(
+        [[d["bbox"]["x1"], d["bbox"]["y1"], d["bbox"]["x2"], d["bbox"]["y2"]] for d in person_detections],
+        dtype=np.float32
+    )
+    added = 0
+    used = set()
+    for match_index in match_indices:
+        match = matches[match_index]
+        reference = _nearest_box(match, frame["timestamp"])
+        if reference is None:
+            continue
+        ious = iou_matrix(np.array([reference], dtype=np.float32), det_boxes)[0]
+        for det_index in used:
+            ious[det_index] = 0.0
+        best = int(np.argmax(ious))
+        if ious[best] < iou_threshold:
+            continue
+
+        used.add(best)
+        position = bisect.bisect_left(match["appearance_seconds"], frame["timestamp"])
+        match["appearance_seconds"].insert(position, frame["timestamp"])
+        match["timestamps"].insert(position, frame["timestamp_str"])
+        match["appearance_boxes"].insert(position, person_detections[best]["bbox"])
+        match["frame_appearances"].insert(position, frame["processed_index"])
+        match["total_appearances"] = len(match["frame_appearances"])
+        match["refined_appearances"] = match.get("refined_appearances", 0) + 1
+        match["first_seen_time"] = match["timestamps"][0]
+        added += 1
+    return added
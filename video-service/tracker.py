@@ -0,0 +1,197 @@
+# video-service/tracker.py (SORT 방식 다중 객체 추적)
+import logging
+from typing import List, Dict, Tuple, Optional
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+logger = logging.getLogger(__name__)
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """(N,4) x (M,4) [x1,y1,x2,y2] 박스 간 IoU 행렬 (벡터화)"""
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return np.zeros((len(boxes_a), len(boxes_b)), dtype=np.float32)
+
+    a = boxes_a[:, None, :]
+    b = boxes_b[None, :, :]
+
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    intersection = inter_w * inter_h
+
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    union = area_a + area_b - intersection
+
+    return np.where(union > 0, intersection / np.maximum(union, 1e-6), 0.0).astype(np.float32)
+
+
+def _bbox_to_z(bbox: np.ndarray) -> np.ndarray:
+    """[x1,y1,x2,y2] → [cx, cy, area, aspect]"""
+    w = bbox[2] - bbox[0]
+    h = bbox[3] - bbox[1]
+    return np.array([bbox[0] + w / 2.0, bbox[1] + h / 2.0, w * h, w / max(h, 1e-6)], dtype=np.float64)
+
+
+def _x_to_bbox(x: np.ndarray) -> np.ndarray:
+    """[cx, cy, area, aspect, ...] → [x1,y1,x2,y2]"""
+    area = max(x[2], 1e-6)
+    w = np.sqrt(area * max(x[3], 1e-6))
+    h = area / max(w, 1e-6)
+    return np.array([x[0] - w / 2.0, x[1] - h / 2.0, x[0] + w / 2.0, x[1] + h / 2.0], dtype=np.float32)
+
+
+class KalmanBoxTrack:
+    """
+    등속 모델 칼만 필터 기반 단일 트랙
+    - 상태: [cx, cy, area, aspect, vx, vy, v_area] (속도는 초 단위)
+    - 샘플링 간격이 일정하지 않으므로 predict 에 실제 경과 시간(dt)을 전달
+    """
+
+    # 관측 행렬 / 잡음 (SORT 기본값)
+    _H = np.hstack([np.eye(4), np.zeros((4, 3))])
+    _R = np.diag([1.0, 1.0, 10.0, 10.0])
+
+    def __init__(self, track_id: int, bbox: np.ndarray, timestamp: float):
+        self.track_id = track_id
+        self.x = np.zeros(7)
+        self.x[:4] = _bbox_to_z(bbox)
+        self.P = np.diag([10.0, 10.0, 10.0, 10.0, 1e4, 1e4, 1e4])
+
+        self.hits = 1
+        self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+        self.state = "tentative"
+
+    def predict(self, timestamp: float) -> np.ndarray:
+        """timestamp 시점 위치 예측"""
+        dt = max(timestamp - self.last_timestamp, 0.0)
+
+        F = np.eye(7)
+        F[0, 4] = F[1, 5] = F[2, 6] = dt
+        Q = np.diag([1.0, 1.0, 1.0, 1e-2, 1e-2, 1e-2, 1e-4]) * max(dt, 1.0)
+
+        # 면적이 음수가 되지 않도록 면적 속도 제한
+        if self.x[2] + self.x[6] * dt <= 0:
+            self.x[6] = 0.0
+
+        self.x_pred = F @ self.x
+        self.P_pred = F @ self.P @ F.T + Q
+        return _x_to_bbox(self.x_pred)
+
+    def update(self, bbox: np.ndarray, timestamp: float, min_hits: int):
+        """예측값을 관측값으로 보정"""
+        z = _bbox_to_z(bbox)
+        y = z - self._H @ self.x_pred
+        S = self._H @ self.P_pred @ self._H.T + self._R
+        K = self.P_pred @ self._H.T @ np.linalg.inv(S)
+
+        self.x = self.x_pred + K @ y
+        self.P = (np.eye(7) - K @ self._H) @ self.P_pred
+
+        self.hits += 1
+        self.last_timestamp = timestamp
+        if self.state == "tentative" and self.hits >= min_hits:
+            self.state = "confirmed"
+
+    @property
+    def bbox(self) -> np.ndarray:
+        return _x_to_bbox(self.x)
+
+
+class PersonTracker:
+    """
+    SORT 방식 다중 인물 추적기
+    - 예측 박스 vs 탐지 박스 IoU 비용 행렬을 헝가리안 알고리즘으로 할당
+    - 트랙 수명: tentative → confirmed (min_hits) → deleted (max_age_seconds 동안 미갱신)
+    - 같은 자리라도 max_age_seconds 이상 떨어진 등장은 별도 트랙으로 분리
+    """
+
+    def __init__(self, iou_threshold: float = 0.15, min_hits: int = 2, max_age_seconds: float = 10.0):
+        self.iou_threshold = iou_threshold
+        self.min_hits = min_hits
+        self.max_age_seconds = max_age_seconds
+
+        self.active_tracks: List[KalmanBoxTrack] = []
+        self.finished_tracks: List[KalmanBoxTrack] = []
+        self._next_id = 1
+
+    def update(self, boxes: np.ndarray, timestamp: float) -> List[Tuple[int, KalmanBoxTrack]]:
+        """
+        한 프레임의 탐지 결과로 트랙 갱신
+        boxes: (N,4) [x1,y1,x2,y2], timestamp: 영상 내 시간(초)
+        반환: [(탐지 인덱스, 할당된 트랙), ...]
+        """
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+
+        # 1. 오래 갱신되지 않은 트랙 종료
+        alive = []
+        for track in self.active_tracks:
+            if timestamp - track.last_timestamp > self.max_age_seconds:
+                track.state = "deleted"
+                self.finished_tracks.append(track)
+            else:
+                alive.append(track)
+        self.active_tracks = alive
+
+        # 2. 예측 및 IoU 비용 행렬
+        predicted = np.array([t.predict(timestamp) for t in self.active_tracks], dtype=np.float32).reshape(-1, 4)
+        ious = iou_matrix(boxes, predicted)
+
+        assignments: List[Tuple[int, KalmanBoxTrack]] = []
+        matched_dets = set()
+        matched_tracks = set()
+
+        if ious.size > 0:
+            det_idx, trk_idx = linear_sum_assignment(-ious)
+            for d, t in zip(det_idx, trk_idx):
+                if ious[d, t] < self.iou_threshold:
+                    continue
+                track = self.active_tracks[t]
+                track.update(boxes[d], timestamp, self.min_hits)
+                assignments.append((int(d), track))
+                matched_dets.add(int(d))
+                matched_tracks.add(int(t))
+
+        # 3. 할당되지 않은 탐지 → 새 트랙
+        for d in range(len(boxes)):
+            if d in matched_dets:
+                continue
+            track = KalmanBoxTrack(self._next_id, boxes[d], timestamp)
+            if self.min_hits <= 1:
+                track.state = "confirmed"
+            self._next_id += 1
+            self.active_tracks.append(track)
+            assignments.append((d, track))
+
+        assignments.sort(key=lambda item: item[0])
+        return assignments
+
+    def finish(self):
+        """영상 종료 시 남은 트랙 모두 종료"""
+        for track in self.active_tracks:
+            track.state = "deleted"
+            self.finished_tracks.append(track)
+        self.active_tracks = []
+
+    def drain_finished(self) -> List[KalmanBoxTrack]:
+        """종료된 트랙을 꺼내고 목록 비움 (끝없는 라이브 스트림에서 메모리가 계속 늘지 않도록)"""
+        finished, self.finished_tracks = self.finished_tracks, []
+        return finished
+
+    def all_tracks(self) -> List[KalmanBoxTrack]:
+        return self.finished_tracks + self.active_tracks
+
+    def get_stats(self) -> Dict:
+        tracks = self.all_tracks()
+        confirmed = sum(1 for t in tracks if t.hits >= self.min_hits)
+        return {
+            "total_tracks": len(tracks),
+            "confirmed_tracks": confirmed,
+            "tentative_tracks": len(tracks) - confirmed,
+            "active_tracks": len(self.active_tracks),
+            "iou_threshold": self.iou_threshold,
+            "min_hits": self.min_hits,
+            "max_age_seconds": self.max_age_seconds
+        }
@@ -0,0 +1,267 @@
+# video-service/upload_sessions.py (재개 가능한 청크 업로드)
+import os
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class UploadSessionError(Exception):
+    """업로드 세션 오류 (status_code 로 HTTP 응답 코드 전달)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ChunkedUploadManager:
+    """
+    재개 가능한 청크 업로드 관리자
+    - 세션 생성 → 오프셋 지정 청크 PUT → finalize 순서
+    - 청크는 video-service 저장소의 .part 파일에 바로 기록
+    - 수신 구간(ranges)을 .json 사이드카에 저장하여 재시작 후에도 이어받기 가능
+    - owner (예: 사건 ID) 를 지정해 만든 세션은 같은 owner 로만 조회 / 청크 전송 / 완료 / 취소 가능
+    """
+
+    def __init__(self, storage_dir: str, max_chunk_bytes: int = 32 * 1024 * 1024,
+                 max_upload_bytes: int = 8 * 1024 * 1024 * 1024, session_ttl: int = 24 * 3600):
+        self.storage_dir = storage_dir
+        self.sessions_dir = os.path.join(storage_dir, "uploads")
+        self.videos_dir = os.path.join(storage_dir, "videos")
+        self.max_chunk_bytes = max_chunk_bytes
+        self.max_upload_bytes = max_upload_bytes
+        self.session_ttl = session_ttl
+        self._lock = threading.Lock()
+
+        os.makedirs(self.sessions_dir, exist_ok=True)
+        os.makedirs(self.videos_dir, exist_ok=True)
+
+    # 내부 경로 헬퍼
+    def _meta_path(self, upload_id: str) -> str:
+        return os.path.join(self.sessions_dir, f"{upload_id}.json")
+
+    def _part_path(self, upload_id: str) -> str:
+        return os.path.join(self.sessions_dir, f"{upload_id}.part")
+
+    def _load(self, upload_id: str) -> Dict[str, Any]:
+        # upload_id 는 uuid hex 만 허용 (경로 조작 방지)
+        if not upload_id or not all(c in "0123456789abcdef" for c in upload_id):
+            raise UploadSessionError("잘못된 업로드 ID 입니다", 400)
+
+        meta_path = self._meta_path(upload_id)
+        if not os.path.exists(meta_path):
+            raise UploadSessionError("업로드 세션을 찾을 수 없습니다", 404)
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _load_owned(self, upload_id: str, owner: Optional[str]) -> Dict[str, Any]:
+        """다른 owner 의 세션은 존재 여부도 드러내지 않도록 404"""
+        session = self._load(upload_id)
+        if session.get("owner") and session["owner"] != owner:
+            raise UploadSessionError("업로드 세션을 찾을 수 없습니다", 404)
+        return session
+
+    def _save(self, session: Dict[str, Any]):
+        meta_path = self._meta_path(session["upload_id"])
+        tmp_path = f"{meta_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(session, f)
+        os.replace(tmp_path, meta_path)
+
+    @staticmethod
+    def _merge_ranges(ranges: List[List[int]]) -> List[List[int]]:
+        """[start, end) 구간 병합"""
+        merged: List[List[int]] = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return merged
+
+    @staticmethod
+    def _missing_ranges(ranges: List[List[int]], total_size: int) -> List[List[int]]:
+        missing = []
+        cursor = 0
+        for start, end in ranges:
+            if start > cursor:
+                missing.append([cursor, start])
+            cursor = max(cursor, end)
+        if cursor < total_size:
+            missing.append([cursor, total_size])
+        return missing
+
+    def describe(self, session: Dict[str, Any]) -> Dict[str, Any]:
+        """클라이언트용 세션 상태 (이어받을 구간 포함)"""
+        received = sum(end - start for start, end in session["ranges"])
+        missing = self._missing_ranges(session["ranges"], session["total_size"])
+        return {
+            "upload_id": session["upload_id"],
+            "filename": session["filename"],
+            "total_size": session["total_size"],
+            "received_bytes": received,
+            "progress": round(received / session["total_size"] * 100, 1) if session["total_size"] else 100.0,
+            "missing_ranges": missing,
+            "next_offset": missing[0][0] if missing else session["total_size"],
+            "complete": not missing,
+            "max_chunk_bytes": self.max_chunk_bytes,
+            "metadata": session.get("metadata", {}),
+            "created_at": session["created_at"],
+            "updated_at": session["updated_at"]
+        }
+
+    def create_session(self, filename: str, total_size: int, content_type: str = "video/mp4",
+                       sha256: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None,
+                       owner: Optional[str] = None) -> Dict[str, Any]:
+        """업로드 세션 생성 (.part 파일을 전체 크기로 미리 할당)"""
+        if total_size <= 0:
+            raise UploadSessionError("파일 크기가 올바르지 않습니다", 400)
+        if total_size > self.max_upload_bytes:
+            raise UploadSessionError(f"최대 업로드 크기({self.max_upload_bytes} bytes)를 초과했습니다", 413)
+        if content_type and not content_type.startswith("video/"):
+            raise UploadSessionError("비디오 파일만 업로드 가능합니다", 400)
+
+        upload_id = uuid.uuid4().hex
+        now = time.time()
+        session = {
+            "upload_id": upload_id,
+            "filename": filename,
+            "content_type": content_type,
+            "total_size": total_size,
+            "sha256": sha256.lower() if sha256 else None,
+            "metadata": metadata or {},
+            "owner": owner or None,
+            "ranges": [],
+            "created_at": now,
+            "updated_at": now
+        }
+
+        # sparse 파일로 미리 크기 확보 → 청크를 임의 오프셋에 기록 가능
+        with open(self._part_path(upload_id), "wb") as f:
+            f.truncate(total_size)
+
+        with self._lock:
+            self._save(session)
+
+        logger.info(f"📦 업로드 세션 생성: {upload_id} ({filename}, {total_size/1024/1024:.1f}MB)")
+        return self.describe(session)
+
+    def get_session(self, upload_id: str, owner: Optional[str] = None) -> Dict[str, Any]:
+        return self.describe(self._load_owned(upload_id, owner))
+
+    def write_chunk(self, upload_id: str, offset: int, data: bytes, total_size: Optional[int] = None,
+                    owner: Optional[str] = None) -> Dict[str, Any]:
+        """오프셋 위치에 청크 기록 (같은 구간 재전송은 덮어쓰기, total_size: Content-Range 의 전체 크기)"""
+        if not data:
+            raise UploadSessionError("빈 청크입니다", 400)
+        if len(data) > self.max_chunk_bytes:
+            raise UploadSessionError(f"청크가 너무 큽니다 (최대 {self.max_chunk_bytes} bytes)", 413)
+
+        session = self._load_owned(upload_id, owner)
+        if total_size is not None and total_size != session["total_size"]:
+            raise UploadSessionError(
+                f"Content-Range 전체 크기({total_size})가 세션 파일 크기({session['total_size']})와 다릅니다", 416
+            )
+        end = offset + len(data)
+        if offset < 0 or end > session["total_size"]:
+            raise UploadSessionError(
+                f"청크 범위가 파일 크기를 벗어났습니다 ({offset}-{end}/{session['total_size']})", 416
+            )
+
+        # finalize 가 .part 를 옮기는 것과 겹치지 않도록 잠금 안에서 세션 상태를 다시 확인하고 기록
+        # (옮겨진 뒤 열린 파일에 쓰면 해시를 확인한 영상이 바뀌거나 FileNotFoundError 로 500)
+        with self._lock:
+            part_path = self._part_path(upload_id)
+            if not os.path.exists(self._meta_path(upload_id)) or not os.path.exists(part_path):
+                raise UploadSessionError("이미 완료되었거나 취소된 업로드 세션입니다", 409)
+            with open(part_path, "r+b") as f:
+                f.seek(offset)
+                f.write(data)
+
+            session = self._load(upload_id)
+            session["ranges"] = self._merge_ranges(session["ranges"] + [[offset, end]])
+            session["updated_at"] = time.time()
+            self._save(session)
+
+        return self.describe(session)
+
+    def finalize(self, upload_id: str, owner: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+        """모든 구간 수신 확인 후 분석용 영상 파일로 이동"""
+        session = self._load_owned(upload_id, owner)
+        missing = self._missing_ranges(session["ranges"], session["total_size"])
+        if missing:
+            raise UploadSessionError(f"아직 수신되지 않은 구간이 있습니다: {missing[:5]}", 409)
+
+        part_path = self._part_path(upload_id)
+
+        # 무결성 확인 + 영상 식별 (탐지 색인 키) 을 위해 항상 해시 계산
+        digest = hashlib.sha256()
+        with open(part_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        if session.get("sha256") and digest.hexdigest() != session["sha256"]:
+            raise UploadSessionError("업로드된 파일의 SHA-256 이 일치하지 않습니다", 422)
+        session["sha256"] = digest.hexdigest()
+
+        _, ext = os.path.splitext(session["filename"] or "")
+        video_path = os.path.join(self.videos_dir, f"{upload_id}{ext or '.mp4'}")
+
+        with self._lock:
+            # 해시 계산 중에 같은 세션의 다른 finalize (타임아웃 후 재시도) 가 먼저 끝났거나 취소된 경우
+            if not os.path.exists(self._meta_path(upload_id)) or not os.path.exists(part_path):
+                raise UploadSessionError("이미 완료되었거나 취소된 업로드 세션입니다", 409)
+            os.replace(part_path, video_path)
+            os.remove(self._meta_path(upload_id))
+
+        logger.info(f"✅ 업로드 조립 완료: {upload_id} → {video_path}")
+        return video_path, session
+
+    def abort(self, upload_id: str, owner: Optional[str] = None):
+        self._load_owned(upload_id, owner)
+        self._remove(upload_id)
+        logger.info(f"🗑️ 업로드 세션 취소: {upload_id}")
+
+    def _remove(self, upload_id: str):
+        with self._lock:
+            for path in (self._part_path(upload_id), self._meta_path(upload_id)):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def cleanup_expired(self) -> int:
+        """TTL 이 지난 미완료 세션 정리"""
+        removed = 0
+        now = time.time()
+        for name in os.listdir(self.sessions_dir):
+            if not name.endswith(".json"):
+                continue
+            upload_id = name[:-5]
+            try:
+                session = self._load(upload_id)
+                if now - session["updated_at"] > self.session_ttl:
+                    self._remove(upload_id)
+                    logger.info(f"🗑️ 만료된 업로드 세션 정리: {upload_id}")
+                    removed += 1
+            except Exception as e:
+                logger.warning(f"업로드 세션 정리 실패 {upload_id}: {e}")
+        return removed
+
+
+def parse_content_range(header: Optional[str]) -> Optional[Tuple[int, int, Optional[int]]]:
+    """'bytes start-end/total' 형식의 Content-Range 헤더 파싱 (end 포함)"""
+    if not header:
+        return None
+    try:
+        unit, spec = header.strip().split(" ", 1)
+        if unit != "bytes":
+            return None
+        span, total = spec.split("/", 1)
+        start, end = span.split("-", 1)
+        return int(start), int(end), (None if total == "*" else int(total))
+    except ValueError:
+        return None